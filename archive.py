@@ -0,0 +1,251 @@
+#! python3
+#
+# NAME          : archive.py
+#
+# DESCRIPTION   : Packs a closed year of day files into one archive file and
+#                 reads days back from it through `mmap`, so that
+#                 `report_creator.py` decodes only days it needs. Also unpacks
+#                 an archive back to day files.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import os
+import mmap
+import struct
+import datetime
+
+import day_files    # reads and writes day files
+
+
+# Constants.
+# ==========
+
+# An archive is stored next to its year dir, e.g. 'Work Attendance Files/2016.archive'.
+# It is made of:
+# – a fixed-size header: magic bytes, version and year;
+# – an index of `INDEX_SIZE` entries, one per day of the year (January 1st is
+#   the first one): offset and length of the day's data, or zeros if there is
+#   no day file for the day;
+# – days' data, which are lines of day files (see `day_files.py`).
+# Numbers are little-endian.
+ARCHIVE_EXTENSION = '.archive'
+
+MAGIC = b'CMTARCH\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHH')    # magic, version, year
+INDEX_ENTRY = struct.Struct('<QI')    # offset, length
+INDEX_SIZE = 366
+
+
+# Classes.
+# ========
+
+class Archive:
+    """
+    A year's archive opened for reading. The file is mapped into memory, so
+    reading a day decodes only that day's bytes. Is used in a `with` statement
+    or closed with `close()`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, self.year = HEADER.unpack_from(self.mapping, 0)
+        except struct.error:
+            magic, version = None, None
+
+        if magic != MAGIC or version != VERSION:
+            self.mapping.close()
+            raise ValueError('{} is not an archive of version {}'.format(path, VERSION))
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def close(self):
+        self.mapping.close()
+
+
+    def locate(self, date):
+        """Returns `(offset, length)` of a day's data. `length` is 0 if the day is missing."""
+
+        position = HEADER.size + INDEX_ENTRY.size * (date.timetuple().tm_yday - 1)
+
+        return INDEX_ENTRY.unpack_from(self.mapping, position)
+
+
+    def dates(self):
+        """Returns dates of all days in the archive in chronological order."""
+
+        first_day = datetime.date(self.year, 1, 1)
+        dates = []
+
+        for day_of_year, (offset, length) in enumerate(INDEX_ENTRY.iter_unpack(
+                self.mapping[HEADER.size:HEADER.size + INDEX_ENTRY.size * INDEX_SIZE])):
+            if length:
+                dates.append(first_day + datetime.timedelta(days=day_of_year))
+
+        return dates
+
+
+    def read_day(self, date):
+        """
+        Returns a dict of a day's records keyed by names like
+        `day_files.read_day_file()` does, or `None` if the day is missing.
+        """
+
+        offset, length = self.locate(date)
+
+        if not length:
+            return None
+
+        data = {}
+
+        for line in self.mapping[offset:offset + length].splitlines():
+            name, record = day_files.decode_record(line)
+            data[name] = record
+
+        return data
+
+
+
+
+# Functions.
+# ==========
+
+def path_to_archive(working_dir, year_dir):
+    """Returns the path to a year's archive, e.g. 'Work Attendance Files/2016.archive'."""
+
+    return os.path.join(working_dir, year_dir + ARCHIVE_EXTENSION)
+
+
+
+
+def pack_year(working_dir, year, remove_loose=False):
+    """
+    Packs day files of a year into an archive. The archive is replaced
+    atomically. If `remove_loose` is `True`, day files are removed afterwards.
+    """
+
+    path_to_year_dir = os.path.join(working_dir, str(year))
+
+    if not os.path.isdir(path_to_year_dir):
+        # Fatal error. Nothing can be packed, so exit.
+        print('Error: no such directory: {}'.format(path_to_year_dir))
+        sys.exit(0)
+
+    index = [(0, 0)] * INDEX_SIZE
+    chunks = []
+    offset = HEADER.size + INDEX_ENTRY.size * INDEX_SIZE
+    paths = []
+
+    for date, path in day_files.walk_day_files(working_dir):
+        if date.year != year:
+            continue
+
+        data = day_files.read_day_file(path)
+
+        if 'day_start' not in data:
+            print('! Skipped {}: no `day_start_dt` value found.'.format(path))
+            continue
+
+        # The same lines as `day_files.write_day_file()` writes.
+        lines = [day_files.encode_record('day_start', data['day_start'])]
+        lines.extend(day_files.encode_record(name, data[name]) for name in sorted(data) if name != 'day_start')
+        chunk = ''.join(line + '\n' for line in lines).encode()
+
+        index[date.timetuple().tm_yday - 1] = (offset, len(chunk))
+        chunks.append(chunk)
+        offset += len(chunk)
+        paths.append(path)
+
+    path_to_file = path_to_archive(working_dir, str(year))
+    path_to_temp_file = path_to_file + '.tmp'
+
+    with open(path_to_temp_file, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, year))
+
+        for entry in index:
+            f.write(INDEX_ENTRY.pack(*entry))
+
+        for chunk in chunks:
+            f.write(chunk)
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(path_to_temp_file, path_to_file)
+
+    print('Packed {} day file(s) into {} ({} bytes)'.format(len(paths), path_to_file, offset))
+
+    if remove_loose:
+        for path in paths:
+            os.remove(path)
+
+        print('Removed {} day file(s).'.format(len(paths)))
+
+
+
+
+def unpack_year(working_dir, year):
+    """Writes day files of a year's archive back to the year dir. Existing day files are replaced."""
+
+    path_to_file = path_to_archive(working_dir, str(year))
+
+    try:
+        archive = Archive(path_to_file)
+    except (OSError, ValueError) as err:
+        # Fatal error. Nothing can be unpacked, so exit.
+        print('Error: could not open {}: {}'.format(path_to_file, getattr(err, 'strerror', None) or err))
+        sys.exit(0)
+
+    with archive:
+        dates = archive.dates()
+
+        for date in dates:
+            path_to_month_dir = os.path.join(working_dir, day_files.month_dir_of(date))
+            os.makedirs(path_to_month_dir, exist_ok=True)
+
+            day_files.write_day_file(os.path.join(path_to_month_dir, date.strftime('%-d') + day_files.DAY_FILE_EXTENSION),
+                                     archive.read_day(date))
+
+    print('Unpacked {} day file(s) from {}'.format(len(dates), path_to_file))
+    print('Remove the archive, or reports will still read it instead of the day files.')
+
+
+
+
+if __name__ == '__main__':
+    arguments = [arg for arg in sys.argv[1:] if arg != '--remove-loose']
+
+    if len(arguments) in (2, 3) and arguments[0] in ('pack', 'unpack') and arguments[1].isdigit():
+        year = int(arguments[1])
+        working_dir = arguments[2] if len(arguments) == 3 else day_files.WORKING_DIR
+
+        if arguments[0] == 'unpack':
+            unpack_year(working_dir, year)
+
+        elif year >= datetime.date.today().year:
+            # Kiosks still write this year's day files.
+            print('Error: only closed years can be packed.')
+
+        else:
+            pack_year(working_dir, year, '--remove-loose' in sys.argv[2:])
+
+    else:
+        print('Usage: python archive.py pack <year> [<dir>] [--remove-loose]')
+        print('       python archive.py unpack <year> [<dir>]')
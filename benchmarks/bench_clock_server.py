@@ -0,0 +1,148 @@
+#! python3
+#
+# NAME          : bench_clock_server.py
+#
+# DESCRIPTION   : A load generator for `clock_server.py`. Starts the server in a
+#                 temporary dir, connects many terminals at once, and measures
+#                 throughput and latency of clock-in and clock-out requests.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_clock_server.py [--terminals N]
+#                 [--employees N]
+#
+
+
+import sys
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+# Make the scripts importable when run from any dir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import day_files
+from generate_data import generate_names
+
+
+# Functions.
+# ==========
+
+def start_server(working_dir):
+    """Starts the server on a free port and waits until it accepts connections."""
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+
+    path_to_server = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'clock_server.py')
+    server = subprocess.Popen([sys.executable, path_to_server, '--port', str(port)], cwd=working_dir,
+                              stdout=subprocess.DEVNULL)
+
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return server, port
+        except OSError:
+            time.sleep(0.1)
+
+    server.kill()
+    raise RuntimeError('the server did not start')
+
+
+
+
+async def run_terminal(port, names, hour, latencies):
+    """Sends one request per name and records each request's latency."""
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    for name in names:
+        started = time.perf_counter()
+
+        writer.write('{} {}:00\n'.format(name, hour).encode())
+        await writer.drain()
+        response = json.loads(await reader.readline())
+
+        latencies.append(time.perf_counter() - started)
+
+        if not response['ok']:
+            raise RuntimeError(response['message'])
+
+    writer.close()
+
+
+
+
+async def run_rush(port, names, terminals, hour):
+    """Sends requests for all names from `terminals` terminals at once. Returns latencies and wall time."""
+
+    latencies = []
+    started = time.perf_counter()
+
+    await asyncio.gather(*[run_terminal(port, names[i::terminals], hour, latencies) for i in range(terminals)])
+
+    return latencies, time.perf_counter() - started
+
+
+
+
+def display_results(title, latencies, elapsed):
+    """Displays throughput and latency percentiles."""
+
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1000
+
+    print('{}: {} requests in {:.2f} s, {:.0f} requests/s'.format(title, len(latencies), elapsed, len(latencies) / elapsed))
+    print('\tlatency p50 {:.2f} ms, p95 {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms'.format(
+        percentile(50), percentile(95), percentile(99), latencies[-1] * 1000))
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures throughput and latency of clock_server.py.')
+    parser.add_argument('--terminals', type=int, default=200)
+    parser.add_argument('--employees', type=int, default=5000)
+    options = parser.parse_args()
+
+    names = generate_names(options.employees)
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        server, port = start_server(working_dir)
+
+        try:
+            print('{} employees, {} terminals'.format(options.employees, options.terminals))
+
+            latencies, elapsed = asyncio.run(run_rush(port, names, options.terminals, 9))
+            display_results('Clock-in rush', latencies, elapsed)
+
+            latencies, elapsed = asyncio.run(run_rush(port, names, options.terminals, 18))
+            display_results('Clock-out rush', latencies, elapsed)
+
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait()
+
+        # Every answered event must be in the day file.
+        for date, path in day_files.walk_day_files(os.path.join(working_dir, 'Work Attendance Files')):
+            data = day_files.read_day_file(path)
+
+        assert all(not data[name].is_present() for name in names), 'events were lost'
+        print('All {} people are in the day file.'.format(len(names)))
+
+
+
+
+if __name__ == '__main__':
+    main()
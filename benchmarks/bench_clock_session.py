@@ -0,0 +1,122 @@
+#! python3
+#
+# NAME          : bench_clock_session.py
+#
+# DESCRIPTION   : Measures how many clock events per second a
+#                 `clock_session.ClockSession` records in-process, without any
+#                 terminal I/O, with both storage backends, and checks that
+#                 every event is on disk afterwards.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_clock_session.py [--employees N]
+#                 [--backends files sqlite]
+#
+
+
+import sys
+import os
+import time
+import random
+import datetime
+import argparse
+import tempfile
+
+# Make the scripts importable when run from any dir.
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import day_files
+import sqlite_storage
+import clock_session
+from generate_data import generate_names
+
+
+# Constants.
+# ==========
+
+DAY = datetime.date(2016, 6, 16)
+
+
+# Functions.
+# ==========
+
+def run_backend(storage, names, working_dir):
+    """
+    Records a morning rush of clock-ins and an evening rush of clock-outs of
+    every person one event at a time, then flushes the day. Returns the time in
+    seconds of each step.
+    """
+
+    rng = random.Random(0)
+    timings = {}
+
+    # The database is created next to the working dir, as in the repo.
+    database_path = os.path.join(os.path.dirname(working_dir), sqlite_storage.DATABASE_PATH)
+
+    session = clock_session.ClockSession(DAY, working_dir, storage, database_path=database_path)
+    session.load()
+    session.start_day(9, 0)
+
+    for label, hours in (('clock_in', (8, 10)), ('clock_out', (17, 19))):
+        events = [(name, session.event_time(rng.randint(*hours), rng.randint(0, 59))) for name in names]
+
+        started = time.perf_counter()
+
+        for name, event_dt in events:
+            result = session.record(name, event_dt)
+            assert result.ok, result.message
+
+        timings[label] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    assert session.present_workers() == []
+    timings['present_workers'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    session.flush()
+    timings['flush'] = time.perf_counter() - started
+
+    session.close()
+
+    # A new session must find every event.
+    check = clock_session.ClockSession(DAY, working_dir, storage, database_path=database_path)
+    assert check.load()
+    people = [name for name in check.data if name != 'day_start']
+    assert len(people) == len(names), 'only {} of {} people are saved'.format(len(people), len(names))
+    assert not any(check.data[name].is_present() for name in people), 'not everyone is clocked out'
+    check.close()
+
+    return timings
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures clock events per second of clock_session.py.')
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--backends', nargs='+', choices=['files', 'sqlite'], default=['files', 'sqlite'])
+    options = parser.parse_args()
+
+    names = generate_names(options.employees)
+
+    for storage in options.backends:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            timings = run_backend(storage, names, os.path.join(tmp_dir, day_files.WORKING_DIR))
+
+        print('{} backend, {} employees:'.format(storage, options.employees))
+
+        for label in ('clock_in', 'clock_out'):
+            print('\t{:<16} {:7.3f} s, {:8.0f} events/s'.format(label, timings[label],
+                                                               options.employees / timings[label]))
+
+        for label in ('present_workers', 'flush'):
+            print('\t{:<16} {:7.3f} s'.format(label, timings[label]))
+
+
+
+
+if __name__ == '__main__':
+    main()
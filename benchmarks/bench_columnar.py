@@ -0,0 +1,128 @@
+#! python3
+#
+# NAME          : bench_columnar.py
+#
+# DESCRIPTION   : Compares the Python and the NumPy aggregation engines of
+#                 `report_creator.py` on a synthetic roster and checks that both
+#                 give the same numbers.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_columnar.py [--employees N] [--days N]
+#
+
+
+import sys
+import os
+import time
+import random
+import datetime
+import argparse
+
+# Make the scripts importable when run from any dir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import columnar
+import report_creator
+import records
+
+
+# Functions.
+# ==========
+
+def generate_day_totals(employees, days, first_day):
+    """Returns random sums of day files keyed by dates' ordinal numbers."""
+
+    names = ['Employee{}'.format(''.join(chr(ord('a') + int(digit)) for digit in str(i))) for i in range(employees)]
+    day_totals = {}
+
+    for ordinal in range(first_day.toordinal(), first_day.toordinal() + days):
+        totals = {}
+
+        for name in names:
+            if random.random() < 0.05:    # some people are absent
+                continue
+
+            late = random.randint(-60, 90)
+            work = random.randint(0, 10 * 60)
+            early = [-late // 60, -late % 60] if late < 0 else [0, 0]
+            late = [late // 60, late % 60] if late >= 0 else [0, 0]
+
+            totals[name] = early + late + [work // 60, work % 60]
+
+        day_totals[ordinal] = totals
+
+    return day_totals
+
+
+
+
+def run_python_engine(day_totals):
+    """Sums and calculates time values with plain Python, as `gather_data()` does."""
+
+    data_sum = {}
+
+    for ordinal in sorted(day_totals):
+        report_creator.add_totals(data_sum, day_totals[ordinal])
+
+    report_creator.data_sum = {name: records.Totals.from_sums(values) for name, values in data_sum.items()}
+    report_creator.days_counter = len(day_totals)
+    report_creator.AGGREGATION_ENGINE = 'python'
+    report_creator.calculate_time()
+
+    return report_creator.data
+
+
+
+
+def run_numpy_engine(day_totals):
+    """Sums and calculates time values with the NumPy engine."""
+
+    columns = columnar.build_columns(day_totals)
+    person_ids, totals, days = columnar.sum_by_person(columns, min(day_totals), max(day_totals))
+    names = [columns['names'][person_id] for person_id in person_ids.tolist()]
+
+    return columnar.calculate_time(names, totals, days, report_creator.report_complexity,
+                                   report_creator.month_or_week, report_creator.WORKDAYS_PER_WEEK)
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares aggregation engines of report_creator.py.')
+    parser.add_argument('--employees', type=int, default=20000)
+    parser.add_argument('--days', type=int, default=30)
+    options = parser.parse_args()
+
+    if not columnar.is_available():
+        print('NumPy is not installed.')
+        sys.exit(1)
+
+    print('Generating {} day(s) for {} employee(s) ...'.format(options.days, options.employees))
+    day_totals = generate_day_totals(options.employees, options.days, datetime.date(2016, 1, 1))
+
+    report_creator.report_complexity = 'C'
+    report_creator.month_or_week = 'M'
+
+    started = time.perf_counter()
+    python_data = run_python_engine(day_totals)
+    python_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    numpy_data = run_numpy_engine(day_totals)
+    numpy_time = time.perf_counter() - started
+
+    assert python_data == numpy_data, 'engines give different numbers'
+
+    print()
+    print('Python engine: {:.2f} s'.format(python_time))
+    print('NumPy engine:  {:.2f} s'.format(numpy_time))
+    print('Speedup:       {:.2f}x'.format(python_time / numpy_time))
+
+
+
+
+if __name__ == '__main__':
+    main()
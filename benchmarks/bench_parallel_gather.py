@@ -0,0 +1,109 @@
+#! python3
+#
+# NAME          : bench_parallel_gather.py
+#
+# DESCRIPTION   : Compares sequential and parallel parsing of day files by
+#                 `report_creator.gather_data()` on a synthetic multi-year tree.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_parallel_gather.py [--employees N]
+#                 [--years N] [--workers N]
+#
+
+
+import sys
+import os
+import io
+import time
+import datetime
+import glob
+import argparse
+import tempfile
+import contextlib
+
+# Make the scripts importable when run from any dir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_creator
+import rollups
+import prefix_index
+from generate_data import generate_tree
+
+
+# Functions.
+# ==========
+
+def run_gather_data(workers):
+    """Runs `gather_data()` and returns its wall time, results and console log."""
+
+    remove_sum_files(report_creator.WORKING_DIR)
+
+    report_creator.PARSE_WORKERS = workers
+    log = io.StringIO()
+
+    started = time.perf_counter()
+
+    with contextlib.redirect_stdout(log):
+        report_creator.gather_data()
+
+    elapsed = time.perf_counter() - started
+
+    return elapsed, report_creator.data_sum, report_creator.days_counter, log.getvalue()
+
+
+
+
+def remove_sum_files(working_dir):
+    """Removes rollups and prefix-sum indexes, so that every run parses all day files."""
+
+    for filename in (rollups.ROLLUP_FILENAME, prefix_index.INDEX_FILENAME):
+        for path in glob.glob(os.path.join(glob.escape(working_dir), '**', filename), recursive=True):
+            os.remove(path)
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares sequential and parallel parsing of day files.')
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        working_dir = os.path.join(tmp_dir, report_creator.WORKING_DIR)
+
+        print('Generating {} year(s) for {} employee(s) ...'.format(options.years, options.employees))
+        generate_tree(working_dir, options.employees, options.years)
+
+        report_creator.WORKING_DIR = working_dir
+        report_creator.month_or_week = 'M'
+        # Measure parsing, not caches, rollups or the prefix-sum index.
+        report_creator.USE_AGGREGATE_CACHE = False
+        report_creator.USE_ROLLUPS = False
+        report_creator.USE_PREFIX_INDEX = False
+        report_creator.start = datetime.date(2000, 1, 1)
+        report_creator.end = datetime.date(2000 + options.years - 1, 12, 31)
+
+        sequential = run_gather_data(1)
+        parallel = run_gather_data(options.workers)
+
+        # Parallel results must be exactly the same as sequential ones.
+        assert parallel[1] == sequential[1], 'sums differ'
+        assert parallel[2] == sequential[2], 'days counters differ'
+        assert parallel[3] == sequential[3], 'console logs differ'
+
+        print()
+        print('Day files:             {}'.format(sequential[2]))
+        print('Sequential:            {:.2f} s'.format(sequential[0]))
+        print('Parallel ({} workers): {:.2f} s'.format(options.workers, parallel[0]))
+        print('Speedup:               {:.2f}x'.format(sequential[0] / parallel[0]))
+
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#! python3
+#
+# NAME          : bench_records.py
+#
+# DESCRIPTION   : Measures memory taken by a day of a large roster and by
+#                 people's sums of a report: dicts of strings (how both scripts
+#                 kept them before `records.py`) versus `records.Entry` and
+#                 `records.Totals` objects.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_records.py [--employees N]
+#
+
+
+import sys
+import os
+import random
+import datetime
+import argparse
+import tracemalloc
+
+# Make the scripts importable when run from any dir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import records
+import report_creator
+from generate_data import generate_names, generate_day
+
+
+# Functions.
+# ==========
+
+def entry_to_dict(entry):
+    """Returns an entry as a dict with the keys `check_my_time.py` used to keep."""
+
+    record = {'clock_in_early': entry.clock_in_early,
+              'clock_in_strf': '{}:{}'.format(entry.clock_in.hour, entry.clock_in.minute)
+              }
+
+    if entry.is_present():
+        record['clock_in_dt'] = entry.clock_in.replace()    # a copy
+    else:
+        record['clock_out_strf'] = '{}:{}'.format(entry.clock_out.hour, entry.clock_out.minute)
+
+    for category, minutes in zip(records.CATEGORIES, (entry.early_time, entry.late_time, entry.work_time)):
+        if minutes is not None:
+            record['{}_time_hour'.format(category)], record['{}_time_minute'.format(category)] = divmod(minutes, 60)
+
+    return record
+
+
+
+
+def copy_entry(entry):
+    """Returns a copy of an entry that shares no values with it."""
+
+    return records.Entry(entry.clock_in.replace(), entry.clock_in_early,
+                         None if entry.clock_out is None else entry.clock_out.replace(),
+                         entry.early_time, entry.late_time, entry.work_time)
+
+
+
+
+def measure(build):
+    """Returns memory in bytes taken by what `build()` returns."""
+
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del result
+
+    return size
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures memory taken by dict and slotted records.')
+    parser.add_argument('--employees', type=int, default=100000)
+    options = parser.parse_args()
+
+    names = generate_names(options.employees)
+    day = generate_day(datetime.date(2016, 10, 29), names, random.Random(0), open_sessions=0.5)
+    del day['day_start']
+
+    # Fresh copies are measured, so that shared values (e.g. names) are not counted.
+    day_as_dicts = measure(lambda: {name: entry_to_dict(entry) for name, entry in day.items()})
+    day_as_entries = measure(lambda: {name: copy_entry(entry) for name, entry in day.items()})
+
+    sums = {name: entry.sums() for name, entry in day.items()}
+    sums_as_dicts = measure(lambda: {name: dict(zip(report_creator.SUM_KEYS, values)) for name, values in sums.items()})
+    sums_as_totals = measure(lambda: {name: records.Totals.from_sums(values) for name, values in sums.items()})
+
+    print('{} employees'.format(options.employees))
+    print()
+    print("A day's data:      dicts {:8.1f} MiB, entries {:8.1f} MiB ({:.1f}x less)".format(
+        day_as_dicts / 2**20, day_as_entries / 2**20, day_as_dicts / day_as_entries))
+    print("People's sums:     dicts {:8.1f} MiB, totals  {:8.1f} MiB ({:.1f}x less)".format(
+        sums_as_dicts / 2**20, sums_as_totals / 2**20, sums_as_dicts / sums_as_totals))
+
+
+
+
+if __name__ == '__main__':
+    main()
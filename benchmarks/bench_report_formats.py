@@ -0,0 +1,157 @@
+#! python3
+#
+# NAME          : bench_report_formats.py
+#
+# DESCRIPTION   : Compares writing a report of a large roster to an xlsx
+#                 spreadsheet (from a template and in write-only mode) and to
+#                 CSV and TSV files with `report_creator.write_to_spreadsheet()`,
+#                 and checks that text reports hold the calculated numbers.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_report_formats.py [--employees N]
+#                 [--complexity S|C]
+#
+
+
+import sys
+import os
+import io
+import csv
+import time
+import random
+import datetime
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+
+# Make the scripts importable when run from any dir.
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import day_files
+import records
+import report_creator
+
+
+# Functions.
+# ==========
+
+def generate_data_sum(employees, days):
+    """Returns random sums of a month of `employees` people."""
+
+    rng = random.Random(0)
+    data_sum = {}
+
+    for i in range(employees):
+        name = 'Employee{}'.format(''.join(chr(ord('a') + int(digit)) for digit in str(i)))
+        data_sum[name] = records.Totals(rng.randint(0, days * 30), rng.randint(0, days * 45),
+                                        rng.randint(days * 7 * 60, days * 9 * 60))
+
+    return data_sum
+
+
+
+
+def write_report(report_format, xlsx_renderer):
+    """
+    Writes the report in a format. Returns the path, wall time in seconds and
+    peak memory in bytes.
+    """
+
+    report_creator.REPORT_FORMAT = report_format
+    report_creator.XLSX_RENDERER = xlsx_renderer
+    # `write_to_spreadsheet()` changes this value every time.
+    report_creator.rel_path_to_month_dir = day_files.month_dir_of(report_creator.end)
+
+    tracemalloc.start()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        path = report_creator.write_to_spreadsheet()
+        elapsed = time.perf_counter() - started
+
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return path, elapsed, peak
+
+
+
+
+def read_text_report(path, delimiter):
+    """Returns rows of a CSV or TSV report without the header, with numbers as ints."""
+
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f, delimiter=delimiter))
+
+    return [[row[0]] + [int(value) for value in row[1:]] for row in rows[1:]]
+
+
+
+
+def expected_rows(columns):
+    """Returns rows of names and numbers a report must hold, taken from `report_creator.data`."""
+
+    data = report_creator.data
+
+    return [[name] + [data[name][key] for key in columns] for name in sorted(data)]
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares report formats of report_creator.py.')
+    parser.add_argument('--employees', type=int, default=50000)
+    parser.add_argument('--complexity', type=str.upper, choices=['S', 'C'], default='C')
+    options = parser.parse_args()
+
+    report_creator.TEMPLATES_DIR = os.path.join(REPO_DIR, 'Templates')
+    report_creator.month_or_week = 'M'
+    report_creator.report_complexity = options.complexity
+    report_creator.start = datetime.date(2016, 6, 1)
+    report_creator.end = datetime.date(2016, 6, 30)
+    report_creator.month_name = 'June'
+    report_creator.days_counter = 22
+
+    print('Calculating a month of {} employee(s) ...'.format(options.employees))
+    report_creator.data_sum = generate_data_sum(options.employees, report_creator.days_counter)
+    report_creator.AGGREGATION_ENGINE = 'python'
+    report_creator.calculate_time()
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        report_creator.REPORTS_DIR = tmp_dir
+
+        for label, report_format, xlsx_renderer in (('xlsx (template)', 'xlsx', 'template'),
+                                                    ('xlsx (write-only)', 'xlsx', 'write-only'),
+                                                    ('csv', 'csv', None),
+                                                    ('tsv', 'tsv', None)):
+            path, elapsed, peak = write_report(report_format, xlsx_renderer)
+            # Both xlsx renderers save to the same path, so take the size now.
+            results[label] = path, elapsed, peak, os.path.getsize(path)
+
+        print('Checking text reports ...')
+        rows = expected_rows(report_creator.SIMPLE_COLUMNS if options.complexity == 'S' else report_creator.MONTH_COLUMNS)
+        assert read_text_report(results['csv'][0], ',') == rows, 'CSV report holds wrong numbers'
+        assert read_text_report(results['tsv'][0], '\t') == rows, 'TSV report holds wrong numbers'
+
+        print()
+
+        for label, (path, elapsed, peak, size) in results.items():
+            print('{:<18} {:7.2f} s, {:7.1f} MiB peak, {:7.1f} MiB on disk'.format(
+                label + ':', elapsed, peak / 2**20, size / 2**20))
+
+        print('Speedup of write-only xlsx: {:.1f}x'.format(results['xlsx (template)'][1] /
+                                                          results['xlsx (write-only)'][1]))
+        print('Speedup of CSV:             {:.1f}x'.format(results['xlsx (template)'][1] / results['csv'][1]))
+
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+#! python3
+#
+# NAME          : bench_suite.py
+#
+# DESCRIPTION   : Times `check_my_time.load_data()` and `report_creator`'s
+#                 `gather_data()`, `calculate_time()` and `write_to_spreadsheet()`
+#                 on synthetic trees of several scales. Results are appended to
+#                 a JSON Lines file together with the current commit, so that
+#                 runs on different commits can be compared.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/bench_suite.py [--scales 100x1 1000x1 ...]
+#                 [--repeat N] [--results FILE] [--no-save] [--baseline COMMIT]
+#
+
+
+import sys
+import os
+import io
+import json
+import time
+import random
+import datetime
+import platform
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+# Make the scripts importable when run from any dir.
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import day_files
+import check_my_time
+import clock_session
+import report_creator
+from generate_data import generate_names, generate_day, generate_tree
+
+
+# Constants.
+# ==========
+
+# Scales are 'EMPLOYEESxYEARS'.
+DEFAULT_SCALES = ['100x1', '1000x1', '1000x3']
+RESULTS_PATH = os.path.join(REPO_DIR, 'benchmarks', 'results.jsonl')
+FIRST_YEAR = 2000
+PHASES = ('load_data', 'gather_data', 'gather_data_cached', 'calculate_time', 'write_to_spreadsheet')
+
+
+# Functions.
+# ==========
+
+def run_scale(employees, years, repeat):
+    """Generates a tree in a temporary dir and times every phase. Returns the best times in seconds."""
+
+    timings = {}
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, working_in(tmp_dir):
+        generate_tree(check_my_time.WORKING_DIR, employees, years, FIRST_YEAR,
+                      missing_days=0.03, absence=0.05, open_sessions=0.01, seed=0)
+
+        # `load_data()` reads today's file, where half of the people are still on workplace.
+        session = clock_session.ClockSession(check_my_time.TODAY, check_my_time.WORKING_DIR)
+        os.makedirs(session.month_dir, exist_ok=True)
+        day_files.write_day_file(session.path_to_filename,
+                                 generate_day(check_my_time.TODAY, generate_names(employees), rng, open_sessions=0.5))
+
+        timings['load_data'] = best_time(run_load_data, repeat)
+
+        # The report covers the whole tree.
+        report_creator.TEMPLATES_DIR = os.path.join(REPO_DIR, 'Templates')
+        report_creator.month_or_week = 'M'
+        report_creator.report_complexity = 'C'
+        report_creator.start = datetime.date(FIRST_YEAR, 1, 1)
+        report_creator.end = datetime.date(FIRST_YEAR + years - 1, 12, 31)
+
+        report_creator.USE_AGGREGATE_CACHE = False
+        timings['gather_data'] = best_time(report_creator.gather_data, repeat)
+
+        report_creator.USE_AGGREGATE_CACHE = True
+        best_time(report_creator.gather_data, 1)    # fill aggregate caches
+        timings['gather_data_cached'] = best_time(report_creator.gather_data, repeat)
+
+        timings['calculate_time'] = best_time(report_creator.calculate_time, repeat)
+        timings['write_to_spreadsheet'] = best_time(run_write_to_spreadsheet, repeat)
+
+    return timings
+
+
+
+
+def run_load_data():
+    """Runs `load_data()` as a fresh process of `check_my_time.py` would. It starts a new session every time."""
+
+    check_my_time.load_data(interactive=False)
+
+
+
+
+def run_write_to_spreadsheet():
+    """Runs `write_to_spreadsheet()`, which changes `rel_path_to_month_dir` every time."""
+
+    end = report_creator.end
+    report_creator.rel_path_to_month_dir = day_files.month_dir_of(end)
+
+    report_creator.write_to_spreadsheet()
+
+
+
+
+def best_time(function, repeat):
+    """Returns the best wall time of `repeat` calls. The console output is hidden."""
+
+    times = []
+
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - started)
+
+    return min(times)
+
+
+
+
+@contextlib.contextmanager
+def working_in(path):
+    """Changes the current dir in a `with` statement, since both scripts use relative paths."""
+
+    old_path = os.getcwd()
+    os.chdir(path)
+
+    try:
+        yield
+    finally:
+        os.chdir(old_path)
+
+
+
+
+def current_commit():
+    """Returns the current commit's short hash with '-dirty' for uncommitted changes, or `None`."""
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return commit + '-dirty' if dirty else commit
+
+
+
+
+def load_results(path):
+    """Loads stored results. Returns an empty list if there are none."""
+
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+
+
+def find_baseline(results, scale, commit, baseline_commit):
+    """
+    Finds a stored result to compare with: the latest one of `baseline_commit`
+    if it is given, otherwise the latest one of any other commit.
+    """
+
+    for result in reversed(results):
+        if result['scale'] != scale:
+            continue
+
+        if baseline_commit is not None:
+            if result['commit'] and result['commit'].startswith(baseline_commit):
+                return result
+
+        elif result['commit'] != commit:
+            return result
+
+    return None
+
+
+
+
+def display_result(result, baseline):
+    """Displays a result's timings next to the baseline's ones."""
+
+    print()
+
+    if baseline is None:
+        print('Scale {} ({} employees, {} year(s)):'.format(result['scale'], result['employees'], result['years']))
+    else:
+        print('Scale {} ({} employees, {} year(s)), compared with {} of {}:'.format(
+            result['scale'], result['employees'], result['years'], baseline['commit'], baseline['date']))
+
+    for phase in PHASES:
+        line = '\t{:<22}{:>10.4f} s'.format(phase, result['timings'][phase])
+
+        if baseline is not None and baseline['timings'].get(phase):
+            line += '{:>10.4f} s{:>+8.1f}%'.format(
+                baseline['timings'][phase],
+                (result['timings'][phase] / baseline['timings'][phase] - 1) * 100)
+
+        print(line)
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Times both scripts on synthetic trees and stores the results.')
+    parser.add_argument('--scales', nargs='+', default=DEFAULT_SCALES, metavar='EMPLOYEESxYEARS')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each phase; the best one counts')
+    parser.add_argument('--results', default=RESULTS_PATH, help='where results are stored (default: %(default)s)')
+    parser.add_argument('--no-save', action='store_true', help='do not store results')
+    parser.add_argument('--baseline', metavar='COMMIT',
+                        help='compare with results of COMMIT (default: the latest results of another commit)')
+    options = parser.parse_args()
+
+    results = load_results(options.results)
+    commit = current_commit()
+
+    for scale in options.scales:
+        employees, years = [int(value) for value in scale.split('x')]
+
+        result = {'scale': scale,
+                  'employees': employees,
+                  'years': years,
+                  'commit': commit,
+                  'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                  'python': platform.python_version(),
+                  'timings': run_scale(employees, years, options.repeat)
+                  }
+
+        display_result(result, find_baseline(results, scale, commit, options.baseline))
+
+        if not options.no_save:
+            with open(options.results, 'a') as f:
+                f.write(json.dumps(result) + '\n')
+
+        results.append(result)
+
+
+
+
+if __name__ == '__main__':
+    main()
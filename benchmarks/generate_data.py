@@ -0,0 +1,177 @@
+#! python3
+#
+# NAME          : generate_data.py
+#
+# DESCRIPTION   : Writes synthetic trees of work attendance files in the format
+#                 `check_my_time.py` writes, for benchmarks and testing at
+#                 production scale.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+# USAGE         : python benchmarks/generate_data.py [<dir>] [--employees N]
+#                 [--years N] [--first-year YEAR] [--missing-days FRACTION]
+#                 [--absence FRACTION] [--open-sessions FRACTION] [--seed N]
+#
+
+
+import sys
+import os
+import random
+import string
+import datetime
+import argparse
+
+# Make the scripts importable when run from any dir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import day_files
+import records
+
+
+# Constants.
+# ==========
+
+FIRST_NAMES = ('Anna', 'Boris', 'Clara', 'Daniel', 'Elena', 'Felix', 'Greta', 'Hugo', 'Irina', 'Jonas',
+               'Karin', 'Leon', 'Marta', 'Nikolai', 'Olga', 'Pavel', 'Quinn', 'Rosa', 'Sven', 'Tanya')
+LAST_NAMES = ('Adams', 'Brown', 'Carter', 'Davis', 'Evans', 'Fischer', 'Garcia', 'Hughes', 'Ivanov', 'Jones',
+              'Klein', 'Lopez', 'Miller', 'Novak', 'Olsen', 'Petrov', 'Quint', 'Rossi', 'Smith', 'Turner')
+
+DAY_START_HOUR = 9
+DAY_START_MINUTE = 0
+
+
+# Functions.
+# ==========
+
+def generate_names(employees):
+    """
+    Returns unique names made of letters only, as `check_my_time.py` requires.
+    Big rosters get a middle name, e.g. 'Anna Bc Adams'.
+    """
+
+    names = []
+
+    for i in range(employees):
+        i, first = divmod(i, len(FIRST_NAMES))
+        i, last = divmod(i, len(LAST_NAMES))
+        parts = [FIRST_NAMES[first]]
+
+        if i > 0:
+            # Spell the rest of the number with letters.
+            letters = []
+
+            while i > 0:
+                i, remainder = divmod(i, len(string.ascii_lowercase))
+                letters.append(string.ascii_lowercase[remainder])
+
+            parts.append(''.join(letters).title())
+
+        parts.append(LAST_NAMES[last])
+        names.append(' '.join(parts))
+
+    return names
+
+
+
+
+def generate_day(date, names, rng, absence=0.0, open_sessions=0.0):
+    """
+    Returns a day's data as `check_my_time.load_data()` keeps it. `absence` is
+    a share of people who do not come, `open_sessions` is a share of people who
+    have not clocked out (e.g. forgot to, or the day is not over yet).
+    """
+
+    day_start_dt = datetime.datetime(date.year, date.month, date.day, DAY_START_HOUR, DAY_START_MINUTE)
+    data = {'day_start': {'day_start_dt': day_start_dt,
+                          'day_start_hour': DAY_START_HOUR,
+                          'day_start_minute': DAY_START_MINUTE
+                          }}
+
+    for name in names:
+        if rng.random() < absence:
+            continue
+
+        # Most people come about on time, a few are very early or very late.
+        late = min(180, max(-90, int(rng.gauss(0, 12))))
+        clock_in_dt = day_start_dt + datetime.timedelta(minutes=late)
+
+        # The same values as `clock_session.calculate_clock_in()` finds.
+        if late < 0:
+            entry = records.Entry(clock_in_dt, True, early_time=-late)
+        else:
+            entry = records.Entry(clock_in_dt, False, late_time=late)
+
+        if rng.random() >= open_sessions:
+            work = min(14 * 60, max(60, int(rng.gauss(8.5 * 60, 45))))
+            clock_out_dt = clock_in_dt + datetime.timedelta(minutes=work)
+
+            if clock_out_dt.date() != date:
+                clock_out_dt = day_start_dt.replace(hour=23, minute=59)
+                work = (clock_out_dt - clock_in_dt).seconds // 60
+
+            entry = entry.clocked_out(clock_out_dt, work)
+
+        data[name] = entry
+
+    return data
+
+
+
+
+def generate_tree(working_dir, employees, years, first_year=2000, missing_days=0.0, absence=0.0,
+                  open_sessions=0.0, seed=None):
+    """
+    Writes a tree of day files for every workday of `years` years. `missing_days`
+    is a share of workdays without a day file (e.g. holidays). Returns the
+    number of written day files.
+    """
+
+    rng = random.Random(seed)
+    names = generate_names(employees)
+    written = 0
+
+    date = datetime.date(first_year, 1, 1)
+
+    while date.year < first_year + years:
+        if date.weekday() < 5 and rng.random() >= missing_days:
+            path_to_month_dir = os.path.join(working_dir, day_files.month_dir_of(date))
+            os.makedirs(path_to_month_dir, exist_ok=True)
+
+            path = os.path.join(path_to_month_dir, date.strftime('%-d') + day_files.DAY_FILE_EXTENSION)
+            day_files.write_day_file(path, generate_day(date, names, rng, absence, open_sessions))
+            written += 1
+
+        date += datetime.timedelta(days=1)
+
+    return written
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Writes a synthetic tree of work attendance files.')
+    parser.add_argument('working_dir', nargs='?', default=day_files.WORKING_DIR)
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--years', type=int, default=1)
+    parser.add_argument('--first-year', type=int, default=2000)
+    parser.add_argument('--missing-days', type=float, default=0.03,
+                        help='share of workdays without a day file (default: %(default)s)')
+    parser.add_argument('--absence', type=float, default=0.05,
+                        help='share of people absent on a day (default: %(default)s)')
+    parser.add_argument('--open-sessions', type=float, default=0.01,
+                        help='share of people who have not clocked out (default: %(default)s)')
+    parser.add_argument('--seed', type=int, help='seed for reproducible trees')
+    options = parser.parse_args()
+
+    written = generate_tree(options.working_dir, options.employees, options.years, options.first_year,
+                            options.missing_days, options.absence, options.open_sessions, options.seed)
+
+    print('{} day file(s) written to {}.'.format(written, options.working_dir))
+
+
+
+
+if __name__ == '__main__':
+    main()
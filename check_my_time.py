@@ -16,37 +16,58 @@
 
 import sys    # is used to exit script in case of fatal error
 import os
-import ast    # is used to parse data from text files
 import datetime
-import pprint    # pretty prints data to text files
+import argparse    # is used to parse command line options
+import threading    # is used to close a finished day in the background
+
+import sqlite_storage    # is an optional SQLite storage backend
+import roster    # matches typed names to a roster of employees
+import clock_session    # records clock events of a day and saves them
 
 
 # Constants.
 # ==========
 
-TODAY = datetime.date.today()    # is used by all functions in the script
-
-# `%-d` is non-zero-padded day's number. Could be changed to `%d` for zero-padded day's number
-# NOTE: if changed to zero-padded option, also change `ZERO_PADDED_FILENAMES` in `report_creator.py`
-# from `False` to `True`. Otherwise, Report Creator will not be able to 'see' some files.
-TODAY_FILENAME = TODAY.strftime('%-d.txt')
+TODAY = datetime.date.today()    # is the day events are recorded for. See `set_day()`.
 
 SAVE_PROMPT = True    # change to `False` to cancel manual input data confirmation
 
 DEFAULT_START_TIME_HOUR = 9    # note that it's 24-hour time system, not 12-hour with AM's and PM's
 DEFAULT_START_TIME_MINUTE = 0    # note that number must be non-zero padded. So use `0` instead of `00` or `7` instead of `07`
 
-# Text files are stored in /.../Work Attendance Files/<Year>/<Month's number> — <Month>/
+# In kiosk mode (`--kiosk`), the script runs around the clock: at this time a new
+# day starts at the default start time without any prompts, and the finished day
+# is closed in the background. Set it to e.g. `4` to count events of night shifts
+# after midnight to the day they started.
+KIOSK_MODE = False
+ROLLOVER_HOUR = 0
+ROLLOVER_MINUTE = 0
+
+# Day files are stored in /.../Work Attendance Files/<Year>/<Month's number> — <Month>/
+# NOTE: names of day files are set in `clock_session.py`.
 WORKING_DIR = 'Work Attendance Files'
-YEAR_STRF = TODAY.strftime('%Y')
-YEAR_DIR = os.path.join(WORKING_DIR, YEAR_STRF)
 
-# `%-m` is month's number. This helps file managers sort dirs. Do NOT change
-# this value in parentheses as it will cause an error to Report Creator.
-MONTH_STRF = TODAY.strftime('%-m — %B')
+# The day's journal is forced to disk after this number of records and merged
+# into the day file after that number. See `clock_session.py`.
+JOURNAL_FSYNC_EVERY = clock_session.JOURNAL_FSYNC_EVERY
+JOURNAL_COMPACT_EVERY = clock_session.JOURNAL_COMPACT_EVERY
+
+# 'files' or 'sqlite'. The SQLite backend saves every clock event in its own
+# transaction to `sqlite_storage.DATABASE_PATH` instead of day files, so no
+# journal is needed.
+STORAGE_BACKEND = 'files'
+
+# The day's clock events (see `clock_session.ClockSession`). It is created by
+# `load_data()` and holds the day's data, and it is what the functions below
+# record events with.
+session = None
 
-MONTH_DIR = os.path.join(YEAR_DIR, MONTH_STRF)
-PATH_TO_FILENAME = os.path.join(MONTH_DIR, TODAY_FILENAME)    # is used by `load_data()`, `write_to_file()`
+# Index of the roster, if there is one (see `roster.py`). Without a roster,
+# names are recorded as they are typed.
+roster_index = None
+
+# Closes the day at the rollover time in kiosk mode. See `schedule_close_day()`.
+close_day_timer = None
 
 # Functions.
 # ==========
@@ -54,11 +75,20 @@ PATH_TO_FILENAME = os.path.join(MONTH_DIR, TODAY_FILENAME)    # is used by `load
 def main():
     """The core function."""
 
-    # This global is used by almost all functions.
+    # This global is used by `validate_data()`.
     global args
 
     display_menu()
-    load_data()
+
+    if KIOSK_MODE:
+        # Before the rollover time, it is still the previous day.
+        if current_day() != TODAY:
+            set_day(current_day())
+
+        load_data()
+        schedule_close_day()
+    else:
+        load_data()
 
     try:
         # Ask for input until Ctrl-C is pressed.
@@ -68,6 +98,10 @@ def main():
             input_data = input("Enter name and time: ")
             args = input_data.split()
 
+            # A kiosk left running overnight starts a new day by itself.
+            if KIOSK_MODE and current_day() != TODAY:
+                roll_over()
+
             if input_data.strip().upper() == 'ALL':
                 display_present_workers()
 
@@ -76,10 +110,7 @@ def main():
 
             else:
                 if validate_data():    # if the input data is correct
-                    if name not in data:    # if a name was entered for the first time a day
-                        clock_in()
-                    else:    # if a name was entered for the second/third time a day
-                        clock_out()
+                    record_clock_event()
 
     except KeyboardInterrupt:    # handle Ctrl-C exception
         write_to_file()
@@ -87,41 +118,43 @@ def main():
 
 
 
-def load_data():
+def load_data(interactive=True):
     """
-    Loads data from a text file if it exists. Otherwise creates a new dictionary
-    that will store data.
+    Loads data written for the day if there is any. Otherwise starts the day.
+    If `interactive` is `False`, a new day starts at the default start time
+    without asking the user.
     """
 
-    # These globals are used by almost all functions.
-    global data, day_start_dt
+    # This global is used by almost all functions.
+    global session
 
+    session = clock_session.ClockSession(TODAY, WORKING_DIR, STORAGE_BACKEND, roster_index,
+                                         JOURNAL_FSYNC_EVERY, JOURNAL_COMPACT_EVERY)
 
-    if os.path.exists(PATH_TO_FILENAME):
-        # Open file for today and load data.
-        with open(PATH_TO_FILENAME) as f:
-            print()
-            print('Loading data from file {} ...'.format(TODAY_FILENAME))
+    # Load what is already written for today, maybe by other kiosks.
+    try:
+        found = session.load()
 
-            data = ast.literal_eval(f.read())
+    except ValueError as err:
+        # Fatal error. No calculations can be made, so exit.
+        print('Error: ' + str(err))
+        sys.exit(0)
 
-        if 'day_start' in data:
-            if 'day_start_dt' in data['day_start']:
-                day_start_dt = eval(data['day_start']['day_start_dt'])
+    display_warnings()
 
-        else:
-            # Fatal error. No calculations can be made, so exit.
-            print('Error: no `day_start_dt` value found.')
-            sys.exit(0)
+    if found:
+        if STORAGE_BACKEND == 'sqlite':
+            print()
+            print('Loading data from database {} ...'.format(sqlite_storage.DATABASE_PATH))
+        elif session.day_file_signature:
+            print()
+            print('Loading data from file {} ...'.format(os.path.basename(session.day_file_signature[0])))
 
     else:
-        # Create a new dictionary that will store data.
-        data = {}
-
         # Allow the user to set new day's start time.
         hour, minute = DEFAULT_START_TIME_HOUR, DEFAULT_START_TIME_MINUTE
 
-        choice = None
+        choice = None if interactive else 'OK'
 
         while choice not in ('OK', 'SET'):
             print('DATE: {}.'.format(TODAY.strftime('%d %b %Y')))
@@ -148,17 +181,13 @@ def load_data():
 
                     continue
 
-        day_start_dt = datetime.datetime(TODAY.year, TODAY.month, TODAY.day, hour, minute)
-
-        # Add new start time to data so that it could be used when loaded later.
-        data['day_start'] = {'day_start_dt': pprint.pformat(day_start_dt),    # or day_start_time_dt, day_start_hour
-                             'day_start_hour': hour,
-                             'day_start_minute': minute
-                             }
-
+        if not session.start_day(hour, minute):
+            # Another kiosk started the day while the user was choosing.
+            print()
+            print('Another kiosk has already started the day.')
 
     # Display day's start time.
-    day_start_strf = day_start_dt.strftime('=== %d %b %Y ===  %H:%M ===')
+    day_start_strf = session.day_start_dt.strftime('=== %d %b %Y ===  %H:%M ===')
     day_start_strf = day_start_strf.center(75)     # center alignment
 
     print()
@@ -170,88 +199,65 @@ def load_data():
 def validate_data():
     """Validate input data."""
 
-    # These globals are used by these functions: `clock_in()`, `clock_out()`
+    # These globals are used by `record_clock_event()`.
     global name, time_argument, hour, minute
 
     try:
-        if len(args) == 1:    # only name was entered
-            name = args[0]
-            assert name.isalpha(), 'name must contain only letters.'
-
-            time_argument = False
-
-            return True
-
-        elif len(args) > 1:    # name and time were entered or just full name was entered
-            time_argument = True    # assume that time argument was entered
+        name, time_argument, hour, minute = clock_session.parse_args(args)
 
-            # Validate time argument.
-            try:
-                # If this fails, `ValueError` is raised, saying that
-                # "there are not enough values to unpack (expected 2, got 1)"
-                # That means that no time argument but full name was entered.
-                hour, minute = args[-1].split(':')
-
-                # If this fails, `ValueError` is raised, saying that
-                # "invalid literal for int() with base 10"
-                hour, minute = int(hour), int(minute)
-
-                # If this fails, `ValueError` is raised, saying that
-                # "hour/minute must be in ..."
-                datetime.time(hour, minute)
+    except (AssertionError, ValueError) as err:    # handle errors from names and time validation
+        print('Error: ' + str(err))
 
-            except ValueError as err:
-                if 'unpack' in str(err):
-                    name = ' '.join(args)    # full name, to be exact
-                    time_argument = False
+        return False
 
-                else:
-                    print('Error: ' + str(err))
+    # Match the name to the roster, so that typos do not create new people.
+    roster_name, suggestions = session.match_name(name)
 
-                    return False
+    if roster_name is None:
+        if len(suggestions) == 1:
+            # Ask the user's confirmation.
+            choice = None
 
-            else:    # is executed only if the statements in `try` block do not raise an exception
-                name = ' '.join(args[:-1])    # name/full name without the time argument
+            while choice not in ('y', 'n'):
+                choice = input('Did you mean "{}"? [y/n]: '.format(suggestions[0]))
+                choice = choice.lower()
 
-            # Ensure that the name contains only letters.
-            for part_of_name in name.split():
-                assert part_of_name.isalpha(), 'name must contain only letters.'
+            if choice == 'n':
+                return False
 
-            return True
+            roster_name = suggestions[0]
 
         else:
-            # Throw `AssetionError` instead of `Exception` to avoid hiding bugs.
-            raise AssertionError('whitespace is not a name.')     # if whitespace was entered
+            print('Error: ' + clock_session.not_on_roster_message(name, suggestions))
 
-    except AssertionError as err:    # handle `AssertionError` from names validation
-        print('Error: ' + str(err))
+            return False
 
-        return False
+    name = roster_name
 
+    return True
 
 
 
-def clock_in():
-    """Records time a person clocked in."""
 
-    global data
+def record_clock_event():
+    """
+    Records time a person clocked in if the name was entered for the first time
+    a day, or time the person clocked out if it was entered for the second time.
+    """
 
-    # Find time the person clocked in.
-    if len(args) == 1 or not time_argument:
-        # Use current time.
-        clock_in_dt = datetime.datetime.now()
-        clock_in_strf = clock_in_dt.strftime('%H:%M')
+    # Use time argument from input or current time.
+    event_dt = session.event_time(hour, minute) if time_argument else None
 
-    elif len(args) > 1 and time_argument:
-        # Use time argument from input.
-        year, month, day = day_start_dt.year, day_start_dt.month, day_start_dt.day
-        clock_in_dt = datetime.datetime(year, month, day, hour, minute)
-        clock_in_strf = str(hour) + ':' + str(minute)    # this value comes handy when inspecting text files
+    result = session.preview(name, event_dt)
+    display_warnings()
 
-    clock_in_early = False    # assume that the person did not come before day's start time
+    if not result.ok:
+        print(result.message)
+        return None    # brings back to infinite `while` loop
 
-    if clock_in_dt < day_start_dt:    # if the person did come before before day's start time
-        # Ask for the user's confirmation.
+    if result.action == 'in' and result.record.clock_in_early:
+        # If the person did come before before day's start time, ask for the
+        # user's confirmation.
         choice = None
 
         while choice not in ('y', 'n'):
@@ -259,49 +265,12 @@ def clock_in():
                            'was not late? [y/n]: '.format(name))
             choice = choice.lower()
 
-        if choice == 'y':
-            clock_in_early = True
-        else:
+        if choice == 'n':
             return None    # brings back to infinite `while` loop
 
-    if clock_in_early:
-        # Calculate time the person was early.
-        early_time_td = day_start_dt - clock_in_dt
-        seconds = early_time_td.seconds
-
-        early_time_hour = seconds // 3600
-
-        # Display a message to the user.
-        if early_time_hour > 0:
-            early_time_minute = seconds % 3600 // 60
-
-            print('"{}" clocked in in at {} and was {} hour(s), {} minute(s) early.'\
-                  .format(name, clock_in_strf, early_time_hour, early_time_minute))
+    # Display a message to the user.
+    print(result.message)
 
-        else:
-            early_time_minute = seconds // 60
-
-            print('"{}" clocked in in at {} and was {} minute(s) early.'\
-                  .format(name, clock_in_strf, early_time_minute))
-
-    else:
-        # Calculate time the person was late for.
-        late_time_td = clock_in_dt - day_start_dt
-        seconds = late_time_td.seconds
-
-        late_time_hour = seconds // 3600
-
-        # Display a message to the user.
-        if late_time_hour > 0:
-            late_time_minute = seconds % 3600 // 60
-            print('"{}" clocked in at {} and was late for {} hour(s), {} minute(s).'\
-                  .format(name, clock_in_strf, late_time_hour, late_time_minute))
-        else:
-            late_time_minute = seconds // 60
-            print('"{}" clocked in at {} and was late for {} minute(s).'\
-                  .format(name, clock_in_strf, late_time_minute))
-
-    # Write data to the dictionary.
     if SAVE_PROMPT:
         # Ask for the user's confirmation.
         choice = None
@@ -311,127 +280,55 @@ def clock_in():
             choice = choice.lower()
 
         if choice == 'n':
-            return None    # brings back to asking infinite `while` loop
-
-        elif choice == 'y':
-            data[name] = {# Despite we do not really need this value in calculations, it
-                          # comes handy when inspecting text files.
-                          'clock_in_early': clock_in_early,
-                          
-                          'clock_in_dt': pprint.pformat(clock_in_dt),
-
-                          # Despite we do not really need this value in calculations, it
-                          # comes handy when inspecting text files.
-                          'clock_in_strf': clock_in_strf
-                          }
-
-            if clock_in_early:
-                # Write 'early' data only.
-                data[name]['early_time_hour'] = early_time_hour
-                data[name]['early_time_minute'] =  early_time_minute
-
-            else:
-                # Write 'late' data only.
-                data[name]['late_time_hour'] = late_time_hour
-                data[name]['late_time_minute'] =  late_time_minute
-
-    else:    # continue without confirmation
-        data[name] = {'clock_in_early': clock_in_early,
-                      'clock_in_dt': pprint.pformat(clock_in_dt),
-                      'clock_in_strf': clock_in_strf
-                      }
-
-        if clock_in_early:
-            # Write 'early' data only.
-            data[name]['early_time_hour'] = early_time_hour
-            data[name]['early_time_minute'] =  early_time_minute
-
-        else:
-            # Write 'late' data only.
-            data[name]['late_time_hour'] = late_time_hour
-            data[name]['late_time_minute'] =  late_time_minute
-
-
-
+            return None    # brings back to infinite `while` loop
 
-def clock_out():
-    """Records time a person clocked out."""
+    result = session.commit(result)
+    display_warnings()
 
-    global data
+    if not result.ok:
+        print(result.message)
 
-    if 'work_time_hour' not in data[name]:    # if the person has NOT already clocked out
-        # Find time the person clocked out.
-        if len(args) == 1:
-            # Use current time.
-            clock_out_dt = datetime.datetime.now()
-            clock_out_strf = clock_out_dt.strftime('%H:%M')    # this value comes handy when inspecting text files
 
-        elif len(args) > 1:
-            # Use time argument from input.
-            year, month, day = day_start_dt.year, day_start_dt.month, day_start_dt.day
-            clock_out_dt = datetime.datetime(year, month, day, hour, minute)
-            clock_out_strf = str(hour) + ':' + str(minute)    # this value comes handy when inspecting text files
 
-        # Find time the person clocked in.
-        clock_in_dt = eval(data[name]['clock_in_dt'])
 
-        # Prevent incorrect input.
-        if clock_out_dt < day_start_dt or clock_out_dt < clock_in_dt:
-            print('"{}" could not clock out at that time.'.format(name))
-            return None    # brings back to infinite `while` loop
+def ingest_file(path):
+    """
+    Records clock events from a file (or standard input if `path` is '-') and
+    writes the day's data once at the end (see `ClockSession.ingest()`).
+    """
 
-        # Calculate time of working.
-        work_time_td = clock_out_dt - clock_in_dt
-        seconds = work_time_td.seconds
-        work_time_hour = seconds // 3600
+    load_data(interactive=False)
 
-        # Display a message to the user.
-        if work_time_hour > 0:
-            work_time_minute = seconds % 3600 // 60
-            print('"{}" clocked out at {} and worked for {} hour(s), {} '
-                  'minute(s).'.format(name, clock_out_strf, work_time_hour,
-                                      work_time_minute))
+    # Read events before the session takes the lock, since standard input may be slow.
+    if path == '-':
+        lines = sys.stdin.readlines()
+    else:
+        with open(path) as f:
+            lines = f.readlines()
 
-        else:
-            work_time_minute = seconds // 60
-            print('"{}" clocked out at {} and worked for {} '
-                  'minute(s).'.format(name, clock_out_strf, work_time_minute))
+    accepted, rejected = session.ingest(lines)
+    display_warnings()
 
-        if SAVE_PROMPT:
-            # Ask for confirmation.
-            choice = None
-            while not choice in ('y', 'n'):
-                choice = input('Do you want to proceed? [y/n]: ')
-                choice = choice.lower()
+    # Display rejected lines with reasons.
+    if rejected:
+        print()
 
-            if choice == 'n':
-                return None    # brings back to infinite `while` loop
-            elif choice == 'y':
-                data[name].pop('clock_in_dt')  # there is no need to store it anymore
-                data[name]['clock_out_strf'] = clock_out_strf
-                data[name]['work_time_hour'] = work_time_hour
-                data[name]['work_time_minute'] = work_time_minute
+        for line_number, line, reason in rejected:
+            print('! Line {} "{}" rejected: {}'.format(line_number, line, reason))
 
-        else:    # continue without confirmation
-            data[name].pop('clock_in_dt')  # there is no need to store it anymore
-            data[name]['clock_out_strf'] = clock_out_strf
-            data[name]['work_time_hour'] = work_time_hour
-            data[name]['work_time_minute'] = work_time_minute
+    print()
+    print('Accepted {} event(s), rejected {} line(s).'.format(accepted, len(rejected)))
 
-    elif 'work_time_hour' in data[name]:
-        # If the person has already clocked out and left workplace.
-        print('{} has already left workplace.'.format(name))
+    display_saved_message()
 
 
 
 
 def display_present_workers():
-    """Displays present workers."""
+    """Displays present workers in alphabetic order."""
 
-    # NOTE: `clock_in_dt` is popped after the person leaves workplace so it helps to
-    # detect present workers. But do not use `not work_time_hour` here as it displays
-    #`day_start` dict too.
-    present_workers = [name for name in data if 'clock_in_dt' in data[name]]
+    present_workers = session.present_workers()
+    display_warnings()
 
     print()
     print('NOW ON WORKPLACE:')
@@ -445,6 +342,17 @@ def display_present_workers():
 
 
 
+def display_warnings():
+    """Displays the session's warnings, e.g. about damaged journal records, once."""
+
+    for warning in session.warnings:
+        print('Warning: ' + warning)
+
+    del session.warnings[:]
+
+
+
+
 def display_menu():
     """Displays menu."""
 
@@ -468,21 +376,152 @@ def display_menu():
 
 
 def write_to_file():
-    """Writes data to a file."""
+    """
+    Writes data to a file and brings the month's and year's rollups and the
+    history index up to date (see `ClockSession.flush()`). With the SQLite
+    backend, every record is already in the database, so nothing is left to
+    write.
+    """
+
+    session.flush()
+    display_warnings()
 
-    # Create a month dir. `MONTH_DIR` constant is defined on top of the script.
-    os.makedirs(MONTH_DIR, exist_ok=True)
+    display_saved_message()
 
-    with open(PATH_TO_FILENAME, 'w') as f:
-        f.write(pprint.pformat(data))
 
+
+
+def display_saved_message():
+    """Displays where data is saved."""
+
+    print()
+
+    if STORAGE_BACKEND == 'sqlite':
+        print('Saved to database "{}"'.format(sqlite_storage.DATABASE_PATH))
+    else:
         # Display the filename and path to it.
+        print('Saved as "{}" to "{}"'.format(session.filename, session.month_dir))
+
+    print()
+
+
+
+
+def current_day():
+    """Returns the day events are recorded for now, which starts at the rollover time."""
+
+    now = datetime.datetime.now()
+
+    return (now - datetime.timedelta(hours=ROLLOVER_HOUR, minutes=ROLLOVER_MINUTE)).date()
+
+
+
+
+def set_day(date):
+    """
+    Makes `date` the day events are recorded for. `load_data()` starts a new
+    session for it.
+    """
+
+    global TODAY
+
+    TODAY = date
+
+
+
+
+def roll_over():
+    """
+    Starts the current day (see `current_day()`) at the default start time
+    without any prompts. The finished day is closed in a background thread, so
+    the kiosk goes on accepting clock events at once.
+    """
+
+    path_to_finished_day = session.path_to_filename
+
+    print()
+    print('A new day has started. {} is closed in the background.'.format(TODAY.strftime('%d %b %Y')))
+
+    if STORAGE_BACKEND == 'sqlite':
+        # Every record is already in the database, so there is nothing to close.
+        session.close()
+    else:
+        # Every record of the finished day is in its journal or day file, so
+        # closing it needs nothing from memory. The script does not exit until
+        # the thread finishes.
+        close_day_timer.cancel()
+        threading.Thread(target=close_day, args=(path_to_finished_day,)).start()
+
+    set_day(current_day())
+    load_data(interactive=False)
+    schedule_close_day()
+
+
+
+
+def schedule_close_day():
+    """
+    Closes the day at the rollover time in a background thread, so that its
+    file is complete even if no one clocks in or out until morning.
+    `roll_over()` closes it once more to catch events recorded in between.
+    """
+
+    global close_day_timer
+
+    if STORAGE_BACKEND == 'sqlite':
+        return None
+
+    rollover_dt = datetime.datetime.combine(TODAY + datetime.timedelta(days=1),
+                                            datetime.time(ROLLOVER_HOUR, ROLLOVER_MINUTE))
+    seconds = max(0, (rollover_dt - datetime.datetime.now()).total_seconds())
+
+    close_day_timer = threading.Timer(seconds, close_day, args=(session.path_to_filename,))
+    close_day_timer.daemon = True    # do not keep the script running until the rollover time
+    close_day_timer.start()
+
+
+
+
+def close_day(path_to_filename):
+    """Closes a finished day (see `clock_session.close_day()`) and displays why it failed, if it did."""
+
+    try:
+        clock_session.close_day(WORKING_DIR, path_to_filename)
+
+    except OSError as err:
         print()
-        print('Saved as "{}" to "{}"'.format(TODAY_FILENAME, MONTH_DIR))
-        print()
+        print('! Could not close {}: {}'.format(path_to_filename, err.strerror))
 
 
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='A simple time and attendance system.')
+    parser.add_argument('--ingest', metavar='FILE',
+                        help='record clock events from FILE ("-" for standard input) '
+                             'without any prompts and exit')
+    parser.add_argument('--storage', choices=['files', 'sqlite'], default=STORAGE_BACKEND,
+                        help='where data is stored (default: %(default)s)')
+    parser.add_argument('--kiosk', action='store_true',
+                        help='run around the clock: start a new day at {}:{:02} without any prompts'.format(
+                            ROLLOVER_HOUR, ROLLOVER_MINUTE))
+    parser.add_argument('--roster', metavar='FILE',
+                        help='accept only names from FILE, one name per line '
+                             '(default: {} if it exists)'.format(roster.ROSTER_PATH))
+    options = parser.parse_args()
+
+    STORAGE_BACKEND = options.storage
+    KIOSK_MODE = options.kiosk
+
+    if options.roster or os.path.exists(roster.ROSTER_PATH):
+        try:
+            roster_index = roster.load_roster(options.roster or roster.ROSTER_PATH)
+        except OSError as err:
+            # Fatal error. Names can not be checked, so exit.
+            print('Error: could not read the roster: {}'.format(err.strerror))
+            sys.exit(0)
+
+    if options.ingest:
+        ingest_file(options.ingest)
+    else:
+        main()
@@ -0,0 +1,86 @@
+#! python3
+#
+# NAME          : clock_client.py
+#
+# DESCRIPTION   : A terminal of `clock_server.py`. Sends names and optional
+#                 time arguments to the server and displays its answers.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import json
+import socket
+import argparse    # is used to parse command line options
+
+import clock_server    # is used for the default address only
+
+
+# Functions.
+# ==========
+
+def main(host, port):
+    """Asks for input until Ctrl-C is pressed or the input ends."""
+
+    try:
+        connection = socket.create_connection((host, port))
+    except OSError as err:
+        # Fatal error. Nothing can be recorded, so exit.
+        print('Error: could not connect to {}:{}: {}'.format(host, port, err.strerror))
+        sys.exit(0)
+
+    with connection, connection.makefile('rwb') as f:
+        try:
+            while True:
+                print()
+
+                input_data = input('Enter name and time: ')
+
+                if not input_data.strip():
+                    continue
+
+                f.write(input_data.encode() + b'\n')
+                f.flush()
+
+                line = f.readline()
+
+                if not line:
+                    print('Error: the server has closed the connection.')
+                    break
+
+                display_response(json.loads(line))
+
+        except (KeyboardInterrupt, EOFError):    # handle Ctrl-C and the end of input
+            print()
+
+
+
+
+def display_response(response):
+    """Displays the server's answer."""
+
+    if 'present' in response:
+        print('NOW ON WORKPLACE:')
+
+        for name in response['present'] or ['NOBODY']:
+            print('\t' + name)
+
+    elif response['ok']:
+        print(response['message'])
+
+    else:
+        print('Error: ' + response['message'])
+
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='A terminal of clock_server.py.')
+    parser.add_argument('--host', default=clock_server.HOST, help='server\'s address (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=clock_server.PORT, help='server\'s port (default: %(default)s)')
+    options = parser.parse_args()
+
+    main(options.host, options.port)
@@ -0,0 +1,281 @@
+#! python3
+#
+# NAME          : clock_server.py
+#
+# DESCRIPTION   : A clock-in server for many terminals (e.g. badge readers). Holds
+#                 the day's data in memory, records clock events with the rules
+#                 of `check_my_time.py`, and group-commits them to the day's
+#                 journal.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import os
+import json
+import signal    # is used to stop the server gracefully
+import asyncio
+import datetime
+import argparse    # is used to parse command line options
+
+import day_files    # reads and writes day files
+import roster    # matches typed names to a roster of employees
+import clock_session    # holds the day's data and the rules of clock events
+import check_my_time    # starts the day like `check_my_time.py` does
+
+
+# Constants.
+# ==========
+
+HOST = '127.0.0.1'    # only local terminals can connect by default
+PORT = 8765
+
+# Terminals send one request per line and get one JSON object per line back:
+#   'Hulk 9:05' or 'Hulk'  --->  {"ok": true, "message": "\"Hulk\" clocked in at 9:05 ..."}
+#   'ALL'                  --->  {"ok": true, "present": ["Hulk", "Thor"]}
+# Rejected requests get `"ok": false` and a reason in "message". Without a
+# time argument, current time is used like in `check_my_time.py`.
+# NOTE: the server must be the only process that writes the day, since kiosks'
+# records are not read while it runs.
+
+# The day's clock events (see `clock_session.ClockSession`). Events are recorded
+# in its data only; the server writes them itself, see `commit_records()`.
+session = None
+
+# Group commit state. See `commit_records()`.
+pending_results = []    # stores `clock_session.Result` of events waiting to be written
+pending_futures = []
+commit_wakeup = None    # is created in `serve()`, since it belongs to an event loop
+journal_records = 0    # number of records in the journal since it was compacted
+
+
+# Functions.
+# ==========
+
+async def serve(host, port):
+    """Accepts terminals' connections until the server is stopped."""
+
+    global commit_wakeup
+
+    commit_wakeup = asyncio.Event()
+    committer = asyncio.create_task(commit_records())
+
+    server = await asyncio.start_server(handle_terminal, host, port)
+
+    print()
+    print('Listening on {}:{} ...'.format(host, port))
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        committer.cancel()
+
+
+
+
+async def handle_terminal(reader, writer):
+    """Answers requests of one terminal until it disconnects."""
+
+    try:
+        while True:
+            line = await reader.readline()
+
+            if not line:
+                break
+
+            response, result = handle_request(line.decode(errors='replace'))
+
+            if result is not None:
+                # Answer only after the record is on disk.
+                try:
+                    await commit(result)
+                except OSError as err:
+                    response = {'ok': False, 'message': 'could not save data: {}'.format(err.strerror)}
+
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+    except ConnectionError:
+        pass
+
+    finally:
+        writer.close()
+
+
+
+
+def handle_request(line):
+    """
+    Records a request's clock event in the day's data. Returns a tuple
+    `(response, result)`, where `result` is the `clock_session.Result` of the
+    event that must be committed before the response is sent, or `None`.
+    """
+
+    if line.strip().upper() == 'ALL':
+        return {'ok': True, 'present': sorted(session.present)}, None
+
+    try:
+        name, time_argument, hour, minute = clock_session.parse_args(line.split())
+    except (AssertionError, ValueError) as err:
+        return {'ok': False, 'message': str(err)}, None
+
+    if time_argument:
+        event_dt = session.event_time(hour, minute)
+    else:
+        # Use current time.
+        event_dt = datetime.datetime.now()
+
+    result = session.apply_event(name, event_dt)
+
+    return {'ok': result.ok, 'message': result.message}, result if result.ok else None
+
+
+
+
+async def commit(result):
+    """Waits until the record of an event is committed."""
+
+    future = asyncio.get_running_loop().create_future()
+
+    pending_results.append(result)
+    pending_futures.append(future)
+    commit_wakeup.set()
+
+    await future
+
+
+
+
+async def commit_records():
+    """
+    Commits pending records in groups: while one group is written and forced
+    to disk, requests for the next group keep coming in, so one `fsync` serves
+    all of them.
+    """
+
+    global journal_records
+
+    loop = asyncio.get_running_loop()
+
+    while True:
+        await commit_wakeup.wait()
+        commit_wakeup.clear()
+
+        results = list(pending_results)
+        futures = list(pending_futures)
+        del pending_results[:], pending_futures[:]
+
+        # No need to write a person twice.
+        names = list(dict.fromkeys(result.name for result in results))
+
+        # Records are replaced, never changed, so what is taken here will not
+        # change while it is written in another thread. Compaction rewrites the
+        # whole day, so it is done only once the journal outgrows the day file.
+        if journal_records + len(names) >= max(session.journal_compact_every, len(session.data)):
+            lines, snapshot = None, dict(session.data)
+        else:
+            lines = [day_files.encode_record(name, session.data[name]) for name in names]
+            snapshot = None
+
+        try:
+            await loop.run_in_executor(None, write_records, lines, snapshot)
+        except OSError as err:
+            # Terminals are told the events failed, so they must not be
+            # displayed by `ALL` or written with the next group.
+            restore_records(results)
+
+            for future in futures:
+                if not future.done():
+                    future.set_exception(err)
+        else:
+            journal_records = 0 if snapshot is not None else journal_records + len(names)
+
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+
+
+
+
+def restore_records(results):
+    """
+    Puts back records that events of `results` replaced, latest events first.
+    A record that a later event has already replaced is left to that event's
+    commit.
+    """
+
+    for result in reversed(results):
+        if session.data.get(result.name) is not result.record:
+            continue
+
+        if result.previous is None:    # the event was a clock-in
+            del session.data[result.name]
+            session.present.discard(result.name)
+        else:
+            session.apply_record(result.name, result.previous)
+
+
+
+
+def write_records(lines, snapshot):
+    """
+    Appends encoded records to the journal, or, if `snapshot` is given, writes
+    it to the day file and removes the journal. Is run in a worker thread.
+    """
+
+    with day_files.locked(session.path_to_lock):
+        if snapshot is None:
+            day_files.append_to_journal(session.path_to_journal, lines, sync=True)
+            return None
+
+        day_files.write_day_file(session.path_to_filename, snapshot)
+
+        # The new file supersedes an old text file for today, if there was one.
+        path_to_legacy_file = os.path.splitext(session.path_to_filename)[0] + day_files.LEGACY_DAY_FILE_EXTENSION
+
+        for path in (path_to_legacy_file, session.path_to_journal):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='A clock-in server for many terminals.')
+    parser.add_argument('--host', default=HOST, help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=PORT, help='port to listen on (default: %(default)s)')
+    parser.add_argument('--roster', metavar='FILE',
+                        help='accept only names from FILE, one name per line '
+                             '(default: {} if it exists)'.format(roster.ROSTER_PATH))
+    options = parser.parse_args()
+
+    if options.roster or os.path.exists(roster.ROSTER_PATH):
+        try:
+            check_my_time.roster_index = roster.load_roster(options.roster or roster.ROSTER_PATH)
+        except OSError as err:
+            # Fatal error. Names can not be checked, so exit.
+            print('Error: could not read the roster: {}'.format(err.strerror))
+            sys.exit(0)
+
+    check_my_time.load_data(interactive=False)
+    session = check_my_time.session
+
+    # Stop on `kill` the same way as on Ctrl-C.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        asyncio.run(serve(options.host, options.port))
+    except KeyboardInterrupt:    # handle Ctrl-C exception
+        pass
+
+    # Every answered request is in the journal already. Write everything to the
+    # day file, including events whose terminals disconnected before the answer.
+    write_records(None, dict(session.data))
+
+    print()
+    print('Saved as "{}" to "{}"'.format(session.filename, session.month_dir))
+    print()
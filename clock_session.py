@@ -0,0 +1,800 @@
+#! python3
+#
+# NAME          : clock_session.py
+#
+# DESCRIPTION   : A day of clock events of `check_my_time.py` as an object. Loads
+#                 the day's data, records clock-ins and clock-outs with the
+#                 rules of the script, and saves them to the day's journal and
+#                 day file or to an SQLite database. Asks and prints nothing, so
+#                 that other programs can drive it, and one process can hold
+#                 sessions of several days or working dirs.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import os
+import datetime
+
+import day_files    # reads and writes day files
+import sqlite_storage    # is an optional SQLite storage backend
+import roster    # matches typed names to a roster of employees
+import records    # holds people's records in memory
+import rollups    # keeps sums of whole months and years for `report_creator.py`
+import history    # keeps an index of people's records for `history.py`
+
+
+# Constants.
+# ==========
+
+# Every clock event is appended to a journal next to the day file, so that a
+# crash loses nothing. The journal is shared by all kiosks that write the day:
+# `ClockSession.refresh()` reads records other kiosks appended to it, and
+# `ClockSession.compact_journal()` merges it into the day file.
+# NOTE: the journal's extension must differ from day files' extensions, otherwise
+# Report Creator will try to read it as a day file.
+JOURNAL_EXTENSION = '.journal'
+
+JOURNAL_FSYNC_EVERY = 10    # force the journal to disk after this number of records
+JOURNAL_COMPACT_EVERY = 200    # compact the journal into the day file after this number of records
+
+
+# Classes.
+# ========
+
+class Result:
+    """
+    What a clock event came to. `ok` is `True` if the event is recorded (or can
+    be, see `ClockSession.preview()`), `action` is 'in' or 'out', `name` is the
+    name the event is recorded for, `record` is the person's new record (see
+    `records.Entry`) and `previous` is the one it replaces. `message` is for the
+    user, e.g. how late the person was or why the event is rejected.
+    """
+
+    __slots__ = ('ok', 'action', 'name', 'record', 'previous', 'message')
+
+    def __init__(self, ok, message, action=None, name=None, record=None, previous=None):
+        self.ok = ok
+        self.message = message
+        self.action = action
+        self.name = name
+        self.record = record
+        self.previous = previous
+
+
+    def __repr__(self):
+        return 'Result(ok={}, action={!r}, name={!r}, message={!r})'.format(self.ok, self.action, self.name,
+                                                                            self.message)
+
+
+
+
+class ClockSession:
+    """
+    Clock events of one day. Kiosks and services that write the same day take
+    turns holding its lock (see `lock()`), and every session reads what the
+    others have written before it records an event.
+
+    `storage` is 'files' or 'sqlite'. `roster_index` is an index of the roster
+    (see `roster.py`); without it, names are recorded as they are typed.
+    `database_path` is used by the SQLite backend only.
+    """
+
+    def __init__(self, date, working_dir=day_files.WORKING_DIR, storage='files', roster_index=None,
+                 journal_fsync_every=JOURNAL_FSYNC_EVERY, journal_compact_every=JOURNAL_COMPACT_EVERY,
+                 database_path=sqlite_storage.DATABASE_PATH):
+        self.date = date
+        self.working_dir = working_dir
+        self.storage = storage
+        self.database_path = database_path
+        self.roster_index = roster_index
+        self.journal_fsync_every = journal_fsync_every
+        self.journal_compact_every = journal_compact_every
+
+        # Day files are stored in /.../Work Attendance Files/<Year>/<Month's number> — <Month>/
+        # `%-d` is non-zero-padded day's number. If changed to `%d`, also change
+        # `ZERO_PADDED_FILENAMES` in `report_creator.py` from `False` to `True`.
+        self.filename = date.strftime('%-d') + day_files.DAY_FILE_EXTENSION
+        self.year_dir = os.path.join(working_dir, date.strftime('%Y'))
+        self.month_dir = os.path.join(working_dir, day_files.month_dir_of(date))
+        self.path_to_filename = os.path.join(self.month_dir, self.filename)
+        self.path_to_journal = os.path.splitext(self.path_to_filename)[0] + JOURNAL_EXTENSION
+        self.path_to_lock = os.path.splitext(self.path_to_filename)[0] + day_files.LOCK_FILE_EXTENSION
+
+        self.data = {}    # stores people's records by names and the day's start time by 'day_start'
+        self.day_start_dt = None
+
+        # Names of people on workplace. It is updated by `apply_record()` with
+        # every record, so `present_workers()` does not scan the whole day's data.
+        self.present = set()
+
+        self.connection = None    # database connection of the SQLite backend. See `load()`.
+
+        # Journal state. See `append_to_journal()`.
+        self.unsynced_records = 0
+        self.uncompacted_records = 0
+
+        # What `refresh()` has already read: signature of the day file and the
+        # journal's inode number and offset of its first unread byte.
+        self.day_file_signature = None
+        self.journal_inode = None
+        self.journal_offset = 0
+
+        # Warnings for the user, e.g. about damaged journal records. Callers
+        # display and clear them.
+        self.warnings = []
+
+
+    def load(self):
+        """
+        Loads what is already written for the day, maybe by other kiosks.
+        Returns `True` if the day has started, otherwise `start_day()` must be
+        called. Raises `ValueError` if there are records but no start time.
+        """
+
+        if self.storage == 'sqlite' and self.connection is None:
+            self.connection = sqlite_storage.connect(self.database_path)
+
+        with self.lock():
+            self.refresh()
+
+        if not self.data:
+            return False
+
+        if 'day_start' not in self.data:
+            raise ValueError('no `day_start_dt` value found.')
+
+        self.day_start_dt = self.data['day_start']['day_start_dt']
+
+        return True
+
+
+    def start_day(self, hour, minute):
+        """
+        Starts the day at `hour`:`minute`. Returns `False` if another kiosk
+        has started it in the meantime; its start time is used then.
+        """
+
+        day_start_dt = datetime.datetime(self.date.year, self.date.month, self.date.day, hour, minute)
+
+        # Add new start time to data so that it could be used when loaded later.
+        record = {'day_start_dt': day_start_dt,
+                  'day_start_hour': hour,
+                  'day_start_minute': minute
+                  }
+
+        started = self.commit_record('day_start', record, None)
+        self.day_start_dt = self.data['day_start']['day_start_dt']
+
+        return started
+
+
+    def close(self):
+        """Closes the database connection of the SQLite backend."""
+
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+    def lock(self):
+        """
+        Returns a lock of the day's data for a `with` statement. Kiosks that
+        write the same day take turns holding it. Never wait for the user's
+        input while holding it.
+        """
+
+        if self.storage == 'sqlite':
+            return sqlite_storage.locked(self.connection)
+
+        os.makedirs(self.month_dir, exist_ok=True)
+
+        return day_files.locked(self.path_to_lock)
+
+
+    def match_name(self, typed_name):
+        """
+        Matches a typed name to the roster. Returns a tuple `(name, suggestions)`
+        (see `roster.lookup()`). Without a roster, any name matches itself.
+        """
+
+        if self.roster_index is None:
+            return typed_name, []
+
+        return roster.lookup(self.roster_index, typed_name)
+
+
+    def event_time(self, hour, minute):
+        """Returns the time of an event at `hour`:`minute` of the day."""
+
+        return datetime.datetime(self.day_start_dt.year, self.day_start_dt.month, self.day_start_dt.day,
+                                 hour, minute)
+
+
+    def preview(self, name, event_dt=None):
+        """
+        Finds what an event of a person at `event_dt` (current time if `None`)
+        comes to, without saving it: the first event of a day clocks the person
+        in, the second one clocks them out. Only exact or unambiguous roster
+        matches are accepted. Clocking in before day's start time counts as
+        coming early, so interactive callers may want to confirm it. Returns a
+        `Result`, which `commit()` saves.
+        """
+
+        roster_name, suggestions = self.match_name(name)
+
+        if roster_name is None:
+            return Result(False, not_on_roster_message(name, suggestions))
+
+        name = roster_name
+
+        # The person may have clocked in or out at another kiosk.
+        with self.lock():
+            self.refresh(name)
+
+        if event_dt is None:
+            event_dt = datetime.datetime.now()
+
+        previous = self.data.get(name)
+
+        if previous is None:    # if a name was entered for the first time a day
+            record = calculate_clock_in(self.day_start_dt, event_dt)
+
+            return Result(True, clock_in_message(name, record), 'in', name, record)
+
+        if not previous.is_present():
+            # If the person has already clocked out and left workplace.
+            return Result(False, '{} has already left workplace.'.format(name), 'out', name)
+
+        record = calculate_clock_out(self.day_start_dt, previous, event_dt)
+
+        # Prevent incorrect input.
+        if record is None:
+            return Result(False, '"{}" could not clock out at that time.'.format(name), 'out', name)
+
+        return Result(True, clock_out_message(name, record), 'out', name, record, previous)
+
+
+    def commit(self, result):
+        """
+        Saves an event found by `preview()` unless another kiosk has changed
+        the person's record since. Returns the `Result` of saving.
+        """
+
+        if not result.ok:
+            return result
+
+        if not self.commit_record(result.name, result.record, result.previous):
+            if result.action == 'in':
+                message = '"{}" has just clocked in at another kiosk. Nothing is saved.'.format(result.name)
+            else:
+                message = '"{}" has just clocked out at another kiosk. Nothing is saved.'.format(result.name)
+
+            return Result(False, message, result.action, result.name, result.record, result.previous)
+
+        return result
+
+
+    def record(self, name, event_dt=None):
+        """Records a person's event (see `preview()`) and saves it. Returns a `Result`."""
+
+        return self.commit(self.preview(name, event_dt))
+
+
+    def clock_in(self, name, event_dt=None):
+        """Records time a person clocked in. Returns a `Result`."""
+
+        result = self.preview(name, event_dt)
+
+        if result.ok and result.action != 'in':
+            return Result(False, '"{}" has already clocked in.'.format(result.name), 'in', result.name)
+
+        return self.commit(result)
+
+
+    def clock_out(self, name, event_dt=None):
+        """Records time a person clocked out. Returns a `Result`."""
+
+        result = self.preview(name, event_dt)
+
+        if result.ok and result.action != 'out':
+            return Result(False, '"{}" has not clocked in.'.format(result.name), 'out', result.name)
+
+        return self.commit(result)
+
+
+    def present_workers(self):
+        """Returns names of people on workplace in alphabetic order."""
+
+        # Other kiosks may have clocked people in or out.
+        with self.lock():
+            self.refresh()
+
+        return sorted(self.present)
+
+
+    def apply_event(self, name, event_dt):
+        """
+        Records a clock event in `data` without saving it. The same rules as in
+        `preview()` apply. Is used to record many events at once, which are
+        then saved together, see `ingest()`. Returns a `Result`.
+        """
+
+        roster_name, suggestions = self.match_name(name)
+
+        if roster_name is None:
+            return Result(False, not_on_roster_message(name, suggestions))
+
+        name = roster_name
+        previous = self.data.get(name)
+
+        if previous is None:    # if a name was entered for the first time a day
+            record = calculate_clock_in(self.day_start_dt, event_dt)
+            self.apply_record(name, record)
+
+            return Result(True, clock_in_message(name, record), 'in', name, record)
+
+        elif not previous.is_present():
+            return Result(False, '{} has already left workplace.'.format(name), 'out', name)
+
+        else:    # if a name was entered for the second time a day
+            record = calculate_clock_out(self.day_start_dt, previous, event_dt)
+
+            if record is None:
+                return Result(False, '"{}" could not clock out at that time.'.format(name), 'out', name)
+
+            self.apply_record(name, record)
+
+            return Result(True, clock_out_message(name, record), 'out', name, record, previous)
+
+
+    def ingest(self, lines):
+        """
+        Records clock events from lines like "Name (Full Name) hh:mm" and writes
+        the day's data once at the end. The day's lock is held meanwhile, so
+        kiosks wait for it. Returns the number of accepted events and a list of
+        rejected lines as `(line_number, line, reason)` tuples.
+        """
+
+        accepted = 0
+        rejected = []
+
+        with self.lock():
+            self.refresh()
+
+            for line_number, line in enumerate(lines, start=1):
+                line = line.strip()
+
+                if not line:
+                    # Skip blank lines silently.
+                    continue
+
+                try:
+                    name, time_argument, hour, minute = parse_args(line.split())
+                except (AssertionError, ValueError) as err:
+                    rejected.append((line_number, line, str(err)))
+                    continue
+
+                if not time_argument:
+                    # Current time means nothing for events recorded elsewhere.
+                    rejected.append((line_number, line, 'no time argument.'))
+                    continue
+
+                result = self.apply_event(name, self.event_time(hour, minute))
+
+                if not result.ok:
+                    rejected.append((line_number, line, result.message))
+                    continue
+
+                accepted += 1
+
+            self.write_day()
+
+        return accepted, rejected
+
+
+    def flush(self):
+        """
+        Merges the journal into the day file and brings the month's and year's
+        rollups and the history index up to date, so that reports and queries
+        do not have to. With the SQLite backend, every record is already in the
+        database, so nothing is left to write.
+        """
+
+        if self.storage != 'files':
+            return None
+
+        self.compact_journal()
+
+        if os.path.exists(self.path_to_filename):
+            rollups.update_day_file(self.path_to_filename)
+            history.update_day_file(self.working_dir, self.path_to_filename)
+
+
+    def commit_record(self, name, record, previous_record):
+        """
+        Saves a person's new record (or day's start time if `name` is
+        'day_start') unless another kiosk has changed it since `previous_record`
+        was read. Returns `True` if the record is saved.
+        """
+
+        with self.lock():
+            self.refresh(name)
+
+            if self.data.get(name) != previous_record:
+                return False
+
+            self.apply_record(name, record)
+            self.write_record(name)
+
+        # Compaction takes the lock itself.
+        if self.storage == 'files' and self.uncompacted_records >= self.journal_compact_every:
+            self.compact_journal()
+
+        return True
+
+
+    def apply_record(self, name, record):
+        """Puts a person's record into `data` and keeps `present` up to date."""
+
+        self.data[name] = record
+
+        if name != 'day_start':
+            if record.is_present():
+                self.present.add(name)
+            else:
+                self.present.discard(name)
+
+
+    def refresh(self, name=None):
+        """
+        Applies records other kiosks have written to `data`. With the SQLite
+        backend, only `name`'s record is read if `name` is given. Must be called
+        while holding the day's lock.
+        """
+
+        if self.storage == 'sqlite':
+            if name is not None:
+                record = sqlite_storage.load_record(self.connection, self.date, name)
+
+                if record is not None:
+                    self.apply_record(name, record)
+
+            else:
+                for name, record in (sqlite_storage.load_day(self.connection, self.date) or {}).items():
+                    self.apply_record(name, record)
+
+            return None
+
+        # Find the day's file. It may also be an old text file.
+        path_to_day_file = day_files.find_day_file(self.month_dir, os.path.splitext(self.filename)[0])
+        signature = None
+
+        if path_to_day_file:
+            stat = os.stat(path_to_day_file)
+            signature = (path_to_day_file, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        if signature != self.day_file_signature:
+            # The day file was compacted by another kiosk: it has every record the
+            # journal had, and the journal was started anew.
+            if path_to_day_file:
+                for name, record in day_files.read_day_file(path_to_day_file).items():
+                    self.apply_record(name, record)
+
+            self.day_file_signature = signature
+            self.journal_offset = 0
+
+        # Read records appended to the journal since the last call.
+        try:
+            f = open(self.path_to_journal, 'rb')
+        except FileNotFoundError:
+            return None
+
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+
+            if inode != self.journal_inode:
+                self.journal_inode = inode
+                self.journal_offset = 0
+
+            f.seek(self.journal_offset)
+            chunk = f.read()
+
+        # Leave a torn last line unread. Once another record is appended after it,
+        # it is skipped as damaged.
+        end = chunk.rfind(b'\n') + 1
+        self.journal_offset += end
+
+        for line in chunk[:end].splitlines():
+            try:
+                name, record = day_files.decode_record(line)
+            except (KeyError, ValueError):
+                # A torn line is what a crash in the middle of a write leaves
+                # behind. Its event was never confirmed, so skip it.
+                self.warnings.append('skipped a damaged journal record.')
+                continue
+
+            self.apply_record(name, record)
+
+
+    def write_record(self, name):
+        """Writes a person's current record. Must be called while holding the day's lock."""
+
+        if self.storage == 'sqlite':
+            sqlite_storage.insert_record(self.connection, self.date, name, self.data[name])
+        else:
+            self.append_to_journal(name)
+
+
+    def write_day(self):
+        """Writes all the day's data. Must be called while holding the day's lock."""
+
+        if self.storage == 'sqlite':
+            sqlite_storage.insert_day(self.connection, self.date, self.data)
+        else:
+            self.write_day_file()
+
+
+    def append_to_journal(self, name):
+        """
+        Appends a person's current record to the day's journal. The record is a
+        line of a day file, so replaying it simply overwrites the person's
+        record in `data`. Must be called while holding the day's lock.
+        """
+
+        self.unsynced_records += 1
+        self.uncompacted_records += 1
+
+        # `fsync` is expensive, so it is batched.
+        sync = self.unsynced_records >= self.journal_fsync_every
+
+        if sync:
+            self.unsynced_records = 0
+
+        # Another kiosk may have compacted the journal, so it is opened every time.
+        # The record is already in `data`, so do not read it again.
+        self.journal_offset = day_files.append_to_journal(self.path_to_journal,
+                                                          [day_files.encode_record(name, self.data[name])],
+                                                          sync)
+
+
+    def compact_journal(self):
+        """Merges the journal into the day file."""
+
+        with self.lock():
+            self.refresh()
+            self.write_day_file()
+
+
+    def write_day_file(self):
+        """
+        Writes `data` to the day file and empties the journal. Must be called
+        while holding the day's lock right after `refresh()`.
+        """
+
+        os.makedirs(self.month_dir, exist_ok=True)
+
+        day_files.write_day_file(self.path_to_filename, self.data)
+
+        # The new file supersedes an old text file for the day, if there was one.
+        path_to_legacy_file = os.path.splitext(self.path_to_filename)[0] + day_files.LEGACY_DAY_FILE_EXTENSION
+
+        if os.path.exists(path_to_legacy_file):
+            os.remove(path_to_legacy_file)
+
+        # Records are whole person's records, so replaying the journal on top of the
+        # new file is harmless if we crash before the journal is removed.
+        if os.path.exists(self.path_to_journal):
+            os.remove(self.path_to_journal)
+
+        # The file holds everything in `data`, so do not read it again.
+        stat = os.stat(self.path_to_filename)
+        self.day_file_signature = (self.path_to_filename, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self.journal_inode = None
+        self.journal_offset = 0
+
+        self.unsynced_records = 0
+        self.uncompacted_records = 0
+
+
+
+
+# Functions.
+# ==========
+
+def parse_args(args):
+    """
+    Parses a name and an optional time argument from split input data.
+    Returns a tuple `(name, time_argument, hour, minute)`, where `hour` and
+    `minute` are `None` if no time argument was entered. Raises `AssertionError`
+    or `ValueError` with a message for the user if the input is incorrect.
+    """
+
+    hour, minute = None, None
+
+    if len(args) == 1:    # only name was entered
+        name = args[0]
+        assert name.isalpha(), 'name must contain only letters.'
+
+        time_argument = False
+
+    elif len(args) > 1:    # name and time were entered or just full name was entered
+        time_argument = True    # assume that time argument was entered
+
+        # Validate time argument.
+        try:
+            # If this fails, `ValueError` is raised, saying that
+            # "there are not enough values to unpack (expected 2, got 1)"
+            # That means that no time argument but full name was entered.
+            hour, minute = args[-1].split(':')
+
+            # If this fails, `ValueError` is raised, saying that
+            # "invalid literal for int() with base 10"
+            hour, minute = int(hour), int(minute)
+
+            # If this fails, `ValueError` is raised, saying that
+            # "hour/minute must be in ..."
+            datetime.time(hour, minute)
+
+        except ValueError as err:
+            if 'unpack' in str(err):
+                name = ' '.join(args)    # full name, to be exact
+                time_argument = False
+                hour, minute = None, None
+
+            else:
+                raise
+
+        else:    # is executed only if the statements in `try` block do not raise an exception
+            name = ' '.join(args[:-1])    # name/full name without the time argument
+
+        # Ensure that the name contains only letters.
+        for part_of_name in name.split():
+            assert part_of_name.isalpha(), 'name must contain only letters.'
+
+    else:
+        # Throw `AssetionError` instead of `Exception` to avoid hiding bugs.
+        raise AssertionError('whitespace is not a name.')     # if whitespace was entered
+
+    return name, time_argument, hour, minute
+
+
+
+
+def calculate_clock_in(day_start_dt, clock_in_dt):
+    """
+    Calculates time a person was early or late for and returns the person's
+    record (see `records.Entry`). Clocking in before day's start time counts as
+    coming early.
+    """
+
+    if clock_in_dt < day_start_dt:
+        # Calculate time the person was early and write 'early' data only.
+        seconds = (day_start_dt - clock_in_dt).seconds
+        return records.Entry(clock_in_dt, True, early_time=seconds // 60)
+
+    else:
+        # Calculate time the person was late for and write 'late' data only.
+        seconds = (clock_in_dt - day_start_dt).seconds
+        return records.Entry(clock_in_dt, False, late_time=seconds // 60)
+
+
+
+
+def calculate_clock_out(day_start_dt, record, clock_out_dt):
+    """
+    Calculates time a person has worked for and returns the person's updated
+    record. The given record is not changed. Returns `None` if the person could
+    not clock out at that time.
+    """
+
+    # Prevent incorrect input.
+    if clock_out_dt < day_start_dt or clock_out_dt < record.clock_in:
+        return None
+
+    # Calculate time of working.
+    seconds = (clock_out_dt - record.clock_in).seconds
+
+    return record.clocked_out(clock_out_dt, seconds // 60)
+
+
+
+
+def clock_in_message(name, record):
+    """Returns a message about a person who has clocked in."""
+
+    clock_in_strf = '{}:{:02}'.format(record.clock_in.hour, record.clock_in.minute)
+
+    if record.clock_in_early:
+        early_time_hour, early_time_minute = divmod(record.early_time, 60)
+
+        if early_time_hour > 0:
+            return '"{}" clocked in in at {} and was {} hour(s), {} minute(s) early.'\
+                   .format(name, clock_in_strf, early_time_hour, early_time_minute)
+
+        else:
+            return '"{}" clocked in in at {} and was {} minute(s) early.'\
+                   .format(name, clock_in_strf, early_time_minute)
+
+    else:
+        late_time_hour, late_time_minute = divmod(record.late_time, 60)
+
+        if late_time_hour > 0:
+            return '"{}" clocked in at {} and was late for {} hour(s), {} minute(s).'\
+                   .format(name, clock_in_strf, late_time_hour, late_time_minute)
+        else:
+            return '"{}" clocked in at {} and was late for {} minute(s).'\
+                   .format(name, clock_in_strf, late_time_minute)
+
+
+
+
+def clock_out_message(name, record):
+    """Returns a message about a person who has clocked out."""
+
+    clock_out_strf = '{}:{:02}'.format(record.clock_out.hour, record.clock_out.minute)
+    work_time_hour, work_time_minute = divmod(record.work_time, 60)
+
+    if work_time_hour > 0:
+        return '"{}" clocked out at {} and worked for {} hour(s), {} '\
+               'minute(s).'.format(name, clock_out_strf, work_time_hour, work_time_minute)
+
+    else:
+        return '"{}" clocked out at {} and worked for {} '\
+               'minute(s).'.format(name, clock_out_strf, work_time_minute)
+
+
+
+
+def not_on_roster_message(typed_name, suggestions):
+    """Returns a message for a name that is not on the roster."""
+
+    if suggestions:
+        return '"{}" is not on the roster. Did you mean: {}?'.format(
+            typed_name, ', '.join('"{}"'.format(suggestion) for suggestion in suggestions))
+
+    return '"{}" is not on the roster.'.format(typed_name)
+
+
+
+
+def close_day(working_dir, path_to_filename):
+    """
+    Merges a finished day's journal into its day file and brings rollups and
+    the history index up to date. Records are read from disk, not from a
+    session's `data`, so it is safe to run in a background thread while the
+    next day goes on. Raises `OSError` if the day could not be closed.
+    """
+
+    month_dir, filename = os.path.split(path_to_filename)
+    day_filename = os.path.splitext(filename)[0]
+    path_to_journal = os.path.join(month_dir, day_filename + JOURNAL_EXTENSION)
+
+    with day_files.locked(os.path.join(month_dir, day_filename + day_files.LOCK_FILE_EXTENSION)):
+        path_to_day_file = day_files.find_day_file(month_dir, day_filename)
+        day_data = day_files.read_day_file(path_to_day_file) if path_to_day_file else {}
+
+        if os.path.exists(path_to_journal):
+            with open(path_to_journal, 'rb') as f:
+                for line in f.read().splitlines():
+                    try:
+                        name, record = day_files.decode_record(line)
+                    except (KeyError, ValueError):
+                        continue    # a torn line; see `ClockSession.refresh()`
+
+                    day_data[name] = record
+
+        if 'day_start' in day_data:
+            day_files.write_day_file(path_to_filename, day_data)
+
+            # The new file supersedes an old text file, if there was one.
+            for path in (os.path.join(month_dir, day_filename + day_files.LEGACY_DAY_FILE_EXTENSION),
+                         path_to_journal):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    if os.path.exists(path_to_filename):
+        rollups.update_day_file(path_to_filename)
+        history.update_day_file(working_dir, path_to_filename)
@@ -0,0 +1,434 @@
+#! python3
+#
+# NAME          : day_files.py
+#
+# DESCRIPTION   : Reads and writes day files of `check_my_time.py`. Also converts
+#                 old text files to the new format.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import os
+import ast    # is used to parse data from old text files only
+import json
+import datetime
+import contextlib    # is used to hold locks in `with` statements
+
+import records    # holds people's records in memory
+
+try:
+    import fcntl    # is used to lock day files; is not available on Windows
+except ImportError:
+    fcntl = None
+
+
+# Constants.
+# ==========
+
+WORKING_DIR = 'Work Attendance Files'    # dir where day files are stored
+
+# Day files are JSON Lines files: the first line holds day's start time and each
+# of the next lines holds one person's record, e.g.
+#   {"day_start": "2016-10-29T09:00:00"}
+#   {"name": "Hulk", "clock_in": "2016-10-29T09:05:00", "clock_in_early": false,
+#    "late_time": 5, "clock_out": "2016-10-29T21:11:00", "work_time": 726}
+# Time values are stored as integer numbers of minutes.
+DAY_FILE_EXTENSION = '.jsonl'
+LEGACY_DAY_FILE_EXTENSION = '.txt'    # `pprint`-formatted Python literals
+
+# Extensions in order of preference. If both files exist for a day, the new one wins.
+DAY_FILE_EXTENSIONS = (DAY_FILE_EXTENSION, LEGACY_DAY_FILE_EXTENSION)
+
+CATEGORIES = ('early', 'late', 'work')
+
+# Processes that write the same day (e.g. several kiosks) take turns by locking
+# a lock file next to the day file. Lock files are never removed, since removing
+# them would let two processes lock different files.
+LOCK_FILE_EXTENSION = '.lock'
+
+
+# Functions.
+# ==========
+
+def encode_record(name, record):
+    """
+    Encodes a person's entry (see `records.Entry`) or day's start time if `name`
+    is 'day_start' as one line of a day file.
+    """
+
+    return json.dumps(record_to_line(name, record))
+
+
+
+
+def record_to_line(name, record):
+    """
+    Converts a person's entry (or day's start time if `name` is 'day_start') to
+    a dict of values stored in a line of a day file.
+    """
+
+    if name == 'day_start':
+        return {'day_start': record['day_start_dt'].isoformat()}
+
+    line = {'name': name,
+            'clock_in': record.clock_in.isoformat(),
+            'clock_in_early': record.clock_in_early
+            }
+
+    if record.clock_out is not None:
+        line['clock_out'] = record.clock_out.isoformat()
+
+    # Only values that are set are stored.
+    for category, minutes in zip(CATEGORIES, (record.early_time, record.late_time, record.work_time)):
+        if minutes is not None:
+            line['{}_time'.format(category)] = minutes
+
+    return line
+
+
+
+
+def decode_record(line):
+    """
+    Decodes one line of a day file. Returns a tuple `(name, record)` where
+    `record` is a `records.Entry` or a dict of day's start time if `name` is
+    'day_start'.
+    """
+
+    return line_to_record(json.loads(line))
+
+
+
+
+def line_to_record(line):
+    """Converts a dict of values of a day file's line back to a tuple `(name, record)`."""
+
+    if 'day_start' in line:
+        day_start_dt = datetime.datetime.fromisoformat(line['day_start'])
+
+        return 'day_start', {'day_start_dt': day_start_dt,
+                             'day_start_hour': day_start_dt.hour,
+                             'day_start_minute': day_start_dt.minute
+                             }
+
+    clock_out = line.get('clock_out')
+
+    return line['name'], records.Entry(datetime.datetime.fromisoformat(line['clock_in']),
+                                       line['clock_in_early'],
+                                       None if clock_out is None else datetime.datetime.fromisoformat(clock_out),
+                                       line.get('early_time'),
+                                       line.get('late_time'),
+                                       line.get('work_time'))
+
+
+
+
+def legacy_record_to_entry(record, day):
+    """
+    Converts a person's record of an old text file (a dict with keys like
+    `clock_in_strf` and `work_time_hour`) to a `records.Entry`. `day` is a date
+    object used to turn `clock_in_strf` and `clock_out_strf` into timestamps.
+    """
+
+    # `clock_in_dt` is kept only while the person is on workplace. Use it if
+    # possible since it is more precise than `clock_in_strf`.
+    if 'clock_in_dt' in record:
+        clock_in = record['clock_in_dt']
+    else:
+        clock_in = strf_to_datetime(day, record['clock_in_strf'])
+
+    clock_out = None
+
+    if 'clock_out_strf' in record:
+        clock_out = strf_to_datetime(day, record['clock_out_strf'])
+
+    minutes = []
+
+    for category in CATEGORIES:
+        if '{}_time_hour'.format(category) in record:
+            minutes.append(record['{}_time_hour'.format(category)] * 60 + record['{}_time_minute'.format(category)])
+        else:
+            minutes.append(None)
+
+    return records.Entry(clock_in, record['clock_in_early'], clock_out, *minutes)
+
+
+
+
+def read_day_file(path):
+    """
+    Reads a day file of either format and returns a dict of records keyed by
+    names (plus the 'day_start' key).
+    """
+
+    if path.endswith(LEGACY_DAY_FILE_EXTENSION):
+        return read_legacy_day_file(path)
+
+    data = {}
+
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                name, record = decode_record(line)
+                data[name] = record
+
+    return data
+
+
+
+
+def read_legacy_day_file(path):
+    """
+    Reads an old `pprint`-formatted text file. Timestamps are parsed without
+    `eval()`, so no code from the file is ever run. Records are converted to
+    `records.Entry` objects, so the result is the same as of `read_day_file()`.
+    """
+
+    with open(path) as f:
+        data = ast.literal_eval(f.read())
+
+    if 'day_start_dt' in data.get('day_start', {}):
+        data['day_start']['day_start_dt'] = parse_datetime_repr(data['day_start']['day_start_dt'])
+        day = data['day_start']['day_start_dt'].date()
+    else:
+        # Clock times can not be dated, but their time values are still right.
+        day = datetime.date.min
+
+    for name in data:
+        if name != 'day_start':
+            if 'clock_in_dt' in data[name]:
+                data[name]['clock_in_dt'] = parse_datetime_repr(data[name]['clock_in_dt'])
+
+            data[name] = legacy_record_to_entry(data[name], day)
+
+    return data
+
+
+
+
+def write_day_file(path, data):
+    """
+    Writes a dict of records to a day file. The file is replaced atomically, so
+    it always holds either the old or the new data.
+    """
+
+    path_to_temp_file = path + '.tmp'
+
+    with open(path_to_temp_file, 'w') as f:
+        f.write(encode_record('day_start', data['day_start']) + '\n')
+
+        for name in sorted(data):
+            if name != 'day_start':
+                f.write(encode_record(name, data[name]) + '\n')
+
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(path_to_temp_file, path)
+
+
+
+
+def append_to_journal(path, lines, sync):
+    """
+    Appends encoded records (see `encode_record()`) to a journal with one write.
+    Forces them to disk if `sync` is `True`. Returns the journal's size.
+    """
+
+    with open(path, 'a+b') as f:
+        if f.tell() > 0:
+            # Make sure records start on a new line even after a torn line.
+            f.seek(-1, os.SEEK_END)
+
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+        f.write(''.join(line + '\n' for line in lines).encode())
+        f.flush()    # hand the records over to the OS right away
+
+        if sync:
+            os.fsync(f.fileno())
+
+        return f.tell()
+
+
+
+
+@contextlib.contextmanager
+def locked(path_to_lock):
+    """
+    Holds an exclusive lock on a lock file (see `LOCK_FILE_EXTENSION`) in a
+    `with` statement. Without `fcntl`, nothing is locked.
+    """
+
+    with open(path_to_lock, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+        # The lock is released when the file is closed.
+        yield
+
+
+
+
+def find_day_file(month_dir, day_filename):
+    """
+    Finds a day file in a month dir. `day_filename` is a filename without
+    extension, e.g. '29'. Returns a path or `None` if no file found.
+    """
+
+    for extension in DAY_FILE_EXTENSIONS:
+        path = os.path.join(month_dir, day_filename + extension)
+
+        if os.path.exists(path):
+            return path
+
+    return None
+
+
+
+
+def parse_datetime_repr(datetime_repr):
+    """
+    Parses a string like 'datetime.datetime(2016, 10, 29, 9, 0)' that is stored
+    in old text files. It is much faster than `eval()` and does not run any code.
+    """
+
+    arguments = datetime_repr[datetime_repr.index('(') + 1:datetime_repr.rindex(')')]
+
+    return datetime.datetime(*[int(argument) for argument in arguments.split(',')])
+
+
+
+
+def strf_to_datetime(day, time_strf):
+    """Turns a value like '9:5' or '09:05' into a datetime object of the day."""
+
+    hour, minute = time_strf.split(':')
+
+    return datetime.datetime(day.year, day.month, day.day, int(hour), int(minute))
+
+
+
+
+def month_dir_of(date):
+    """Returns a month dir relative to the working dir, e.g. '2016/10 — October'."""
+
+    return os.path.join(date.strftime('%Y'), date.strftime('%-m — %B'))
+
+
+
+
+def walk_day_files(working_dir=WORKING_DIR):
+    """
+    Yields `(date, path)` of every day file in a tree of work attendance files
+    in chronological order. If both files exist for a day, the new one is used.
+    Dates are found from dirs' and files' names.
+    """
+
+    if not os.path.isdir(working_dir):
+        return
+
+    for year_dir in sorted(os.listdir(working_dir)):
+        if not year_dir.isdigit():
+            continue
+
+        path_to_year_dir = os.path.join(working_dir, year_dir)
+
+        if not os.path.isdir(path_to_year_dir):
+            continue
+
+        month_dirs = [month_dir for month_dir in os.listdir(path_to_year_dir)
+                      if month_dir.split(' ')[0].isdigit()]
+
+        for month_dir in sorted(month_dirs, key=lambda month_dir: int(month_dir.split(' ')[0])):
+            path_to_month_dir = os.path.join(path_to_year_dir, month_dir)
+
+            if not os.path.isdir(path_to_month_dir):
+                continue
+
+            filenames = list_day_files(path_to_month_dir)
+
+            for day_filename in sorted(filenames, key=int):
+                date = datetime.date(int(year_dir), int(month_dir.split(' ')[0]), int(day_filename))
+
+                yield date, os.path.join(path_to_month_dir, filenames[day_filename])
+
+
+
+
+def list_day_files(path_to_month_dir):
+    """
+    Finds day files in a month dir. Returns `{day_filename: filename}`, where
+    `day_filename` is a filename without extension, e.g. '29'. If both files
+    exist for a day, the new one is used.
+    """
+
+    filenames = {}
+
+    for filename in os.listdir(path_to_month_dir):
+        day_filename, extension = os.path.splitext(filename)
+
+        if extension in DAY_FILE_EXTENSIONS and day_filename.isdigit():
+            if day_filename not in filenames or extension == DAY_FILE_EXTENSION:
+                filenames[day_filename] = filename
+
+    return filenames
+
+
+
+
+def convert_tree(working_dir=WORKING_DIR, remove_legacy=False):
+    """
+    Converts all old text files in a tree of work attendance files to the new
+    format. Days that already have a new file are skipped.
+    """
+
+    converted = 0
+
+    for dirpath, dirnames, filenames in os.walk(working_dir):
+        dirnames.sort()
+
+        for filename in sorted(filenames):
+            day_filename, extension = os.path.splitext(filename)
+
+            if extension != LEGACY_DAY_FILE_EXTENSION or not day_filename.isdigit():
+                continue
+
+            path_to_legacy_file = os.path.join(dirpath, filename)
+            path_to_file = os.path.join(dirpath, day_filename + DAY_FILE_EXTENSION)
+
+            if not os.path.exists(path_to_file):
+                data = read_legacy_day_file(path_to_legacy_file)
+
+                if 'day_start' not in data:
+                    print('! Skipped {}: no `day_start_dt` value found.'.format(path_to_legacy_file))
+                    continue
+
+                write_day_file(path_to_file, data)
+                converted += 1
+
+                print('Converted {}'.format(path_to_legacy_file))
+
+            if remove_legacy:
+                os.remove(path_to_legacy_file)
+
+    print()
+    print('{} file(s) converted.'.format(converted))
+
+
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        remove_legacy = '--remove-legacy' in sys.argv[2:]
+        dirs = [arg for arg in sys.argv[2:] if arg != '--remove-legacy']
+
+        convert_tree(dirs[0] if dirs else WORKING_DIR, remove_legacy)
+
+    else:
+        print('Usage: python day_files.py convert [<dir>] [--remove-legacy]')
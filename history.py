@@ -0,0 +1,445 @@
+#! python3
+#
+# NAME          : history.py
+#
+# DESCRIPTION   : A persistent index of where each person appears in day files,
+#                 and a command that displays one person's attendance and totals
+#                 for a period. Reads only the person's records, not every day
+#                 file of the tree.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import os
+import json
+import threading    # is used to name temporary files of threads
+import time
+import bisect    # is used to find a period in a person's records
+import datetime
+import argparse    # is used to parse command line options
+
+import day_files    # reads day files of `check_my_time.py`
+import archive    # reads packed years
+import roster    # matches typed names to names in the index
+
+
+# Constants.
+# ==========
+
+# The same date format as `report_creator.py` has. It is not imported, since
+# that would import `openpyxl`, too.
+DATE_FORMAT = 'dd/mm/yyyy'
+DATE_FORMAT_STRPTIME = '%d/%m/%Y'
+
+# The index is a JSON file in the working dir:
+#   {"files": {"2016/10 — October/29.jsonl": [mtime_ns, size, ["Hulk", ...]], ...},
+#    "dirs": {"2016/10 — October": mtime_ns, ...},
+#    "people": {"Hulk": [[ordinal, "2016/10 — October/29.jsonl", offset, length], ...], ...}}
+# "files" holds signatures and names of indexed day files (and archives, e.g.
+# "2016.archive") relative to the working dir. A person's records are sorted
+# by dates' ordinal numbers and point at the person's line in a file. Lines of
+# old text files can not be pointed at, so their offset is `null` and the
+# whole file is read.
+INDEX_FILENAME = '.history.json'
+
+# Month dirs are listed again only if their modification time has changed. Since
+# modification times are coarse, they are trusted only for dirs not modified
+# lately.
+SETTLE_TIME_NS = 2 * 10**9
+
+
+# Functions.
+# ==========
+
+def load_index(working_dir):
+    """Loads the index of a tree. Returns an empty one if there is none."""
+
+    try:
+        with open(os.path.join(working_dir, INDEX_FILENAME)) as f:
+            return json.load(f)
+
+    except (OSError, ValueError):    # if the index is missing or damaged
+        return {'files': {}, 'dirs': {}, 'people': {}}
+
+
+
+
+def save_index(working_dir, index):
+    """Saves the index of a tree. The file is replaced atomically."""
+
+    path_to_index = os.path.join(working_dir, INDEX_FILENAME)
+    # Kiosks may save it at once, and so may a kiosk's threads that close a day.
+    path_to_temp_file = '{}.{}.{}.tmp'.format(path_to_index, os.getpid(), threading.get_ident())
+
+    try:
+        with open(path_to_temp_file, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+
+        os.replace(path_to_temp_file, path_to_index)
+
+    except OSError as err:
+        # The index is only an optimization, so a read-only dir is not an error.
+        print()
+        print('! Could not save history index to {}: {}'.format(path_to_index, err.strerror))
+
+
+
+
+def signature_of(path):
+    """Returns `[mtime_ns, size]` of a file."""
+
+    stat = os.stat(path)
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+
+
+def date_of(rel_path):
+    """Returns the date of a day file from its path relative to the working dir."""
+
+    year_dir, month_dir, filename = rel_path.split('/')
+
+    return datetime.date(int(year_dir), int(month_dir.split(' ')[0]), int(os.path.splitext(filename)[0]))
+
+
+
+
+def remove_file(index, rel_path):
+    """Removes a file and its people's records from the index."""
+
+    entry = index['files'].pop(rel_path, None)
+
+    if entry is None:
+        return None
+
+    for name in entry[2]:
+        kept = [record for record in index['people'].get(name, []) if record[1] != rel_path]
+
+        if kept:
+            index['people'][name] = kept
+        else:
+            index['people'].pop(name, None)
+
+
+
+
+def add_records(index, rel_path, signature, located):
+    """
+    Adds a file to the index. `located` is a list of
+    `(name, ordinal, offset, length)` of records found in the file.
+    """
+
+    remove_file(index, rel_path)
+
+    names = set()
+
+    for name, ordinal, offset, length in located:
+        bisect.insort(index['people'].setdefault(name, []), [ordinal, rel_path, offset, length])
+        names.add(name)
+
+    index['files'][rel_path] = [signature[0], signature[1], sorted(names)]
+
+
+
+
+def index_day_file(index, working_dir, rel_path):
+    """(Re)indexes a day file of either format."""
+
+    path = os.path.join(working_dir, rel_path)
+    signature = signature_of(path)
+    ordinal = date_of(rel_path).toordinal()
+    located = []
+
+    if path.endswith(day_files.LEGACY_DAY_FILE_EXTENSION):
+        for name in day_files.read_day_file(path):
+            if name != 'day_start':
+                located.append((name, ordinal, None, None))
+
+    else:
+        with open(path, 'rb') as f:
+            offset = 0
+
+            for line in f:
+                if line.strip():
+                    name, record = day_files.decode_record(line)
+
+                    if name != 'day_start':
+                        located.append((name, ordinal, offset, len(line)))
+
+                offset += len(line)
+
+    add_records(index, rel_path, signature, located)
+
+
+
+
+def index_archive(index, working_dir, year_dir):
+    """(Re)indexes a year's archive. Records point at lines inside days' data."""
+
+    rel_path = year_dir + archive.ARCHIVE_EXTENSION
+    path = os.path.join(working_dir, rel_path)
+    signature = signature_of(path)
+    located = []
+
+    with archive.Archive(path) as packed_year:
+        for date in packed_year.dates():
+            offset, length = packed_year.locate(date)
+
+            for line in packed_year.mapping[offset:offset + length].splitlines(keepends=True):
+                name, record = day_files.decode_record(line)
+
+                if name != 'day_start':
+                    located.append((name, date.toordinal(), offset, len(line)))
+
+                offset += len(line)
+
+    add_records(index, rel_path, signature, located)
+
+
+
+
+def update_day_file(working_dir, path_to_day_file):
+    """
+    Brings the index up to date with one day file that has just been written
+    (see `check_my_time.write_to_file()`). Does nothing if there is no index yet.
+    """
+
+    if not os.path.exists(os.path.join(working_dir, INDEX_FILENAME)):
+        return None
+
+    index = load_index(working_dir)
+    rel_path = os.path.relpath(path_to_day_file, working_dir).replace(os.sep, '/')
+
+    if index['files'].get(rel_path, [None, None])[:2] != signature_of(path_to_day_file):
+        index_day_file(index, working_dir, rel_path)
+        save_index(working_dir, index)
+
+
+
+
+def refresh_index(working_dir, index):
+    """
+    Brings the index up to date with a tree. Only month dirs modified since
+    they were indexed are listed and only new or changed files are read.
+    A packed year is indexed from its archive. Returns `True` if the index has
+    changed.
+    """
+
+    changed = False
+    kept_files = set()
+    kept_dirs = {}
+
+    # Group indexed files by their dirs once (archives are grouped under '').
+    files_by_dir = {}
+
+    for rel_path in index['files']:
+        files_by_dir.setdefault(rel_path.rpartition('/')[0], []).append(rel_path)
+
+    for year_dir in sorted(os.listdir(working_dir)):
+        path_to_year_dir = os.path.join(working_dir, year_dir)
+
+        # A packed year is read from its archive even if its dir still exists.
+        if year_dir.endswith(archive.ARCHIVE_EXTENSION) and year_dir[:-len(archive.ARCHIVE_EXTENSION)].isdigit():
+            if index['files'].get(year_dir, [None, None])[:2] != signature_of(path_to_year_dir):
+                index_archive(index, working_dir, year_dir[:-len(archive.ARCHIVE_EXTENSION)])
+                changed = True
+
+            kept_files.add(year_dir)
+            continue
+
+        if not year_dir.isdigit() or not os.path.isdir(path_to_year_dir) or \
+                os.path.exists(archive.path_to_archive(working_dir, year_dir)):
+            continue
+
+        for month_dir in os.listdir(path_to_year_dir):
+            path_to_month_dir = os.path.join(path_to_year_dir, month_dir)
+            rel_path_to_month_dir = year_dir + '/' + month_dir
+
+            if not month_dir.split(' ')[0].isdigit() or not os.path.isdir(path_to_month_dir):
+                continue
+
+            mtime_ns = os.stat(path_to_month_dir).st_mtime_ns
+
+            if index['dirs'].get(rel_path_to_month_dir) == mtime_ns:
+                # Nothing was added, removed or replaced there.
+                kept_files.update(files_by_dir.get(rel_path_to_month_dir, []))
+                kept_dirs[rel_path_to_month_dir] = mtime_ns
+                continue
+
+            for filename in day_files.list_day_files(path_to_month_dir).values():
+                rel_path = rel_path_to_month_dir + '/' + filename
+                kept_files.add(rel_path)
+
+                if index['files'].get(rel_path, [None, None])[:2] != signature_of(os.path.join(path_to_month_dir, filename)):
+                    index_day_file(index, working_dir, rel_path)
+                    changed = True
+
+            if time.time_ns() - mtime_ns > SETTLE_TIME_NS:
+                kept_dirs[rel_path_to_month_dir] = mtime_ns
+
+    # Forget removed files and days that have been packed.
+    for rel_path in set(index['files']) - kept_files:
+        remove_file(index, rel_path)
+        changed = True
+
+    if kept_dirs != index['dirs']:
+        index['dirs'] = kept_dirs
+        changed = True
+
+    return changed
+
+
+
+
+def read_record(working_dir, rel_path, offset, length, name):
+    """Reads a person's record that the index points at. Returns a `records.Entry`."""
+
+    path = os.path.join(working_dir, rel_path)
+
+    if offset is None:    # if it is an old text file
+        return day_files.read_day_file(path)[name]
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+
+        return day_files.decode_record(f.read(length))[1]
+
+
+
+
+def find_name(index, typed_name):
+    """
+    Matches a typed name to names in the index like `check_my_time.py` matches
+    it to the roster. Returns a tuple `(name, suggestions)` (see `roster.lookup()`).
+    """
+
+    if typed_name in index['people']:
+        return typed_name, []
+
+    return roster.lookup(roster.build_index(index['people']), typed_name)
+
+
+
+
+def display_history(working_dir, typed_name, first_day, last_day):
+    """Displays a person's records and totals from `first_day` to `last_day`."""
+
+    index = load_index(working_dir)
+
+    if refresh_index(working_dir, index):
+        save_index(working_dir, index)
+
+    name, suggestions = find_name(index, typed_name)
+
+    if name is None:
+        if suggestions:
+            print('Error: "{}" is not found. Did you mean: {}?'.format(
+                typed_name, ', '.join('"{}"'.format(suggestion) for suggestion in suggestions)))
+        else:
+            print('Error: "{}" is not found.'.format(typed_name))
+
+        return None
+
+    # The person's records are sorted by dates, so the period is a slice.
+    person_records = index['people'][name]
+    first = bisect.bisect_left(person_records, [first_day.toordinal()])
+    last = bisect.bisect_left(person_records, [last_day.toordinal() + 1])
+
+    # A file edited in place does not change its dir's modification time, so
+    # check the files that are about to be read.
+    stale_files = set()
+
+    for ordinal, rel_path, offset, length in person_records[first:last]:
+        if rel_path not in stale_files and \
+                index['files'][rel_path][:2] != signature_of(os.path.join(working_dir, rel_path)):
+            stale_files.add(rel_path)
+
+    if stale_files:
+        for rel_path in stale_files:
+            if rel_path.endswith(archive.ARCHIVE_EXTENSION):
+                index_archive(index, working_dir, rel_path[:-len(archive.ARCHIVE_EXTENSION)])
+            else:
+                index_day_file(index, working_dir, rel_path)
+
+        save_index(working_dir, index)
+
+        person_records = index.get('people', {}).get(name, [])
+        first = bisect.bisect_left(person_records, [first_day.toordinal()])
+        last = bisect.bisect_left(person_records, [last_day.toordinal() + 1])
+
+    totals = [0, 0, 0]
+
+    print()
+    print('{} from {} to {}:'.format(name, first_day.strftime(DATE_FORMAT_STRPTIME),
+                                     last_day.strftime(DATE_FORMAT_STRPTIME)))
+    print()
+
+    for ordinal, rel_path, offset, length in person_records[first:last]:
+        entry = read_record(working_dir, rel_path, offset, length, name)
+        minutes = (entry.early_time, entry.late_time, entry.work_time)
+        totals = [a + (b or 0) for a, b in zip(totals, minutes)]
+
+        clock_out_strf = '-' if entry.clock_out is None else '{}:{:02}'.format(entry.clock_out.hour,
+                                                                               entry.clock_out.minute)
+
+        print('\t{}  in {:>5}  out {:>5}  early {:>6}  late {:>6}  work {:>6}'.format(
+            datetime.date.fromordinal(ordinal).strftime(DATE_FORMAT_STRPTIME),
+            '{}:{:02}'.format(entry.clock_in.hour, entry.clock_in.minute), clock_out_strf,
+            *[format_minutes(value) for value in minutes]))
+
+    print()
+    print('\t{} day(s)          early {:>6}  late {:>6}  work {:>6}'.format(
+        last - first, *[format_minutes(value) for value in totals]))
+
+
+
+
+def format_minutes(minutes):
+    """Formats a number of minutes as 'h:mm' or '-' if it is `None`."""
+
+    if minutes is None:
+        return '-'
+
+    return '{}:{:02}'.format(*divmod(minutes, 60))
+
+
+
+
+def parse_date(value):
+    """Parses a date of `--first` and `--last` options."""
+
+    try:
+        return datetime.datetime.strptime(value, DATE_FORMAT_STRPTIME).date()
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected a date ({}).'.format(DATE_FORMAT))
+
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Displays a person's attendance and totals for a period.")
+    parser.add_argument('name', nargs='+', help='name or full name, in any case')
+    parser.add_argument('--first', type=parse_date, default=datetime.date.min,
+                        help='first date of the period ({}, default: the first record)'.format(DATE_FORMAT))
+    parser.add_argument('--last', type=parse_date, default=datetime.date.max,
+                        help='last date of the period ({}, default: the last record)'.format(DATE_FORMAT))
+    parser.add_argument('--dir', default=day_files.WORKING_DIR,
+                        help='dir where day files are stored (default: %(default)s)')
+    options = parser.parse_args()
+
+    if not os.path.isdir(options.dir):
+        # Fatal error. Nothing can be found, so exit.
+        print('Error: no such directory: {}'.format(options.dir))
+        sys.exit(0)
+
+    if options.last < options.first:
+        # Fatal error. The period is empty, so exit.
+        print('Error: the last date must not be before the first one.')
+        sys.exit(0)
+
+    display_history(options.dir, ' '.join(options.name), options.first, options.last)
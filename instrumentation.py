@@ -0,0 +1,178 @@
+#! python3
+#
+# NAME          : instrumentation.py
+#
+# DESCRIPTION   : Measures phases of `report_creator.py` (scan, parse, aggregate,
+#                 calculate, render, save): wall time, counters like files and
+#                 bytes read, and peak memory. Displays a summary and appends
+#                 it as JSON to a file.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import json
+import time
+import datetime
+import functools
+import contextlib
+import tracemalloc    # is used to find peak memory of each phase
+
+
+# Constants.
+# ==========
+
+PHASES = ('scan', 'parse', 'aggregate', 'calculate', 'render', 'save')    # order of phases in summaries
+
+# Nothing is measured until `enable()` is called, so that disabled
+# instrumentation costs one check per phase.
+enabled = False
+
+phases = {}    # stores measurements of phases by names
+stack = []    # stores running phases; a phase's time excludes its nested phases
+run_started = None    # is set by `reset()`
+
+
+# Functions.
+# ==========
+
+def enable():
+    """Starts measuring phases. Memory is traced from now on, which slows Python code down a bit."""
+
+    global enabled
+
+    enabled = True
+    tracemalloc.start()
+    reset()
+
+
+
+
+def reset():
+    """Forgets measured phases and starts a new run."""
+
+    global run_started
+
+    phases.clear()
+    run_started = time.perf_counter()
+
+
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Measures a phase in a `with` statement. Phases can be nested and repeated."""
+
+    if not enabled:
+        yield
+        return
+
+    if stack:
+        # The parent's peak so far must not be lost when the peak is reset.
+        parent = stack[-1]
+        parent['peak_memory'] = max(parent['peak_memory'], tracemalloc.get_traced_memory()[1])
+
+    measurement = phases.setdefault(name, {'wall_time': 0.0, 'calls': 0, 'peak_memory': 0, 'counters': {}})
+    measurement['calls'] += 1
+    stack.append(measurement)
+
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.pop()
+
+        measurement['wall_time'] += elapsed
+        measurement['peak_memory'] = max(measurement['peak_memory'], tracemalloc.get_traced_memory()[1])
+
+        if stack:
+            parent = stack[-1]
+            parent['wall_time'] -= elapsed
+            parent['peak_memory'] = max(parent['peak_memory'], measurement['peak_memory'])
+
+
+
+
+def timed(name):
+    """A decorator that measures every call of a function as a phase."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+
+
+def count(**counters):
+    """Adds counters (e.g. `files=3, bytes_read=1024`) to the running phase."""
+
+    if not enabled or not stack:
+        return None
+
+    phase_counters = stack[-1]['counters']
+
+    for key, value in counters.items():
+        phase_counters[key] = phase_counters.get(key, 0) + value
+
+
+
+
+def summary(description):
+    """Returns measurements of the run as a JSON-serializable dict."""
+
+    total_time = time.perf_counter() - run_started
+    names = [name for name in PHASES if name in phases] + sorted(set(phases) - set(PHASES))
+
+    return {'description': description,
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'total_time': total_time,
+            'other_time': total_time - sum(phases[name]['wall_time'] for name in names),
+            'phases': {name: phases[name] for name in names}
+            }
+
+
+
+
+def display_summary(run_summary):
+    """Displays measurements of a run as a table."""
+
+    print()
+    print('Phases of {}:'.format(run_summary['description']))
+
+    for name, measurement in run_summary['phases'].items():
+        counters = ', '.join('{} {}'.format(key.replace('_', ' '), value)
+                             for key, value in sorted(measurement['counters'].items()))
+
+        print('\t{:<10}{:>9.3f} s{:>10.1f} MiB peak   {}'.format(
+            name, measurement['wall_time'], measurement['peak_memory'] / 2**20, counters))
+
+    print('\t{:<10}{:>9.3f} s'.format('other', run_summary['other_time']))
+    print('\t{:<10}{:>9.3f} s'.format('total', run_summary['total_time']))
+
+
+
+
+def report(description, path):
+    """Displays the run's measurements, appends them to the JSON Lines file `path`, and starts a new run."""
+
+    run_summary = summary(description)
+    display_summary(run_summary)
+
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(run_summary) + '\n')
+    except OSError as err:
+        print('! Could not save timings to {}: {}'.format(path, err.strerror))
+
+    reset()
@@ -0,0 +1,192 @@
+#! python3
+#
+# NAME          : prefix_index.py
+#
+# DESCRIPTION   : A persistent prefix-sum index of `report_creator.py`: each
+#                 person's running totals of early, late, and work time by
+#                 days, so that totals of any range of days are found with two
+#                 lookups and a subtraction however long the range is.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import os
+import json
+import threading    # is used to name temporary files of threads
+import bisect    # is used to find days in people's running totals
+
+
+# Constants.
+# ==========
+
+# The index is a JSON file in the working dir:
+#   {"days": {"<ordinal>": [mtime_ns, size], ...},
+#    "people": {"Hulk": [[ordinal, ...], [early, ...], [late, ...], [work, ...]], ...}}
+# "days" holds signatures of day files the index was made of by dates' ordinal
+# numbers. A person's lists hold ordinals of days the person has a record on
+# and running totals of minutes up to and including each of the days. The sum
+# of a range is the running total at its last day minus the one before its
+# first day.
+INDEX_FILENAME = '.prefix_sums.json'
+
+
+# Functions.
+# ==========
+
+def new_index():
+    """Returns an empty index."""
+
+    return {'days': {}, 'people': {}}
+
+
+
+
+def load_index(path):
+    """Loads an index. Returns an empty one if there is none."""
+
+    try:
+        with open(path) as f:
+            index = json.load(f)
+
+    except (OSError, ValueError):    # if the index is missing or damaged
+        return new_index()
+
+    # JSON keys are strings.
+    index['days'] = {int(ordinal): signature for ordinal, signature in index['days'].items()}
+
+    return index
+
+
+
+
+def save_index(path, index):
+    """Saves an index. The file is replaced atomically."""
+
+    # `report_server.py` and a Range report may save it at once.
+    path_to_temp_file = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+
+    try:
+        with open(path_to_temp_file, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+
+        os.replace(path_to_temp_file, path)
+
+    except OSError as err:
+        # The index is only an optimization, so a read-only dir is not an error.
+        print()
+        print('! Could not save prefix-sum index to {}: {}'.format(path, err.strerror))
+
+
+
+
+def find_changes(index, signatures, spans):
+    """
+    Compares the index with `signatures` of day files (`{ordinal: [mtime_ns,
+    size]}`) of the checked spans of days (`[(first_ordinal, last_ordinal),
+    ...]`, e.g. months). Returns a sorted list of ordinals of days that are
+    new, changed or removed since they were indexed. Days outside the spans
+    are not checked.
+    """
+
+    changed = {ordinal for ordinal, signature in signatures.items() if index['days'].get(ordinal) != signature}
+
+    for first_ordinal, last_ordinal in spans:
+        for ordinal in range(first_ordinal, last_ordinal + 1):
+            if ordinal in index['days'] and ordinal not in signatures:
+                changed.add(ordinal)
+
+    return sorted(changed)
+
+
+
+
+def apply_changes(index, changes):
+    """
+    Updates the index with `changes`: `{ordinal: (signature, totals)}`, where
+    `totals` are people's `[early_time, late_time, work_time]` of the day keyed
+    by names, or `None` if the day file was removed. Running totals are
+    recomputed only from the earliest changed day on, and days after it are
+    not read again: their values are differences of running totals.
+    """
+
+    if not changes:
+        return None
+
+    first_changed = min(changes)
+    names = set(index['people'])
+
+    for signature, totals in changes.values():
+        if totals is not None:
+            names.update(totals)
+
+    for name in names:
+        ordinals, early, late, work = index['people'].get(name, ([], [], [], []))
+        position = bisect.bisect_left(ordinals, first_changed)
+
+        # Find values of each day from the first changed one on.
+        values = {}
+
+        for i in range(position, len(ordinals)):
+            if i == 0:
+                values[ordinals[i]] = (early[i], late[i], work[i])
+            else:
+                values[ordinals[i]] = (early[i] - early[i - 1], late[i] - late[i - 1], work[i] - work[i - 1])
+
+        for ordinal, (signature, totals) in changes.items():
+            if totals is not None and name in totals:
+                values[ordinal] = tuple(totals[name])
+            else:
+                values.pop(ordinal, None)
+
+        # Recompute running totals from there.
+        del ordinals[position:], early[position:], late[position:], work[position:]
+
+        sums = [early[-1], late[-1], work[-1]] if ordinals else [0, 0, 0]
+
+        for ordinal in sorted(values):
+            sums = [a + b for a, b in zip(sums, values[ordinal])]
+
+            ordinals.append(ordinal)
+            early.append(sums[0])
+            late.append(sums[1])
+            work.append(sums[2])
+
+        if ordinals:
+            index['people'][name] = [ordinals, early, late, work]
+        else:
+            index['people'].pop(name, None)
+
+    for ordinal, (signature, totals) in changes.items():
+        if totals is None:
+            index['days'].pop(ordinal, None)
+        else:
+            index['days'][ordinal] = signature
+
+
+
+
+def range_totals(index, first_ordinal, last_ordinal):
+    """
+    Returns people's `[early_time, late_time, work_time]` sums from
+    `first_ordinal` to `last_ordinal` keyed by names. People with no records in
+    the range are left out.
+    """
+
+    totals = {}
+
+    for name, (ordinals, early, late, work) in index['people'].items():
+        last = bisect.bisect_right(ordinals, last_ordinal) - 1    # the last day in the range
+        before = bisect.bisect_left(ordinals, first_ordinal) - 1    # the last day before the range
+
+        if last == before:
+            continue
+
+        if before < 0:
+            totals[name] = [early[last], late[last], work[last]]
+        else:
+            totals[name] = [early[last] - early[before], late[last] - late[before], work[last] - work[before]]
+
+    return totals
@@ -0,0 +1,145 @@
+#! python3
+#
+# NAME          : records.py
+#
+# DESCRIPTION   : Compact record types of `check_my_time.py` and `report_creator.py`:
+#                 a person's attendance on a day and a person's sums of time
+#                 values over a period. Time values are integer numbers of
+#                 minutes, as in day files.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+# Constants.
+# ==========
+
+CATEGORIES = ('early', 'late', 'work')
+
+
+# Classes.
+# ========
+
+class Entry:
+    """
+    A person's attendance on a day. Entries are never changed once they are
+    made, so they can be shared (e.g. with a thread that writes them); clocking
+    out makes a new entry with `clocked_out()`.
+    – `clock_in`, `clock_out`: datetime objects, `clock_out` is `None` while
+      the person is on workplace;
+    – `clock_in_early`: whether the person came before day's start time;
+    – `early_time`, `late_time`, `work_time`: numbers of minutes or `None`. Only
+      one of `early_time` and `late_time` is set, `work_time` is set once the
+      person clocks out.
+    """
+
+    # No `__dict__` per entry: a day of a large roster is thousands of them.
+    __slots__ = ('clock_in', 'clock_in_early', 'clock_out', 'early_time', 'late_time', 'work_time')
+
+    def __init__(self, clock_in, clock_in_early, clock_out=None, early_time=None, late_time=None, work_time=None):
+        self.clock_in = clock_in
+        self.clock_in_early = clock_in_early
+        self.clock_out = clock_out
+        self.early_time = early_time
+        self.late_time = late_time
+        self.work_time = work_time
+
+
+    def __eq__(self, other):
+        if not isinstance(other, Entry):
+            return NotImplemented
+
+        return self.values() == other.values()
+
+
+    def __repr__(self):
+        return 'Entry({})'.format(', '.join('{}={!r}'.format(key, value)
+                                            for key, value in zip(self.__slots__, self.values())))
+
+
+    def values(self):
+        """Returns values of all fields in `__slots__` order."""
+
+        return (self.clock_in, self.clock_in_early, self.clock_out, self.early_time, self.late_time, self.work_time)
+
+
+    def is_present(self):
+        """Returns `True` while the person is on workplace."""
+
+        return self.work_time is None
+
+
+    def clocked_out(self, clock_out, work_time):
+        """
+        Returns a new entry of the person who clocked out. Day files keep
+        clock times to the minute, so seconds are dropped.
+        """
+
+        return Entry(self.clock_in.replace(second=0, microsecond=0), self.clock_in_early,
+                     clock_out.replace(second=0, microsecond=0), self.early_time, self.late_time, work_time)
+
+
+    def sums(self):
+        """
+        Returns time values as a list of hours and minutes in the order of
+        `report_creator.SUM_KEYS`: early, late, and work time.
+        """
+
+        values = []
+
+        for minutes in (self.early_time, self.late_time, self.work_time):
+            values.extend(divmod(minutes or 0, 60))
+
+        return values
+
+
+
+
+class Totals:
+    """A person's sums of early, late, and work time over a period, in minutes."""
+
+    __slots__ = ('early_time', 'late_time', 'work_time')
+
+    def __init__(self, early_time=0, late_time=0, work_time=0):
+        self.early_time = early_time
+        self.late_time = late_time
+        self.work_time = work_time
+
+
+    def __eq__(self, other):
+        if not isinstance(other, Totals):
+            return NotImplemented
+
+        return (self.early_time, self.late_time, self.work_time) == (other.early_time, other.late_time, other.work_time)
+
+
+    def __repr__(self):
+        return 'Totals(early_time={}, late_time={}, work_time={})'.format(self.early_time, self.late_time,
+                                                                         self.work_time)
+
+
+    @classmethod
+    def from_sums(cls, values):
+        """
+        Makes totals of a list of sums of hours and minutes in the order of
+        `report_creator.SUM_KEYS`, which is how day files' sums are cached.
+        """
+
+        early_hour, early_minute, late_hour, late_minute, work_hour, work_minute = values
+
+        return cls(early_hour * 60 + early_minute, late_hour * 60 + late_minute, work_hour * 60 + work_minute)
+
+
+    def minutes(self, category):
+        """Returns the sum of a category ('early', 'late' or 'work') in minutes."""
+
+        if category == 'early':
+            return self.early_time
+        elif category == 'late':
+            return self.late_time
+        elif category == 'work':
+            return self.work_time
+
+        raise ValueError('unknown category: {!r}'.format(category))
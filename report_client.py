@@ -0,0 +1,77 @@
+#! python3
+#
+# NAME          : report_client.py
+#
+# DESCRIPTION   : A client of `report_server.py`. Asks the server for a report and
+#                 displays where it is saved.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import json
+import socket
+import argparse    # is used to parse command line options
+
+
+# Constants.
+# ==========
+
+# The same defaults as `report_server.py` has. The server is not imported, since
+# that would import `report_creator.py` and `openpyxl`, too.
+HOST = '127.0.0.1'
+PORT = 8766
+
+
+# Functions.
+# ==========
+
+def main(host, port, request):
+    """Sends one request and displays the server's answer."""
+
+    try:
+        connection = socket.create_connection((host, port))
+    except OSError as err:
+        # Fatal error. Nothing can be created, so exit.
+        print('Error: could not connect to {}:{}: {}'.format(host, port, err.strerror))
+        sys.exit(0)
+
+    with connection, connection.makefile('rwb') as f:
+        f.write(request.encode() + b'\n')
+        f.flush()
+
+        line = f.readline()
+
+    if not line:
+        print('Error: the server has closed the connection.')
+        return None
+
+    display_response(json.loads(line))
+
+
+
+
+def display_response(response):
+    """Displays the server's answer."""
+
+    if response['ok']:
+        print('Saved to {} ({} day(s), {:.2f} s).'.format(response['path'], response['days'], response['time']))
+    else:
+        print('Error: ' + response['message'])
+
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='A client of report_server.py.')
+    parser.add_argument('kind', type=str.upper, choices=['WS', 'WC', 'MS', 'MC'],
+                        help='W/M stands for Week/Month and S/C for Simple/Complex')
+    parser.add_argument('date', nargs='?', help='any date of the week or month (default: today)')
+    parser.add_argument('--host', default=HOST, help='server\'s address (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=PORT, help='server\'s port (default: %(default)s)')
+    options = parser.parse_args()
+
+    main(options.host, options.port, ' '.join(filter(None, [options.kind, options.date])))
@@ -13,11 +13,31 @@
 
 
 import os
-import ast    # ast is used for parsing data from text files
+import io    # is used to load templates from memory
+import csv    # is used to write text reports
+import operator
+import json    # is used to store the aggregate cache
+import time
 import datetime
+import calendar    # is used to find lengths of months
+import cProfile    # is used to profile a whole run
+import contextlib    # is used to capture console output of worker processes
+import collections
+import argparse    # is used to parse command line options
+import threading    # is used to name temporary files of threads
+import concurrent.futures    # is used to parse day files in parallel
 
 import openpyxl
 
+import day_files    # reads day files of `check_my_time.py`
+import columnar    # is an optional NumPy-backed aggregation engine
+import sqlite_storage    # is an optional SQLite storage backend
+import instrumentation    # measures time and memory of phases of a report
+import records    # holds people's sums of time values
+import rollups    # keeps sums of whole months and years
+import archive    # reads packed years
+import prefix_index    # sums custom ranges of days
+
 
 # Constants.
 # ==========
@@ -33,6 +53,138 @@ WORKDAYS_PER_WEEK = 5     # is used in average time values calculations
 ZERO_PADDED_FILENAMES = False    # is related to text files created by `check_my_time.py`
 SPREADSHEET_SAVE_EXTENSTION = 'xlsx'
 
+# 'xlsx', 'csv' or 'tsv'. CSV and TSV reports are written row by row straight
+# to disk without templates, which is much faster for large rosters and suits
+# other programs, e.g. payroll. They have the same columns as spreadsheets.
+REPORT_FORMAT = 'xlsx'
+
+# 'template' or 'write-only'. 'template' fills in templates from
+# `TEMPLATES_DIR`. Write-only rendering builds the layout of templates in code
+# and streams rows to disk, which takes constant memory and is faster for large
+# rosters, but titles are centered across columns instead of merged cells and
+# the templates' own styling (e.g. if they were customized) is not used.
+XLSX_RENDERER = 'template'
+
+# Layout of spreadsheets rendered without templates. The title takes the first
+# rows, header rows follow, and names with time values start right below them
+# (from the 8th row for Simple Reports, the 9th and 10th row for Complex Week
+# and Month Reports). Header rows hold `(text, number_of_columns)` spans,
+# `None` for blank ones.
+TITLE_ROWS = 5
+SIMPLE_HEADER_ROWS = ([('Name', 1), ('Work Time', 2), ('Late Time', 2), ('Early Time', 2)],
+                      [(None, 1)] + [('Hours', 1), ('Minutes', 1)] * 3)
+WEEK_HEADER_ROWS = ([('Name', 1), ('Work Time', 4), ('Late Time', 4), ('Early Time', 4)],
+                    [(None, 1)] + [('Overall', 2), ('Average (per Day)', 2)] * 3,
+                    [(None, 1)] + [('Hours', 1), ('Minutes', 1)] * 6)
+MONTH_HEADER_ROWS = ([('Name', 1), ('Work Time', 6), ('Late Time', 6), ('Early Time', 6)],
+                     [(None, 1)] + [('Overall', 2), ('Average', 4)] * 3,
+                     [(None, 1)] + [(None, 2), ('per Day', 2), ('per Week', 2)] * 3,
+                     [(None, 1)] + [('Hours', 1), ('Minutes', 1)] * 9)
+NAME_COLUMN_WIDTH = 19.36
+TIME_COLUMN_WIDTH = 9.99
+
+# Styles are made once and shared by all header cells.
+HEADER_FONT = openpyxl.styles.Font(name='Ubuntu', size=10)
+HEADER_ALIGNMENT = openpyxl.styles.Alignment(horizontal='centerContinuous', vertical='center')
+UNITS_ALIGNMENT = openpyxl.styles.Alignment(horizontal='center', vertical='bottom')
+
+# Keys of `data` in the order of templates' columns after names. Are used as
+# headers of CSV and TSV reports.
+SIMPLE_COLUMNS = ('work_time_hour_overall', 'work_time_minute_overall',
+                  'late_time_hour_overall', 'late_time_minute_overall',
+                  'early_time_hour_overall', 'early_time_minute_overall')
+WEEK_COLUMNS = ('work_time_hour_overall', 'work_time_minute_overall',
+                'work_time_hour_average_per_day', 'work_time_minute_average_per_day',
+                'late_time_hour_overall', 'late_time_minute_overall',
+                'late_time_hour_average_per_day', 'late_time_minute_average_per_day',
+                'early_time_hour_overall', 'early_time_minute_overall',
+                'early_time_hour_average_per_day', 'early_time_minute_average_per_day')
+MONTH_COLUMNS = ('work_time_hour_overall', 'work_time_minute_overall',
+                 'work_time_hour_average_per_day', 'work_time_minute_average_per_day',
+                 'work_time_hour_average_per_week', 'work_time_minute_average_per_week',
+                 'late_time_hour_overall', 'late_time_minute_overall',
+                 'late_time_hour_average_per_day', 'late_time_minute_average_per_day',
+                 'late_time_hour_average_per_week', 'late_time_minute_average_per_week',
+                 'early_time_hour_overall', 'early_time_minute_overall',
+                 'early_time_hour_average_per_day', 'early_time_minute_average_per_day',
+                 'early_time_hour_average_per_week', 'early_time_minute_average_per_week')
+
+# Sums of time values of each day file are cached in a file in every month dir,
+# so that unchanged day files are not parsed again. Set to `False` to always
+# parse day files.
+USE_AGGREGATE_CACHE = True
+AGGREGATE_CACHE_FILENAME = '.aggregates.json'
+
+# Sums of whole months and years of a period are read from rollups (see
+# `rollups.py`), so that only day files of months partly in the period are read.
+# Rollups are checked against day files and made anew if they are stale. Is
+# used by the Python engine. Set to `False` to always read day files.
+USE_ROLLUPS = True
+
+# Custom ranges of days (Range reports) are summed with a prefix-sum index of
+# every person's running totals (see `prefix_index.py`), which is updated with
+# new and changed day files on the way. Is used by the Python engine. Set to
+# `False` to read day files instead.
+USE_PREFIX_INDEX = True
+
+# Number of processes that parse day files. Set to a number of CPU cores to speed
+# up reports for long periods of time. `1` means no extra processes.
+PARSE_WORKERS = 1
+
+# Number of processes that render reports of `--batch`. Reports of a period
+# share aggregated data, so they are rendered and saved at the same time.
+# `1` means no extra processes.
+RENDER_WORKERS = 1
+
+# Globals that `write_to_spreadsheet()` reads. Are sent to worker processes
+# with every report, see `render_report()`.
+RENDER_GLOBALS = ('month_or_week', 'report_complexity', 'start', 'end', 'days_counter', 'data',
+                  'rel_path_to_month_dir', 'month_name', 'REPORTS_DIR', 'TEMPLATES_DIR', 'REPORT_FORMAT',
+                  'XLSX_RENDERER', 'WORKDAYS_PER_WEEK', 'ZERO_PADDED_FILENAMES', 'DATE_FORMAT_STRPTIME')
+
+# 'python' or 'numpy'. The NumPy engine loads data into columns and is much faster
+# for large rosters and long periods of time. Results are exactly the same.
+AGGREGATION_ENGINE = 'python'
+
+# 'files' or 'sqlite'. The SQLite backend sums a period with one indexed query
+# to `sqlite_storage.DATABASE_PATH` instead of reading day files.
+STORAGE_BACKEND = 'files'
+
+# Time values summed by `gather_data()`, in the order they are cached.
+SUM_KEYS = ('early_time_hour', 'early_time_minute',
+            'late_time_hour', 'late_time_minute',
+            'work_time_hour', 'work_time_minute')
+
+# Set to a path (or the environment variable `REPORT_CREATOR_TIMINGS`) to display
+# time, counters and peak memory of each phase of a report and append them as
+# JSON to the file. See `instrumentation.py`.
+TIMINGS_PATH = os.environ.get('REPORT_CREATOR_TIMINGS') or None
+DEFAULT_TIMINGS_PATH = 'Report Timings.jsonl'
+
+# Listings of month dirs modified less than this long ago are not kept in
+# memory. See `list_month_dir()`.
+LISTING_SETTLE_TIME_NS = 2 * 10**9
+
+
+# Templates' contents by filenames. See `load_template()`.
+templates = {}
+
+# Listings and aggregate caches of month dirs are kept in memory, so that
+# a long-running process (see `report_server.py`) does not read them again.
+# Both are checked against files' modification times before they are used.
+month_listings = {}    # stores `(mtime_ns, {day_filename: filename})` by absolute paths to month dirs
+aggregate_caches = {}    # stores aggregate caches by absolute paths to month dirs
+
+# Archives of packed years (see `archive.py`) are kept open, too, until they
+# are replaced. Stores `(mtime_ns, archive.Archive)` by absolute paths.
+archives = {}
+
+prefix_indexes = {}    # stores `(mtime_ns, index)` of prefix-sum indexes by absolute paths
+
+# Kind of report: 'W', 'M' or 'R' (Range). Is set by `get_date_input()` and
+# `--batch`, and read by `gather_data()` too, so it has a default for programs
+# that call `gather_data()` directly.
+month_or_week = 'M'
 
 # Functions.
 # ==========
@@ -54,10 +206,17 @@ def main():
             # Create a report.
             get_date_input()
             parse_date_input()
+
+            instrumentation.reset()    # do not count time of prompts
+
             gather_data()
             calculate_time()
             write_to_spreadsheet()
 
+            if TIMINGS_PATH:
+                instrumentation.report('{} report from {:%d/%m/%Y} to {:%d/%m/%Y}'.format(
+                    month_or_week + report_complexity, start, end), TIMINGS_PATH)
+
         elif choice == 'n':
             # Exit.
             print()
@@ -69,19 +228,43 @@ def main():
 
 
 
+def create_report(kind, date, last_date=None):
+    """
+    Creates a report of `kind` ('WS', 'WC', 'MS' or 'MC', see `--kinds`) for the
+    week or month `date` belongs to without any prompts. Range reports ('RS' or
+    'RC') are created from `date` to `last_date`. Returns the path to the saved
+    spreadsheet.
+    """
+
+    # These globals are used by these functions: `parse_date_input()`, `write_to_spreadsheet()`
+    global month_or_week, report_complexity, date_d, last_date_d
+
+    month_or_week, report_complexity = kind
+    date_d = date
+    last_date_d = last_date
+
+    parse_date_input()
+    gather_data()
+    calculate_time()
+
+    return write_to_spreadsheet()
+
+
+
+
 def get_date_input():
     """Asks the user for date input."""
 
     # These globals are used by these functions: `parse_date_input()`, `write_to_spreadsheet()`,
-    global month_or_week, report_complexity, date_d
+    global month_or_week, report_complexity, date_d, last_date_d
 
     print()
 
     # Ask the user what time period the report should be created for.
     choice = None
 
-    while not choice in ('M', 'W'):
-        choice = input("Enter 'M' for Month or 'W' for Week to create a report: ")
+    while not choice in ('M', 'W', 'R'):
+        choice = input("Enter 'M' for Month, 'W' for Week or 'R' for a Range of days to create a report: ")
         choice = choice.upper()
 
     # Save the user's choice.
@@ -101,7 +284,10 @@ def get_date_input():
 
     # Ask for date input.
     while True:
-        date_strf = input('Enter date ({}): '.format(DATE_FORMAT))
+        if month_or_week == 'R':
+            date_strf = input('Enter the first date of the range ({}): '.format(DATE_FORMAT))
+        else:
+            date_strf = input('Enter date ({}): '.format(DATE_FORMAT))
 
         try:
             # Parse the date input.
@@ -114,6 +300,23 @@ def get_date_input():
         else:
             break
 
+    # A range also needs its last date.
+    while month_or_week == 'R':
+        date_strf = input('Enter the last date of the range ({}): '.format(DATE_FORMAT))
+
+        try:
+            date_dt = datetime.datetime.strptime(date_strf, DATE_FORMAT_STRPTIME)
+            last_date_d = datetime.date(date_dt.year, date_dt.month, date_dt.day)
+        except ValueError as err:
+            print('Error: ' + str(err))
+            continue
+
+        if last_date_d < date_d:
+            print('Error: the last date must not be before the first one.')
+            continue
+
+        break
+
 
 
 
@@ -147,6 +350,11 @@ def parse_date_input():
         start = date_d - datetime.timedelta(days=weekday)
         end = start + datetime.timedelta(days=6)
 
+    elif month_or_week == 'R':
+        # A range starts and ends with the dates entered.
+        start = datetime.datetime(date_d.year, date_d.month, date_d.day)
+        end = datetime.datetime(last_date_d.year, last_date_d.month, last_date_d.day)
+
 
 
 
@@ -162,33 +370,102 @@ def gather_data():
     # NOTE: in case all dirs are missing or exist but do not contain any files,
     # `write_to_spreadsheet()` will create an empty spreadsheet anyway.
 
-    data_sum = {}    # stores data sum
-    days_counter = 0    # this is important to calculating average time values
-                        # in calculate_time() function.
+    if STORAGE_BACKEND == 'sqlite':
+        # Sum the period in the database instead of reading day files.
+        print()
+        print('Reading database {} ...'.format(sqlite_storage.DATABASE_PATH))
+
+        connection = sqlite_storage.connect()
+
+        if AGGREGATION_ENGINE == 'numpy':
+            data_sum = {}
+
+            with instrumentation.phase('parse'):
+                day_totals = sqlite_storage.read_day_totals(connection, start, end)
+
+            with instrumentation.phase('aggregate'):
+                days_counter = sum_columns(columnar.build_columns(day_totals), start, end)
+        else:
+            # The database reads and sums rows at once.
+            with instrumentation.phase('aggregate'):
+                data_sum, days_counter = sqlite_storage.sum_period(connection, start, end)
+
+        connection.close()
+
+    elif month_or_week == 'R' and USE_PREFIX_INDEX and AGGREGATION_ENGINE == 'python':
+        # Ranges may be years long, so their day files are neither listed nor
+        # checked one by one. See `read_prefix_index()`.
+        with instrumentation.phase('scan'):
+            index = scan_working_dir(start, end)
+            days_counter = count_day_files(index, start, end)
+
+        data_sum = read_prefix_index(index, start, end)
+
+    else:
+        # Scan dirs once instead of listing them for every day.
+        with instrumentation.phase('scan'):
+            index = scan_working_dir(start, end)
+            files_to_read = find_day_files(index, start, end)
+
+        days_counter = len(files_to_read)    # this is important to calculating average time values
+                                             # in calculate_time() function.
+
+        # Read files and gather data from them.
+        if AGGREGATION_ENGINE == 'numpy':
+            # The NumPy engine sums files' totals itself, so they are not summed here.
+            data_sum = {}
+            totals_by_path = read_day_files(files_to_read, index, keep_totals=True, keep_sum=False)[1]
+
+            with instrumentation.phase('aggregate'):
+                sum_columns(build_columns(files_to_read, totals_by_path), start, end)
+        elif USE_ROLLUPS:
+            data_sum, files_left = read_rollups(files_to_read, start, end)
+            add_totals(data_sum, read_day_files(files_left, index, USE_AGGREGATE_CACHE)[0])
+        else:
+            data_sum, totals_by_path = read_day_files(files_to_read, index, USE_AGGREGATE_CACHE)
+
+    # Convert lists of values into totals used by `calculate_time()`.
+    with instrumentation.phase('aggregate'):
+        data_sum = {name: records.Totals.from_sums(values) for name, values in data_sum.items()}
+
+    # Reports are saved to `end`'s month dir.
+    rel_path_to_month_dir = os.path.join(end.strftime('%Y'), end.strftime('%-m — %B'))
+    month_name = end.strftime('%B')
+
+
+
+
+def find_day_files(index, first_day, last_day):
+    """
+    Finds day files from `first_day` to `last_day` in the index and displays
+    missing and existing dirs and files. Returns a list of
+    `(date, year_dir, month_dir, filename)` of found day files.
+    """
+
     printed_dirs = []    # store dirs that are printed as missing or existing ones
+    month_dirs = {}    # caches dirs' names for each month
+    files_to_read = []
 
-    date = start    # begin from the first day
+    date = first_day    # begin from the first day
 
-    while date <= end:
-        # Find dirs' names according to date value.
-        year_dir = date.strftime('%Y')
-        month_dir = date.strftime('%-m — %B')
-        month_name = date.strftime('%B')
+    while date <= last_day:
+        # Find dirs' names according to date value. They change only once a month.
+        if (date.year, date.month) not in month_dirs:
+            month_dirs[(date.year, date.month)] = (date.strftime('%Y'),
+                                                   date.strftime('%-m — %B'))
 
-        # Find filename according to date value.
+        year_dir, month_dir = month_dirs[(date.year, date.month)]
+
+        # Find filename (without extension) according to date value.
         if ZERO_PADDED_FILENAMES:
-            filename = date.strftime('%d') + '.txt'
+            day_filename = '{:02}'.format(date.day)
         else:
-            filename = date.strftime('%-d') + '.txt'
+            day_filename = str(date.day)
 
-        # Find paths to dirs and filename.
-        full_path_to_year_dir = os.path.join(WORKING_DIR, year_dir)
-        full_path_to_month_dir = os.path.join(full_path_to_year_dir, month_dir)
         # 'rel' stands for 'relative'
         rel_path_to_month_dir = os.path.join(year_dir, month_dir)
-        full_path_to_filename = os.path.join(full_path_to_month_dir, filename)
 
-        if not year_dir in os.listdir(WORKING_DIR):    # if no year dir found
+        if not year_dir in index:    # if no year dir found
             if not year_dir in printed_dirs:    # if missing dir was not displayed
                 print()
                 print('! Missing directory: {}'.format(year_dir))
@@ -198,7 +475,7 @@ def gather_data():
                 printed_dirs.append(year_dir)
 
         else:     # if year dir found
-            if not month_dir in os.listdir(full_path_to_year_dir):     # if no month dir in year dir found
+            if not month_dir in index[year_dir]:     # if no month dir in year dir found
                 if not rel_path_to_month_dir in printed_dirs:
                     # Display missing dir.
                     print()
@@ -212,300 +489,1422 @@ def gather_data():
                     print('Looking into directory {} ...'.format(rel_path_to_month_dir))
                     printed_dirs.append(rel_path_to_month_dir)
 
-                if not filename in os.listdir(full_path_to_month_dir):    # if no filename in month dir found
+                if not day_filename in index[year_dir][month_dir]:    # if no filename in month dir found
                     # Display missing filename.
-                    print('\t' + '! Missing file {}'.format(filename))
+                    print('\t' + '! Missing file {}'.format(day_filename + day_files.DAY_FILE_EXTENSION))
 
                 else:   # if filename in month dir found
                     # Gather data from the file.
+                    filename = index[year_dir][month_dir][day_filename]
 
                     # Display existing filename.
                     print('\t' + 'Reading file {} ...'.format(filename))
 
-                    days_counter += 1    # increments each time a file is read
-
-                    # Read file.
-                    with open(full_path_to_filename) as f:
-                        data = ast.literal_eval(f.read())
-
-                    # Gather data for each person in the file.
-                    for name in data:
-                        if name == 'day_start':
-                            # We do not need this value.
-                            continue
-                        else:
-                            data_sum.setdefault(name, {'early_time_hour': 0,
-                                                       'early_time_minute': 0,
-                                                       'late_time_hour': 0,
-                                                       'late_time_minute': 0,
-                                                       'work_time_hour': 0,
-                                                       'work_time_minute': 0
-                                                       })
-
-
-                            for key in data_sum[name]:
-                                if key in data[name]:
-                                    # Add new value to the existing one.
-                                    value = eval(str(data[name][key]))
-                                    data_sum[name][key] += value
+                    # Files are read after all of them are found, so that they
+                    # could be read in parallel.
+                    files_to_read.append((date, year_dir, month_dir, filename))
 
         # Go to the next day.
         date += datetime.timedelta(days=1)
 
+    instrumentation.count(day_files=len(files_to_read))
 
+    return files_to_read
 
 
-def calculate_time():
-    """Calculates work, late, and early overall and average time values."""
 
-    # This global is used by `write_to_spreadsheet()` function.
-    global data
 
-    data = {}    # stores calculated time values
+def count_day_files(index, first_day, last_day):
+    """
+    Counts day files from `first_day` to `last_day` in the index and displays
+    missing and existing dirs like `find_day_files()` does, but not every file.
+    """
 
-    # Gather data from `data_sum` dict, make calculations, and write results to
-    # `data` dict.
-    for name in data_sum:
-        data[name] = {}
+    printed_dirs = []    # store dirs that are printed as missing or existing ones
+    day_files_counter = 0
+    first_date, last_date = to_date(first_day), to_date(last_day)
 
-        for category in ['early', 'late', 'work']:    # for each of categories
-            # Calculate overall time value.
-            hour = data_sum[name]['{}_time_hour'.format(category)]
-            minute = data_sum[name]['{}_time_minute'.format(category)]
-            hour, minute = clean_time(hour, minute)    # see `clean_time()` docstring for details
-            # Write results to `data` dict.
-            data[name]['{}_time_hour_overall'.format(category)] = hour
-            data[name]['{}_time_minute_overall'.format(category)] = minute
+    for year, month in range_months(first_day, last_day):
+        year_dir, month_dir = str(year), datetime.date(year, month, 1).strftime('%-m — %B')
+        rel_path_to_month_dir = os.path.join(year_dir, month_dir)
 
-            # Save overall values in order to use them in average time calculations.
-            hour_overall, minute_overall = hour, minute
+        if year_dir not in index:    # if no year dir found
+            if year_dir not in printed_dirs:
+                print()
+                print('! Missing directory: {}'.format(year_dir))
+                printed_dirs.append(year_dir)
 
-            if report_complexity == 'S':
-                # Simple reports contain only overall time values, so continue.
-                continue
-            else:
-                # Calculate average time values.
+        elif month_dir not in index[year_dir]:    # if no month dir in year dir found
+            print()
+            print('! Missing directory: {}'.format(rel_path_to_month_dir))
 
-                # Calculate average time per day by dividing overall time values
-                # by number of workdays. `days_counter` contains number of files
-                # data was gathered from, so it could be considered the number
-                # of workdays.
-                hour =  hour_overall / days_counter
-                minute = minute_overall / days_counter
-                hour, minute = clean_time_2(hour, minute)
-                data[name]['{}_time_hour_average_per_day'.format(category)] = hour
-                data[name]['{}_time_minute_average_per_day'.format(category)] = minute
+        else:
+            print()
+            print('Looking into directory {} ...'.format(rel_path_to_month_dir))
 
-                if month_or_week == 'M':
-                    # Also, calculate average time per week for month reports by
-                    # dividing the number of workdays by a number of working
-                    # weeks in the month.
+            # Months partly in the range have fewer days to count.
+            for day_filename in index[year_dir][month_dir]:
+                if first_date <= datetime.date(year, month, int(day_filename)) <= last_date:
+                    day_files_counter += 1
 
-                    # Calculate the number of working weeks in the month.
-                    working_weeks = days_counter / WORKDAYS_PER_WEEK
+    instrumentation.count(day_files=day_files_counter)
 
-                    hour = hour_overall / working_weeks
-                    minute = minute_overall / working_weeks
-                    hour, minute = clean_time_2(hour, minute)    # see `clean_time_2()` docstring for details
-                    data[name]['{}_time_hour_average_per_week'.format(category)] = hour
-                    data[name]['{}_time_minute_average_per_week'.format(category)] = minute
+    return day_files_counter
 
 
 
 
-def clean_time(hour, minute):
-    """
-    Cleans time format. Since `gather_data()` finds separate sums of hours and
-    minutes, 'extra' minutes should be converted into hours.
-    (e.g. 10 hours, 180 minutes ---> 13 hours, 0 minutes)
-    """
+def range_months(first_day, last_day):
+    """Returns `(year, month)` of every month from `first_day` to `last_day`."""
 
-    if minute >= 60:
-        hour += minute // 60
-        minute %= 60
+    months = []
+    year, month = first_day.year, first_day.month
 
-    return hour, minute
+    while (year, month) <= (last_day.year, last_day.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
 
+    return months
 
 
 
-def clean_time_2(hour, minute):
+
+def scan_working_dir(first_day, last_day):
     """
-    Cleans time format 2. Since hours and minutes become float values after
-    true division operations in `calculate_time()`, they should be formatted
-    as follows:
-    – hours value's decimal part shoud be converted into minutes;
-    – 'extra' minutes should be converted into hours.
-    (e.g. 10.5 hours, 198.12 minutes ---> 13 hours, 48 minutes)
+    Scans year and month dirs of the period from `first_day` to `last_day` once and
+    returns an index of available day files:
+    {year_dir: {month_dir: {day_filename: filename}}}, where `day_filename` is
+    a filename without extension. Missing dirs are not in the index.
     """
 
-    decimal_minute = (hour - int(hour)) * 10
-    minute += decimal_minute * 60 / 10
-    hour = int(hour)
-    minute = int(minute)
+    index = {}
 
-    if minute >= 60:
-        hour += minute // 60
-        minute %= 60
+    # Find years and months of the period.
+    months = set()
 
-    return hour, minute
+    for year in range(first_day.year, last_day.year + 1):
+        first_month = first_day.month if year == first_day.year else 1
+        last_month = last_day.month if year == last_day.year else 12
 
+        for month in range(first_month, last_month + 1):
+            months.add((year, month))
 
+    years = {year for year, month in months}
 
+    with os.scandir(WORKING_DIR) as year_entries:
+        year_dirs = {entry.name for entry in year_entries if entry.is_dir()}
 
-def write_to_spreadsheet():
-    """Writes data to an Excel spreadsheet using a template."""
+    for year in sorted(years):
+        year_dir = str(year)
 
-    # This global is needed to redefine `rel_path_to_month_dir` later.
-    # Without this statement, redefinition will raise an error.
-    global rel_path_to_month_dir
+        # A packed year is read from its archive even if its dir still exists.
+        packed_year = find_archive(year_dir)
 
-    if report_complexity == 'S':    # for simple report
-        # Open a template.
-        path_to_template = os.path.join(TEMPLATES_DIR, 'Simple.xlsx')
-        wb = openpyxl.load_workbook(path_to_template)
-        sheet = wb.active
-        row = 8    # start from 8th row
+        if packed_year is not None:
+            index[year_dir] = {}
 
-        # Write kind of report with the number of workdays.
-        if month_or_week == 'W':
-            sheet['A1'] = 'Week Report ({} day(s))'.format(days_counter)
+            for month_dir, filenames in list_archive(packed_year).items():
+                if (year, int(month_dir.split(' ')[0])) in months:
+                    index[year_dir][month_dir] = filenames
 
-        elif month_or_week == 'M':
-            sheet['A1'] = 'Month Report ({} day(s))'.format(days_counter)
+            continue
 
-        # Write data to cells according to template's structure.
-        for name in sorted(data):    # note that names are written in alphabetic order
+        if year_dir not in year_dirs:
+            continue
 
-            sheet['A' + str(row)] = name
-            sheet['B' + str(row)] = data[name]['work_time_hour_overall']
-            sheet['C' + str(row)] = data[name]['work_time_minute_overall']
-            sheet['D' + str(row)] = data[name]['late_time_hour_overall']
-            sheet['E' + str(row)] = data[name]['late_time_minute_overall']
-            sheet['F' + str(row)] = data[name]['early_time_hour_overall']
-            sheet['G' + str(row)] = data[name]['early_time_minute_overall']
+        index[year_dir] = {}
 
-            row += 1
+        with os.scandir(os.path.join(WORKING_DIR, year_dir)) as month_entries:
+            month_dirs = {entry.name for entry in month_entries if entry.is_dir()}
 
+        for month in range(1, 13):
+            if (year, month) not in months:
+                continue
 
-    elif report_complexity == 'C':    # for complex report
-        # Open a template.
-        path_to_template = os.path.join(TEMPLATES_DIR, 'Complex.xlsx')
-        wb = openpyxl.load_workbook(path_to_template)
+            month_dir = datetime.date(year, month, 1).strftime('%-m — %B')
 
-        if month_or_week == 'W':
-            # Delete `Month Report` spreadsheet.
-            wb.remove(wb.get_sheet_by_name('Month Report'))
-            wb.active = 0    # this helps to avoid raising an error
-            sheet = wb.get_sheet_by_name('Week Report')
-            row = 9    # start from 9th row
+            if month_dir not in month_dirs:
+                continue
 
-            # Write kind of report with the number of workdays.
-            sheet['A1'] = 'Week Report ({} day(s))'.format(days_counter)
+            index[year_dir][month_dir] = list_month_dir(os.path.join(WORKING_DIR, year_dir, month_dir))
 
-            # Write data to cells according to template's structure.
-            for name in sorted(data):
+    return index
 
-                sheet['A' + str(row)] = name
-                sheet['B' + str(row)] = data[name]['work_time_hour_overall']
-                sheet['C' + str(row)] = data[name]['work_time_minute_overall']
-                sheet['D' + str(row)] = data[name]['work_time_hour_average_per_day']
-                sheet['E' + str(row)] = data[name]['work_time_minute_average_per_day']
-                sheet['F' + str(row)] = data[name]['late_time_hour_overall']
-                sheet['G' + str(row)] = data[name]['late_time_minute_overall']
-                sheet['H' + str(row)] = data[name]['late_time_hour_average_per_day']
-                sheet['I' + str(row)] = data[name]['late_time_minute_average_per_day']
-                sheet['J' + str(row)] = data[name]['early_time_hour_overall']
-                sheet['K' + str(row)] = data[name]['early_time_minute_overall']
-                sheet['L' + str(row)] = data[name]['early_time_hour_average_per_day']
-                sheet['M' + str(row)] = data[name]['early_time_minute_average_per_day']
 
-                row += 1
 
-        elif month_or_week == 'M':
-            # Delete `Week Report` spreadsheet.
-            wb.remove(wb.get_sheet_by_name('Week Report'))
-            wb.active = 0    # this helps to avoid raising an error
-            sheet = wb.get_sheet_by_name('Month Report')
-            row = 10    # start from 10th row
 
-            # Write kind of report with the number of workdays.
-            sheet['A1'] = 'Month Report ({} day(s), {} workday(s) per week)'.format(days_counter, WORKDAYS_PER_WEEK)
+def list_month_dir(full_path_to_month_dir):
+    """
+    Returns `{day_filename: filename}` of day files in a month dir. Listings are
+    kept in memory until the dir's modification time changes, i.e. until a file
+    is added, removed or replaced there.
+    """
 
-            # Write data to cells according to template's structure.
-            for name in sorted(data):
+    key = os.path.abspath(full_path_to_month_dir)    # the current dir may change between reports
+    mtime_ns = os.stat(full_path_to_month_dir).st_mtime_ns
+    listing = month_listings.get(key)
 
-                sheet['A' + str(row)] = name
-                sheet['B' + str(row)] = data[name]['work_time_hour_overall']
-                sheet['C' + str(row)] = data[name]['work_time_minute_overall']
-                sheet['D' + str(row)] = data[name]['work_time_hour_average_per_day']
-                sheet['E' + str(row)] = data[name]['work_time_minute_average_per_day']
-                sheet['F' + str(row)] = data[name]['work_time_hour_average_per_week']
-                sheet['G' + str(row)] = data[name]['work_time_minute_average_per_week']
-                sheet['H' + str(row)] = data[name]['late_time_hour_overall']
-                sheet['I' + str(row)] = data[name]['late_time_minute_overall']
-                sheet['J' + str(row)] = data[name]['late_time_hour_average_per_day']
-                sheet['K' + str(row)] = data[name]['late_time_minute_average_per_day']
-                sheet['L' + str(row)] = data[name]['late_time_hour_average_per_week']
-                sheet['M' + str(row)] = data[name]['late_time_minute_average_per_week']
-                sheet['N' + str(row)] = data[name]['early_time_hour_overall']
-                sheet['O' + str(row)] = data[name]['early_time_minute_overall']
-                sheet['P' + str(row)] = data[name]['early_time_hour_average_per_day']
-                sheet['Q' + str(row)] = data[name]['early_time_minute_average_per_day']
-                sheet['R' + str(row)] = data[name]['early_time_hour_average_per_week']
-                sheet['S' + str(row)] = data[name]['early_time_minute_average_per_week']
+    if listing is not None and listing[0] == mtime_ns:
+        return listing[1]
 
-                row += 1
+    # Find day files. Prefer the new format if both files exist for a day.
+    filenames = {}
 
-    # Save the spreadsheet.
-    rel_path_to_month_dir = os.path.join(REPORTS_DIR, rel_path_to_month_dir)
-    os.makedirs(rel_path_to_month_dir, exist_ok=True)
+    with os.scandir(full_path_to_month_dir) as day_entries:
+        for entry in day_entries:
+            day_filename, extension = os.path.splitext(entry.name)
 
-    if month_or_week == 'W':
+            if extension not in day_files.DAY_FILE_EXTENSIONS or not entry.is_file():
+                continue
 
-        # Use separate dirs for simple and complex reports to avoid name conflicts.
-        if report_complexity == 'S':
-            week_dir = 'Week Reports (Simple)'
+            if day_filename in filenames:
+                preferred = day_files.DAY_FILE_EXTENSIONS.index(extension)
+                current = day_files.DAY_FILE_EXTENSIONS.index(os.path.splitext(filenames[day_filename])[1])
 
-        elif report_complexity == 'C':
-            week_dir = 'Week Reports (Complex)'
+                if preferred > current:
+                    continue
 
-        path_to_week_dir = os.path.join(rel_path_to_month_dir, week_dir)
-        os.makedirs(path_to_week_dir, exist_ok=True)
+            filenames[day_filename] = entry.name
 
-        # Use start and end days in week report's name.
+    # Modification times are coarse, so a file added within the same tick
+    # would not change it. Keep only listings of dirs not modified lately.
+    if time.time_ns() - mtime_ns > LISTING_SETTLE_TIME_NS:
+        month_listings[key] = (mtime_ns, filenames)
 
-        # Apply filenames format to spreadsheet's name. Assume that it is the
-        # format the user wants to use to name hir/her spreadsheets.
+    return filenames
+
+
+
+
+def find_archive(year_dir):
+    """
+    Returns the archive of a packed year or `None` if the year is not packed.
+    Archives are kept open until the file is replaced.
+    """
+
+    path_to_archive = archive.path_to_archive(WORKING_DIR, year_dir)
+
+    try:
+        mtime_ns = os.stat(path_to_archive).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    key = os.path.abspath(path_to_archive)    # the current dir may change between reports
+    opened = archives.get(key)
+
+    if opened is not None and opened[0] == mtime_ns:
+        return opened[1]
+
+    if opened is not None:
+        opened[1].close()
+
+    archives[key] = (mtime_ns, archive.Archive(path_to_archive))
+
+    return archives[key][1]
+
+
+
+
+def list_archive(packed_year):
+    """
+    Returns `{month_dir: {day_filename: filename}}` of days in an archive, the
+    same as `list_month_dir()` returns for each month dir. Filenames are the
+    names day files would have.
+    """
+
+    listing = {}
+
+    for date in packed_year.dates():
         if ZERO_PADDED_FILENAMES:
-            start_strf = start.strftime('%d')
-            end_strf = end.strftime('%d')
+            day_filename = '{:02}'.format(date.day)
         else:
-            start_strf = start.strftime('%-d')
-            end_strf = end.strftime('%-d')
+            day_filename = str(date.day)
 
-        # Spreadsheet's save extension is defined on the top of the script.
-        # Note that if week starts in one month and ends in another one, it will
-        # be saved to `end`s month dir.
-        spreadsheet_name = '{}—{}.{}'.format(start_strf, end_strf, SPREADSHEET_SAVE_EXTENSTION)
-        path_to_spreadsheet = os.path.join(path_to_week_dir, spreadsheet_name)
-        wb.save(path_to_spreadsheet)
+        month_listing = listing.setdefault(date.strftime('%-m — %B'), {})
+        month_listing[day_filename] = day_filename + day_files.DAY_FILE_EXTENSION
 
-    elif month_or_week == 'M':
+    return listing
 
-        if report_complexity == 'S':
-            spreadsheet_name = 'Month Report for {} (Simple).{}'.format(month_name, SPREADSHEET_SAVE_EXTENSTION)
-        elif report_complexity == 'C':
-            spreadsheet_name = 'Month Report for {} (Complex).{}'.format(month_name, SPREADSHEET_SAVE_EXTENSTION)
 
-        path_to_spreadsheet = os.path.join(rel_path_to_month_dir, spreadsheet_name)
-        wb.save(path_to_spreadsheet)
 
-    # Display name of the saved file and path to it.
-    head, tail = os.path.split(path_to_spreadsheet)
-    print()
-    print('Saved as {} to {}.'.format(tail, head))
 
+@instrumentation.timed('parse')
+def read_rollups(files_to_read, first_day, last_day):
+    """
+    Reads sums of time values of whole years and months from `first_day` to
+    `last_day` from rollups. Returns a tuple `(data_sum, files_left)`, where
+    `files_left` are day files found by `find_day_files()` in months partly
+    in the period, which are read as usual.
+    """
+
+    data_sum = {}
+    files_left = []
+    filenames_by_month = {}    # stores filenames of whole months by year dirs and month dirs
+    whole_years = set()
 
-if __name__ == '__main__':
-    main()
+    first_day, last_day = to_date(first_day), to_date(last_day)
+    packed_years = {}    # stores whether years are packed
+
+    for date, year_dir, month_dir, filename in files_to_read:
+        first_day_of_month = to_date(date).replace(day=1)
+        first_day_of_next_month = (first_day_of_month + datetime.timedelta(days=31)).replace(day=1)
+
+        if year_dir not in packed_years:
+            packed_years[year_dir] = find_archive(year_dir) is not None
+
+        # Packed years have no rollups, but reading days from an archive is cheap anyway.
+        if packed_years[year_dir] or first_day_of_month < first_day or \
+                first_day_of_next_month - datetime.timedelta(days=1) > last_day:
+            files_left.append((date, year_dir, month_dir, filename))
+            continue
+
+        filenames_by_month.setdefault(year_dir, {}).setdefault(month_dir, []).append(filename)
+
+        if datetime.date(date.year, 1, 1) >= first_day and datetime.date(date.year, 12, 31) <= last_day:
+            whole_years.add(year_dir)
+
+    rollups_read = 0
+
+    for year_dir, months in filenames_by_month.items():
+        path_to_year_dir = os.path.join(WORKING_DIR, year_dir)
+
+        if year_dir in whole_years:
+            year_totals = [rollups.year_totals(path_to_year_dir, months)[0]]
+        else:
+            year_totals = [rollups.month_totals(os.path.join(path_to_year_dir, month_dir), filenames)[0]
+                           for month_dir, filenames in months.items()]
+
+        rollups_read += len(year_totals)
+
+        for totals in year_totals:
+            add_totals(data_sum, minutes_to_sums(totals))
+
+    instrumentation.count(rollups=rollups_read, rollup_files=len(files_to_read) - len(files_left))
+
+    return data_sum, files_left
+
+
+
+
+@instrumentation.timed('aggregate')
+def read_prefix_index(index, first_day, last_day):
+    """
+    Sums day files from `first_day` to `last_day` with the prefix-sum index.
+    Day files of months of the period are only checked against the index by
+    their signatures, so the sums take the same time however long the period
+    is. Day files that are new or changed are read and the index is updated
+    first. Returns the sum like `read_day_files()` does.
+    """
+
+    path_to_index = os.path.join(WORKING_DIR, prefix_index.INDEX_FILENAME)
+    sums_index = load_prefix_index(path_to_index)
+
+    signatures = {}    # stores signatures of day files by dates' ordinal numbers
+    files_by_ordinal = {}
+    checked_months = []    # stores `(first_ordinal, last_ordinal)` of months of the period
+
+    for year, month in range_months(first_day, last_day):
+        year_dir, month_dir = str(year), datetime.date(year, month, 1).strftime('%-m — %B')
+
+        # Check the whole month, so that days removed from it are found too.
+        first_ordinal = datetime.date(year, month, 1).toordinal()
+        last_ordinal = first_ordinal + calendar.monthrange(year, month)[1] - 1
+        checked_months.append((first_ordinal, last_ordinal))
+
+        for day_filename, filename in index.get(year_dir, {}).get(month_dir, {}).items():
+            date = datetime.date(year, month, int(day_filename))
+            signatures[date.toordinal()] = day_file_signature(year_dir, month_dir, filename)
+            files_by_ordinal[date.toordinal()] = (date, year_dir, month_dir, filename)
+
+    changed = prefix_index.find_changes(sums_index, signatures, checked_months)
+
+    instrumentation.count(checked_files=len(signatures), indexed_files=len(changed))
+
+    if changed:
+        files_to_index = [files_by_ordinal[ordinal] for ordinal in changed if ordinal in files_by_ordinal]
+        totals_by_path = read_day_files(files_to_index, index, keep_totals=True, keep_sum=False)[1]
+        changes = {}
+
+        for ordinal in changed:
+            if ordinal not in files_by_ordinal:    # if the day file was removed
+                changes[ordinal] = (None, None)
+                continue
+
+            date, year_dir, month_dir, filename = files_by_ordinal[ordinal]
+            day_totals = totals_by_path[os.path.join(WORKING_DIR, year_dir, month_dir, filename)]
+
+            # The index keeps minutes.
+            minutes = {}
+
+            for name, values in day_totals.items():
+                totals = records.Totals.from_sums(values)
+                minutes[name] = [totals.early_time, totals.late_time, totals.work_time]
+
+            changes[ordinal] = (signatures[ordinal], minutes)
+
+        prefix_index.apply_changes(sums_index, changes)
+        prefix_index.save_index(path_to_index, sums_index)
+
+        if os.path.exists(path_to_index):
+            prefix_indexes[os.path.abspath(path_to_index)] = (os.stat(path_to_index).st_mtime_ns, sums_index)
+
+    return minutes_to_sums(prefix_index.range_totals(sums_index, to_date(first_day).toordinal(),
+                                                     to_date(last_day).toordinal()))
+
+
+
+
+def load_prefix_index(path_to_index):
+    """Loads the prefix-sum index. It is kept in memory until the file changes."""
+
+    key = os.path.abspath(path_to_index)    # the current dir may change between reports
+
+    try:
+        mtime_ns = os.stat(path_to_index).st_mtime_ns
+    except FileNotFoundError:
+        return prefix_index.new_index()
+
+    loaded = prefix_indexes.get(key)
+
+    if loaded is not None and loaded[0] == mtime_ns:
+        return loaded[1]
+
+    sums_index = prefix_index.load_index(path_to_index)
+    prefix_indexes[key] = (mtime_ns, sums_index)
+
+    return sums_index
+
+
+
+
+def day_file_signature(year_dir, month_dir, filename):
+    """
+    Returns `[mtime_ns, size]` of a day file. Days of a packed year have the
+    signature of its archive.
+    """
+
+    if find_archive(year_dir) is not None:
+        stat = os.stat(archive.path_to_archive(WORKING_DIR, year_dir))
+    else:
+        stat = os.stat(os.path.join(WORKING_DIR, year_dir, month_dir, filename))
+
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+
+
+def minutes_to_sums(totals):
+    """
+    Converts people's `[early_time, late_time, work_time]` in minutes to lists
+    of hours and minutes in `SUM_KEYS` order.
+    """
+
+    sums = {}
+
+    for name, minutes in totals.items():
+        values = []
+
+        for value in minutes:
+            values.extend(divmod(value, 60))
+
+        sums[name] = values
+
+    return sums
+
+
+
+
+@instrumentation.timed('parse')
+def read_day_files(files_to_read, index, keep_totals, keep_sum=True):
+    """
+    Reads sums of time values of day files found by `find_day_files()`. Days of
+    packed years are read from archives, sums of unchanged files are taken from
+    aggregate caches, other files are parsed by `PARSE_WORKERS` processes. Returns a tuple `(data_sum, totals_by_path)`,
+    where `data_sum` is a sum of all the files and `totals_by_path` holds sums
+    of each file. Sums of parsed files are there only if `keep_totals` is `True`.
+    If `keep_sum` is `False`, files are not summed and `data_sum` is empty, e.g.
+    for callers that only need `totals_by_path`.
+    """
+
+    data_sum = {}    # stores data sum
+    totals_by_path = {}
+    caches = {}    # stores aggregate caches of month dirs
+    paths_to_parse = []
+    packed_years = {}    # stores archives of years by year dirs, `None` if a year is not packed
+    archived_files = 0
+
+    for date, year_dir, month_dir, filename in files_to_read:
+        full_path_to_month_dir = os.path.join(WORKING_DIR, year_dir, month_dir)
+
+        if year_dir not in packed_years:
+            packed_years[year_dir] = find_archive(year_dir)
+
+        if packed_years[year_dir] is not None:
+            # Decode only this day of the archive. Files of `totals_by_path` are
+            # named as if the day were not packed.
+            totals = sum_day_data(packed_years[year_dir].read_day(date))
+
+            if keep_sum:
+                add_totals(data_sum, totals)
+
+            totals_by_path[os.path.join(full_path_to_month_dir, filename)] = totals
+            archived_files += 1
+            continue
+
+        # Load the month's cache the first time a file is read from the month dir.
+        if full_path_to_month_dir not in caches:
+            caches[full_path_to_month_dir] = load_aggregate_cache(full_path_to_month_dir)
+
+        path_to_filename = os.path.join(full_path_to_month_dir, filename)
+        totals = read_day_totals(path_to_filename, caches[full_path_to_month_dir])
+
+        if totals is None:
+            paths_to_parse.append(path_to_filename)
+        else:
+            if keep_sum:
+                add_totals(data_sum, totals)
+
+            totals_by_path[path_to_filename] = totals
+
+    if instrumentation.enabled:
+        instrumentation.count(archived_files=archived_files,
+                              cached_files=len(files_to_read) - len(paths_to_parse) - archived_files,
+                              parsed_files=len(paths_to_parse),
+                              bytes_read=sum(os.path.getsize(path) for path in paths_to_parse))
+
+    # Split files into contiguous chunks, a few chunks per worker so that
+    # workers finish at about the same time.
+    if PARSE_WORKERS > 1 and len(paths_to_parse) > 1:
+        chunk_size = max(1, -(-len(paths_to_parse) // (PARSE_WORKERS * 4)))
+    else:
+        chunk_size = max(1, len(paths_to_parse))
+
+    chunks = [paths_to_parse[i:i + chunk_size] for i in range(0, len(paths_to_parse), chunk_size)]
+
+    if len(chunks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+            results = list(executor.map(parse_day_files, chunks, [keep_totals] * len(chunks),
+                                        [keep_sum] * len(chunks)))
+    else:
+        results = [parse_day_files(chunk, keep_totals, keep_sum) for chunk in chunks]
+
+    # Merge partial sums in the order of files.
+    changed_caches = set()    # stores month dirs whose caches must be saved
+
+    for partial_sum, file_totals in results:
+        add_totals(data_sum, partial_sum)
+
+        for path_to_filename, mtime_ns, size, totals in file_totals:
+            totals_by_path[path_to_filename] = totals
+
+            if USE_AGGREGATE_CACHE:
+                full_path_to_month_dir, filename = os.path.split(path_to_filename)
+                caches[full_path_to_month_dir][filename] = {'mtime_ns': mtime_ns,
+                                                            'size': size,
+                                                            'totals': totals
+                                                            }
+                changed_caches.add(full_path_to_month_dir)
+
+    # Save caches that got new entries.
+    for full_path_to_month_dir in changed_caches:
+        year_dir, month_dir = os.path.relpath(full_path_to_month_dir, WORKING_DIR).split(os.sep)
+        save_aggregate_cache(full_path_to_month_dir, caches[full_path_to_month_dir],
+                             index[year_dir][month_dir].values())
+
+    return data_sum, totals_by_path
+
+
+
+
+def parse_day_files(paths, keep_totals, keep_sum=True):
+    """
+    Parses day files and returns a tuple `(partial_sum, file_totals)`, where
+    `partial_sum` is sum of time values of all the files (empty if `keep_sum`
+    is `False`) and `file_totals` is a list of `(path, mtime_ns, size, totals)`
+    of each file if `keep_totals` is `True`, so that the files could be cached.
+    Is run in worker processes.
+    """
+
+    partial_sum = {}
+    file_totals = []
+
+    for path in paths:
+        # Find size and modification time before reading, so that a file
+        # changed while it is read will not be trusted by the cache.
+        stat = os.stat(path)
+        totals = sum_day_data(day_files.read_day_file(path))
+
+        if keep_sum:
+            add_totals(partial_sum, totals)
+
+        if keep_totals:
+            file_totals.append((path, stat.st_mtime_ns, stat.st_size, totals))
+
+    return partial_sum, file_totals
+
+
+
+
+def add_totals(data_sum, totals):
+    """Adds lists of time values keyed by names to `data_sum`."""
+
+    for name, values in totals.items():
+        if name in data_sum:
+            data_sum[name] = [a + b for a, b in zip(data_sum[name], values)]
+        else:
+            data_sum[name] = list(values)
+
+
+
+
+def sum_day_data(data):
+    """
+    Sums time values of each person in a day file's data. Returns a dict of
+    lists of values in `SUM_KEYS` order keyed by names.
+    """
+
+    totals = {}
+
+    for name in data:
+        if name == 'day_start':
+            # We do not need this value.
+            continue
+
+        totals[name] = data[name].sums()
+
+    return totals
+
+
+
+
+def read_day_totals(path_to_filename, cache):
+    """
+    Returns sums of time values of a day file from the cache or `None` if the
+    file is not cached or has changed since it was cached.
+    """
+
+    if not USE_AGGREGATE_CACHE:
+        return None
+
+    entry = cache.get(os.path.basename(path_to_filename))
+
+    if entry is None:
+        return None
+
+    stat = os.stat(path_to_filename)
+
+    if entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+        return None
+
+    return entry['totals']
+
+
+
+
+def load_aggregate_cache(full_path_to_month_dir):
+    """
+    Loads the aggregate cache of a month dir, or takes it from memory if it has
+    been loaded before. Returns an empty cache if there is none.
+    """
+
+    if not USE_AGGREGATE_CACHE:
+        return {}
+
+    # Entries are checked by `read_day_totals()`, so a cache in memory is never
+    # stale, though it may lack entries added by another process.
+    key = os.path.abspath(full_path_to_month_dir)
+
+    if key in aggregate_caches:
+        return aggregate_caches[key]
+
+    try:
+        with open(os.path.join(full_path_to_month_dir, AGGREGATE_CACHE_FILENAME)) as f:
+            cache = json.load(f)
+
+    except (OSError, ValueError):    # if the cache is missing or damaged
+        cache = {}
+
+    aggregate_caches[key] = cache
+
+    return cache
+
+
+
+
+def save_aggregate_cache(full_path_to_month_dir, cache, filenames):
+    """
+    Saves the aggregate cache of a month dir. Entries of files that are not in
+    `filenames` any more are dropped.
+    """
+
+    filenames = set(filenames)
+    cache = {filename: entry for filename, entry in cache.items() if filename in filenames}
+    aggregate_caches[os.path.abspath(full_path_to_month_dir)] = cache
+
+    path_to_cache = os.path.join(full_path_to_month_dir, AGGREGATE_CACHE_FILENAME)
+    # Report processes may save it at once, e.g. `report_server.py` and a batch.
+    path_to_temp_file = '{}.{}.{}.tmp'.format(path_to_cache, os.getpid(), threading.get_ident())
+
+    try:
+        with open(path_to_temp_file, 'w') as f:
+            json.dump(cache, f)
+
+        os.replace(path_to_temp_file, path_to_cache)
+
+    except OSError as err:
+        # The cache is only an optimization, so a read-only dir is not an error.
+        print()
+        print('! Could not save cache to {}: {}'.format(full_path_to_month_dir, err.strerror))
+
+
+
+
+def build_columns(files_to_read, totals_by_path):
+    """Loads sums of day files found by `find_day_files()` into columns of the NumPy engine."""
+
+    day_totals = {}    # stores sums of day files by dates' ordinal numbers
+
+    for date, year_dir, month_dir, filename in files_to_read:
+        path_to_filename = os.path.join(WORKING_DIR, year_dir, month_dir, filename)
+        day_totals[date.toordinal()] = totals_by_path[path_to_filename]
+
+    return columnar.build_columns(day_totals)
+
+
+
+
+def sum_columns(columns, first_day, last_day):
+    """
+    Sums time values of each person from `first_day` to `last_day` with the
+    NumPy engine. Returns the number of days that have day files.
+    """
+
+    # These globals are used by `calculate_time()`.
+    global column_names, column_totals
+
+    person_ids, column_totals, days = columnar.sum_by_person(columns, first_day.toordinal(), last_day.toordinal())
+    column_names = [columns['names'][person_id] for person_id in person_ids.tolist()]
+
+    return days
+
+
+
+
+@instrumentation.timed('calculate')
+def calculate_time():
+    """Calculates work, late, and early overall and average time values."""
+
+    # This global is used by `write_to_spreadsheet()` function.
+    global data
+
+    if AGGREGATION_ENGINE == 'numpy':
+        # Use sums found by `sum_columns()`.
+        data = columnar.calculate_time(column_names, column_totals, days_counter,
+                                       report_complexity, month_or_week, WORKDAYS_PER_WEEK)
+        return None
+
+    data = {}    # stores calculated time values
+
+    # Gather data from `data_sum` dict, make calculations, and write results to
+    # `data` dict.
+    for name in data_sum:
+        data[name] = {}
+
+        for category in records.CATEGORIES:    # for each of categories
+            # Calculate overall time value.
+            hour, minute = divmod(data_sum[name].minutes(category), 60)
+            # Write results to `data` dict.
+            data[name]['{}_time_hour_overall'.format(category)] = hour
+            data[name]['{}_time_minute_overall'.format(category)] = minute
+
+            # Save overall values in order to use them in average time calculations.
+            hour_overall, minute_overall = hour, minute
+
+            if report_complexity == 'S':
+                # Simple reports contain only overall time values, so continue.
+                continue
+            else:
+                # Calculate average time values.
+
+                # Calculate average time per day by dividing overall time values
+                # by number of workdays. `days_counter` contains number of files
+                # data was gathered from, so it could be considered the number
+                # of workdays.
+                hour =  hour_overall / days_counter
+                minute = minute_overall / days_counter
+                hour, minute = clean_time_2(hour, minute)
+                data[name]['{}_time_hour_average_per_day'.format(category)] = hour
+                data[name]['{}_time_minute_average_per_day'.format(category)] = minute
+
+                if month_or_week in ('M', 'R'):
+                    # Also, calculate average time per week for month and range reports by
+                    # dividing the number of workdays by a number of working
+                    # weeks in the month.
+
+                    # Calculate the number of working weeks in the month.
+                    working_weeks = days_counter / WORKDAYS_PER_WEEK
+
+                    hour = hour_overall / working_weeks
+                    minute = minute_overall / working_weeks
+                    hour, minute = clean_time_2(hour, minute)    # see `clean_time_2()` docstring for details
+                    data[name]['{}_time_hour_average_per_week'.format(category)] = hour
+                    data[name]['{}_time_minute_average_per_week'.format(category)] = minute
+
+
+
+
+def clean_time_2(hour, minute):
+    """
+    Cleans time format 2. Since hours and minutes become float values after
+    true division operations in `calculate_time()`, they should be formatted
+    as follows:
+    – hours value's decimal part shoud be converted into minutes;
+    – 'extra' minutes should be converted into hours.
+    (e.g. 10.5 hours, 198.12 minutes ---> 13 hours, 48 minutes)
+    """
+
+    decimal_minute = (hour - int(hour)) * 10
+    minute += decimal_minute * 60 / 10
+    hour = int(hour)
+    minute = int(minute)
+
+    if minute >= 60:
+        hour += minute // 60
+        minute %= 60
+
+    return hour, minute
+
+
+
+
+@instrumentation.timed('render')
+def write_to_spreadsheet():
+    """
+    Writes data to an Excel spreadsheet using a template, or to a CSV or TSV
+    file if `REPORT_FORMAT` says so.
+    """
+
+    if REPORT_FORMAT in ('csv', 'tsv'):
+        return write_to_text_file()
+
+    if XLSX_RENDERER == 'write-only':
+        return render_spreadsheet()
+
+    if report_complexity == 'S':    # for simple report
+        # Open a template.
+        wb = load_template('Simple.xlsx')
+        sheet = wb.active
+        row = 8    # start from 8th row
+
+        # Write kind of report with the number of workdays.
+        sheet['A1'] = report_title()
+
+        # Write data to cells according to template's structure.
+        for name in sorted(data):    # note that names are written in alphabetic order
+
+            sheet['A' + str(row)] = name
+            sheet['B' + str(row)] = data[name]['work_time_hour_overall']
+            sheet['C' + str(row)] = data[name]['work_time_minute_overall']
+            sheet['D' + str(row)] = data[name]['late_time_hour_overall']
+            sheet['E' + str(row)] = data[name]['late_time_minute_overall']
+            sheet['F' + str(row)] = data[name]['early_time_hour_overall']
+            sheet['G' + str(row)] = data[name]['early_time_minute_overall']
+
+            row += 1
+
+
+    elif report_complexity == 'C':    # for complex report
+        # Open a template.
+        wb = load_template('Complex.xlsx')
+
+        if month_or_week == 'W':
+            # Delete `Month Report` spreadsheet.
+            wb.remove(wb.get_sheet_by_name('Month Report'))
+            wb.active = 0    # this helps to avoid raising an error
+            sheet = wb.get_sheet_by_name('Week Report')
+            row = 9    # start from 9th row
+
+            # Write kind of report with the number of workdays.
+            sheet['A1'] = report_title()
+
+            # Write data to cells according to template's structure.
+            for name in sorted(data):
+
+                sheet['A' + str(row)] = name
+                sheet['B' + str(row)] = data[name]['work_time_hour_overall']
+                sheet['C' + str(row)] = data[name]['work_time_minute_overall']
+                sheet['D' + str(row)] = data[name]['work_time_hour_average_per_day']
+                sheet['E' + str(row)] = data[name]['work_time_minute_average_per_day']
+                sheet['F' + str(row)] = data[name]['late_time_hour_overall']
+                sheet['G' + str(row)] = data[name]['late_time_minute_overall']
+                sheet['H' + str(row)] = data[name]['late_time_hour_average_per_day']
+                sheet['I' + str(row)] = data[name]['late_time_minute_average_per_day']
+                sheet['J' + str(row)] = data[name]['early_time_hour_overall']
+                sheet['K' + str(row)] = data[name]['early_time_minute_overall']
+                sheet['L' + str(row)] = data[name]['early_time_hour_average_per_day']
+                sheet['M' + str(row)] = data[name]['early_time_minute_average_per_day']
+
+                row += 1
+
+        elif month_or_week in ('M', 'R'):
+            # Delete `Week Report` spreadsheet. Range reports have the same
+            # columns as month reports.
+            wb.remove(wb.get_sheet_by_name('Week Report'))
+            wb.active = 0    # this helps to avoid raising an error
+            sheet = wb.get_sheet_by_name('Month Report')
+            row = 10    # start from 10th row
+
+            # Write kind of report with the number of workdays.
+            sheet['A1'] = report_title()
+
+            # Write data to cells according to template's structure.
+            for name in sorted(data):
+
+                sheet['A' + str(row)] = name
+                sheet['B' + str(row)] = data[name]['work_time_hour_overall']
+                sheet['C' + str(row)] = data[name]['work_time_minute_overall']
+                sheet['D' + str(row)] = data[name]['work_time_hour_average_per_day']
+                sheet['E' + str(row)] = data[name]['work_time_minute_average_per_day']
+                sheet['F' + str(row)] = data[name]['work_time_hour_average_per_week']
+                sheet['G' + str(row)] = data[name]['work_time_minute_average_per_week']
+                sheet['H' + str(row)] = data[name]['late_time_hour_overall']
+                sheet['I' + str(row)] = data[name]['late_time_minute_overall']
+                sheet['J' + str(row)] = data[name]['late_time_hour_average_per_day']
+                sheet['K' + str(row)] = data[name]['late_time_minute_average_per_day']
+                sheet['L' + str(row)] = data[name]['late_time_hour_average_per_week']
+                sheet['M' + str(row)] = data[name]['late_time_minute_average_per_week']
+                sheet['N' + str(row)] = data[name]['early_time_hour_overall']
+                sheet['O' + str(row)] = data[name]['early_time_minute_overall']
+                sheet['P' + str(row)] = data[name]['early_time_hour_average_per_day']
+                sheet['Q' + str(row)] = data[name]['early_time_minute_average_per_day']
+                sheet['R' + str(row)] = data[name]['early_time_hour_average_per_week']
+                sheet['S' + str(row)] = data[name]['early_time_minute_average_per_week']
+
+                row += 1
+
+    # Save the spreadsheet.
+    path_to_spreadsheet = path_to_report(SPREADSHEET_SAVE_EXTENSTION)
+
+    with instrumentation.phase('save'):
+        wb.save(path_to_spreadsheet)
+
+    instrumentation.count(reports=1)
+
+    # Display name of the saved file and path to it.
+    head, tail = os.path.split(path_to_spreadsheet)
+    print()
+    print('Saved as {} to {}.'.format(tail, head))
+
+    return path_to_spreadsheet
+
+
+
+
+def render_spreadsheet():
+    """
+    Writes data to an Excel spreadsheet without a template. The layout of
+    templates is built in code and rows are streamed to disk with openpyxl's
+    write-only mode, so no cells are kept in memory.
+    """
+
+    if report_complexity == 'S':
+        sheet_title, header_rows, columns = 'Report', SIMPLE_HEADER_ROWS, SIMPLE_COLUMNS
+    elif month_or_week == 'W':
+        sheet_title, header_rows, columns = 'Week Report', WEEK_HEADER_ROWS, WEEK_COLUMNS
+    else:    # Range reports have the same columns as month reports
+        sheet_title, header_rows, columns = 'Month Report', MONTH_HEADER_ROWS, MONTH_COLUMNS
+
+    path_to_spreadsheet = path_to_report(SPREADSHEET_SAVE_EXTENSTION)
+    get_values = operator.itemgetter(*columns)
+
+    with instrumentation.phase('save'):
+        wb = openpyxl.Workbook(write_only=True)
+        sheet = wb.create_sheet(sheet_title)
+
+        # Widths and frozen panes are written before the first row.
+        sheet.column_dimensions['A'].width = NAME_COLUMN_WIDTH
+
+        for column in range(2, len(columns) + 2):
+            sheet.column_dimensions[openpyxl.utils.get_column_letter(column)].width = TIME_COLUMN_WIDTH
+
+        first_row = TITLE_ROWS + len(header_rows) + 1
+        sheet.freeze_panes = 'B{}'.format(first_row)
+
+        # The title takes the first rows. Cells of a title or header span are
+        # centered across the span, since merged cells can not be written in
+        # write-only mode.
+        sheet.append(header_cells(sheet, [(report_title(), len(columns) + 1)], HEADER_ALIGNMENT))
+
+        for _ in range(TITLE_ROWS - 1):
+            sheet.append([])
+
+        for i, spans in enumerate(header_rows):
+            # The last header row holds units under their categories.
+            alignment = UNITS_ALIGNMENT if i == len(header_rows) - 1 else HEADER_ALIGNMENT
+            sheet.append(header_cells(sheet, spans, alignment))
+
+        for name in sorted(data):    # note that names are written in alphabetic order
+            sheet.append((name,) + get_values(data[name]))
+
+        wb.save(path_to_spreadsheet)
+
+    instrumentation.count(reports=1)
+
+    # Display name of the saved file and path to it.
+    head, tail = os.path.split(path_to_spreadsheet)
+    print()
+    print('Saved as {} to {}.'.format(tail, head))
+
+    return path_to_spreadsheet
+
+
+
+
+def header_cells(sheet, spans, alignment):
+    """
+    Returns styled cells of a title or header row of a write-only sheet.
+    `spans` holds `(text, number_of_columns)` pairs.
+    """
+
+    cells = []
+
+    for text, span in spans:
+        for value in [text] + [None] * (span - 1):
+            cell = openpyxl.cell.WriteOnlyCell(sheet, value)
+            cell.font = HEADER_FONT
+            cell.alignment = alignment
+            cells.append(cell)
+
+    return cells
+
+
+
+
+def write_to_text_file():
+    """
+    Writes data to a CSV or TSV file. Rows are written to disk one at a time,
+    so memory does not grow with the roster, and no template is loaded. The
+    header row holds 'name' and keys of `data` (see `SIMPLE_COLUMNS`).
+    """
+
+    if report_complexity == 'S':
+        columns = SIMPLE_COLUMNS
+    elif month_or_week == 'W':
+        columns = WEEK_COLUMNS
+    else:    # Range reports have the same columns as month reports
+        columns = MONTH_COLUMNS
+
+    path_to_file = path_to_report(REPORT_FORMAT)
+    get_values = operator.itemgetter(*columns)
+
+    with instrumentation.phase('save'):
+        with open(path_to_file, 'w', newline='') as f:
+            writer = csv.writer(f, delimiter='\t' if REPORT_FORMAT == 'tsv' else ',')
+            writer.writerow(('name',) + columns)
+
+            for name in sorted(data):    # note that names are written in alphabetic order
+                writer.writerow((name,) + get_values(data[name]))
+
+    instrumentation.count(reports=1)
+
+    # Display name of the saved file and path to it.
+    head, tail = os.path.split(path_to_file)
+    print()
+    print('Saved as {} to {}.'.format(tail, head))
+
+    return path_to_file
+
+
+
+
+def path_to_report(extension):
+    """Makes dirs for a report and returns the path to save it to."""
+
+    # This global is needed to redefine `rel_path_to_month_dir` later.
+    # Without this statement, redefinition will raise an error.
+    global rel_path_to_month_dir
+
+    rel_path_to_month_dir = os.path.join(REPORTS_DIR, rel_path_to_month_dir)
+    os.makedirs(rel_path_to_month_dir, exist_ok=True)
+
+    if month_or_week == 'W':
+
+        # Use separate dirs for simple and complex reports to avoid name conflicts.
+        if report_complexity == 'S':
+            week_dir = 'Week Reports (Simple)'
+
+        elif report_complexity == 'C':
+            week_dir = 'Week Reports (Complex)'
+
+        path_to_week_dir = os.path.join(rel_path_to_month_dir, week_dir)
+        os.makedirs(path_to_week_dir, exist_ok=True)
+
+        # Use start and end days in week report's name.
+
+        # Apply filenames format to spreadsheet's name. Assume that it is the
+        # format the user wants to use to name hir/her spreadsheets.
+        if ZERO_PADDED_FILENAMES:
+            start_strf = start.strftime('%d')
+            end_strf = end.strftime('%d')
+        else:
+            start_strf = start.strftime('%-d')
+            end_strf = end.strftime('%-d')
+
+        # Note that if week starts in one month and ends in another one, it will
+        # be saved to `end`s month dir.
+        report_name = '{}—{}.{}'.format(start_strf, end_strf, extension)
+        path_to_file = os.path.join(path_to_week_dir, report_name)
+
+    elif month_or_week == 'M':
+
+        if report_complexity == 'S':
+            report_name = 'Month Report for {} (Simple).{}'.format(month_name, extension)
+        elif report_complexity == 'C':
+            report_name = 'Month Report for {} (Complex).{}'.format(month_name, extension)
+
+        path_to_file = os.path.join(rel_path_to_month_dir, report_name)
+
+    elif month_or_week == 'R':
+
+        # Ranges may be of any length, so whole dates are used in names.
+        if report_complexity == 'S':
+            range_dir = 'Range Reports (Simple)'
+
+        elif report_complexity == 'C':
+            range_dir = 'Range Reports (Complex)'
+
+        path_to_range_dir = os.path.join(rel_path_to_month_dir, range_dir)
+        os.makedirs(path_to_range_dir, exist_ok=True)
+
+        report_name = '{:%Y-%m-%d}—{:%Y-%m-%d}.{}'.format(start, end, extension)
+        path_to_file = os.path.join(path_to_range_dir, report_name)
+
+    return path_to_file
+
+
+
+
+def report_title():
+    """Returns the title of a report with the number of workdays, e.g. 'Week Report (5 day(s))'."""
+
+    if month_or_week == 'W':
+        title = 'Week Report'
+    elif month_or_week == 'M':
+        title = 'Month Report'
+    else:
+        title = range_title()
+
+    if report_complexity == 'C' and month_or_week in ('M', 'R'):
+        return '{} ({} day(s), {} workday(s) per week)'.format(title, days_counter, WORKDAYS_PER_WEEK)
+
+    return '{} ({} day(s))'.format(title, days_counter)
+
+
+
+
+def range_title():
+    """Returns the title of a Range report, e.g. 'Report from 01/01/2016 to 31/03/2016'."""
+
+    return 'Report from {} to {}'.format(start.strftime(DATE_FORMAT_STRPTIME), end.strftime(DATE_FORMAT_STRPTIME))
+
+
+
+
+def load_template(filename):
+    """
+    Loads a spreadsheet template. Template files are read from disk only once,
+    which helps when many reports are created in one run.
+    """
+
+    if filename not in templates:
+        with open(os.path.join(TEMPLATES_DIR, filename), 'rb') as f:
+            templates[filename] = f.read()
+
+    return openpyxl.load_workbook(io.BytesIO(templates[filename]))
+
+
+
+
+def create_reports_in_batch(first_day, last_day, kinds):
+    """
+    Creates reports for every week and month from `first_day` to `last_day`.
+    `kinds` is a list of kinds of reports like 'WS' (Week, Simple) or 'MC'
+    (Month, Complex). Every day file is read only once for all the reports.
+    """
+
+    # These globals are used by these functions: `parse_date_input()`, `calculate_time()`,
+    # `write_to_spreadsheet()`
+    global month_or_week, report_complexity, date_d, start, end
+    global data_sum, days_counter, rel_path_to_month_dir, month_name
+
+    # Find all weeks and months. Use `parse_date_input()` to find their starts
+    # and ends the same way it is done for a single report.
+    periods = []
+
+    for choice in ('W', 'M'):
+        complexities = [kind[1] for kind in kinds if kind[0] == choice]
+
+        if not complexities:
+            continue
+
+        month_or_week = choice
+
+        if choice == 'W':
+            date_d = first_day - datetime.timedelta(days=first_day.weekday())    # Monday
+            step = datetime.timedelta(days=7)
+        else:
+            date_d = datetime.date(first_day.year, first_day.month, 1)
+
+        while date_d <= last_day:
+            parse_date_input()
+            periods.append((month_or_week, complexities, start, end))
+
+            if choice == 'W':
+                date_d += step
+            else:
+                date_d = (datetime.date(date_d.year, date_d.month, 28) + datetime.timedelta(days=4)).replace(day=1)
+
+    if not periods:
+        return None
+
+    # Reports cover whole weeks and months, so the days to read may lie outside
+    # the range from `first_day` to `last_day`.
+    first_day = min(to_date(period[2]) for period in periods)
+    last_day = max(to_date(period[3]) for period in periods)
+
+    if STORAGE_BACKEND == 'sqlite':
+        # Read sums of every day with one query.
+        print()
+        print('Reading database {} ...'.format(sqlite_storage.DATABASE_PATH))
+
+        connection = sqlite_storage.connect()
+
+        with instrumentation.phase('parse'):
+            day_totals = sqlite_storage.read_day_totals(connection, first_day, last_day)
+
+        connection.close()
+
+    else:
+        # Read every day file once.
+        with instrumentation.phase('scan'):
+            index = scan_working_dir(first_day, last_day)
+            files_to_read = find_day_files(index, first_day, last_day)
+
+        totals_by_path = read_day_files(files_to_read, index, keep_totals=True, keep_sum=False)[1]
+
+        day_totals = {}    # stores sums of day files by dates' ordinal numbers
+
+        for date, year_dir, month_dir, filename in files_to_read:
+            path_to_filename = os.path.join(WORKING_DIR, year_dir, month_dir, filename)
+            day_totals[date.toordinal()] = totals_by_path[path_to_filename]
+
+    if AGGREGATION_ENGINE == 'numpy':
+        with instrumentation.phase('aggregate'):
+            columns = columnar.build_columns(day_totals)
+
+    if RENDER_WORKERS > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=RENDER_WORKERS)
+    else:
+        executor = None
+
+    rendering = collections.deque()    # stores futures of reports being rendered in submission order
+
+    # Create reports for each period from sums of its days.
+    try:
+        for month_or_week, complexities, start, end in periods:
+            period_sum = {}
+            days_counter = 0
+
+            with instrumentation.phase('aggregate'):
+                if AGGREGATION_ENGINE == 'numpy':
+                    # Sum the period's days with the NumPy engine.
+                    days_counter = sum_columns(columns, start, end)
+
+                else:
+                    for ordinal in range(to_date(start).toordinal(), to_date(end).toordinal() + 1):
+                        if ordinal in day_totals:
+                            add_totals(period_sum, day_totals[ordinal])
+                            days_counter += 1
+
+            for report_complexity in complexities:
+                with instrumentation.phase('aggregate'):
+                    data_sum = {name: records.Totals.from_sums(values) for name, values in period_sum.items()}
+
+                # Reports are saved to `end`'s month dir. `write_to_spreadsheet()`
+                # changes this value, so set it before every report.
+                rel_path_to_month_dir = os.path.join(end.strftime('%Y'), end.strftime('%-m — %B'))
+                month_name = end.strftime('%B')
+
+                calculate_time()
+
+                if executor is None:
+                    write_to_spreadsheet()
+                    continue
+
+                rendering.append(executor.submit(render_report, {name: globals()[name] for name in RENDER_GLOBALS}))
+
+                # Keep a few reports per worker in flight, so that data of all
+                # of them is not held in memory at once.
+                if len(rendering) > RENDER_WORKERS * 2:
+                    finish_report(rendering.popleft())
+
+        while rendering:
+            finish_report(rendering.popleft())
+
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+
+
+def render_report(state):
+    """
+    Sets `RENDER_GLOBALS` from `state` and writes a report. Returns a tuple
+    `(path_to_spreadsheet, console_output)`. Is run in worker processes.
+    """
+
+    globals().update(state)
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        path_to_spreadsheet = write_to_spreadsheet()
+
+    return path_to_spreadsheet, output.getvalue()
+
+
+
+
+def finish_report(future):
+    """
+    Waits for a report rendered by `render_report()` and prints its console
+    output, so that messages are the same and in the same order as when
+    reports are rendered one after another. Returns the path to the report.
+    """
+
+    with instrumentation.phase('save'):
+        path_to_spreadsheet, output = future.result()
+        instrumentation.count(reports=1)
+
+    print(output, end='')
+
+    return path_to_spreadsheet
+
+
+
+
+def to_date(date):
+    """Converts a datetime object to a date object. `start` and `end` may be either of them."""
+
+    return datetime.date(date.year, date.month, date.day)
+
+
+
+
+def parse_batch_period(values):
+    """
+    Parses the `--batch` option: either a year ('2016') or start and end dates
+    in `DATE_FORMAT`. Returns a tuple `(first_day, last_day)`.
+    """
+
+    if len(values) == 1 and values[0].isdigit():
+        year = int(values[0])
+        return datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+
+    if len(values) == 2:
+        first_day, last_day = [datetime.datetime.strptime(value, DATE_FORMAT_STRPTIME).date() for value in values]
+
+        if first_day <= last_day:
+            return first_day, last_day
+
+    raise ValueError('expected a year or start and end dates ({}).'.format(DATE_FORMAT))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Creates a work attendance report for a month or a week.')
+    parser.add_argument('--workers', type=int, default=PARSE_WORKERS,
+                        help='number of processes that parse day files (default: %(default)s)')
+    parser.add_argument('--render-workers', type=int, default=RENDER_WORKERS,
+                        help='number of processes that render reports of --batch (default: %(default)s)')
+    parser.add_argument('--engine', choices=['python', 'numpy'], default=AGGREGATION_ENGINE,
+                        help='aggregation engine (default: %(default)s)')
+    parser.add_argument('--storage', choices=['files', 'sqlite'], default=STORAGE_BACKEND,
+                        help='where data is read from (default: %(default)s)')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'tsv'], default=REPORT_FORMAT,
+                        help='format of reports (default: %(default)s)')
+    parser.add_argument('--xlsx-renderer', choices=['write-only', 'template'], default=XLSX_RENDERER,
+                        help='how xlsx reports are made (default: %(default)s)')
+    parser.add_argument('--batch', nargs='+', metavar='PERIOD',
+                        help='create reports for every week and month of a year (e.g. 2016) or '
+                             'between two dates (e.g. 01/01/2016 30/06/2016) without any prompts')
+    parser.add_argument('--range', nargs=2, metavar=('FIRST', 'LAST'),
+                        help='create a report from one date to another (e.g. 01/01/2016 31/03/2016) '
+                             'without any prompts')
+    parser.add_argument('--complexity', type=str.upper, choices=['S', 'C'], default='C',
+                        help='S/C for a Simple/Complex report for --range (default: %(default)s)')
+    parser.add_argument('--kinds', nargs='+', default=['WS', 'WC', 'MS', 'MC'],
+                        choices=['WS', 'WC', 'MS', 'MC'], metavar='KIND',
+                        help='kinds of reports for --batch: WS, WC, MS, MC, where W/M stands for '
+                             'Week/Month and S/C for Simple/Complex (default: all)')
+    parser.add_argument('--timings', nargs='?', const=DEFAULT_TIMINGS_PATH, default=TIMINGS_PATH, metavar='FILE',
+                        help='display time, files, bytes and peak memory of each phase and append them '
+                             'as JSON to FILE (default: {})'.format(DEFAULT_TIMINGS_PATH))
+    parser.add_argument('--profile', metavar='FILE',
+                        help='save a cProfile profile of the whole run to FILE')
+    options = parser.parse_args()
+
+    PARSE_WORKERS = options.workers
+    RENDER_WORKERS = options.render_workers
+    AGGREGATION_ENGINE = options.engine
+    STORAGE_BACKEND = options.storage
+    REPORT_FORMAT = options.format
+    XLSX_RENDERER = options.xlsx_renderer
+    TIMINGS_PATH = options.timings
+
+    if AGGREGATION_ENGINE == 'numpy' and not columnar.is_available():
+        print('! NumPy is not installed, so the Python engine will be used.')
+        AGGREGATION_ENGINE = 'python'
+
+    if TIMINGS_PATH:
+        instrumentation.enable()
+
+    if options.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        if options.batch:
+            try:
+                first_day, last_day = parse_batch_period(options.batch)
+            except ValueError as err:
+                parser.error(str(err))
+
+            create_reports_in_batch(first_day, last_day, options.kinds)
+
+            if TIMINGS_PATH:
+                instrumentation.report('batch from {:%d/%m/%Y} to {:%d/%m/%Y}'.format(first_day, last_day),
+                                       TIMINGS_PATH)
+
+        elif options.range:
+            try:
+                first_day, last_day = parse_batch_period(options.range)
+            except ValueError as err:
+                parser.error(str(err))
+
+            create_report('R' + options.complexity, first_day, last_day)
+
+            if TIMINGS_PATH:
+                instrumentation.report('R{} report from {:%d/%m/%Y} to {:%d/%m/%Y}'.format(
+                    options.complexity, first_day, last_day), TIMINGS_PATH)
+
+        else:
+            main()
+
+    finally:
+        if options.profile:
+            # Save the profile even if the run was interrupted.
+            profiler.disable()
+            profiler.dump_stats(options.profile)
+
+            print()
+            print('Profile saved to {}. View it with `python -m pstats {}`.'.format(options.profile, options.profile))
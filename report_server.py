@@ -0,0 +1,192 @@
+#! python3
+#
+# NAME          : report_server.py
+#
+# DESCRIPTION   : A resident report service. Keeps templates, listings of month
+#                 dirs and sums of day files of `report_creator.py` in memory, so
+#                 that repeated reports (e.g. for the current month) are created
+#                 without starting Python and reading everything again.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import os
+import io    # is used to hide output of `report_creator.py`
+import json
+import time
+import signal    # is used to stop the server gracefully
+import asyncio
+import datetime
+import argparse    # is used to parse command line options
+import contextlib
+
+import report_creator    # creates reports and holds what is kept in memory
+
+
+# Constants.
+# ==========
+
+HOST = '127.0.0.1'    # only local clients can connect by default
+PORT = 8766
+
+KINDS = ('WS', 'WC', 'MS', 'MC')    # W/M stands for Week/Month and S/C for Simple/Complex
+
+# Clients send one request per line and get one JSON object per line back:
+#   'MC 16/06/2016' or 'MC'  --->  {"ok": true, "path": "/.../Month Report for June (Complex).xlsx",
+#                                   "days": 22, "time": 0.12}
+# Rejected requests get `"ok": false` and a reason in "message". Without a date,
+# today's week or month is reported. Reports are created one at a time.
+# Cached sums are checked against day files' modification times, so reports
+# always use current data.
+
+# `report_creator.py` keeps a report's state in globals, so reports are created
+# one at a time in a worker thread while holding this lock. See `handle_request()`.
+report_lock = None    # is created in `serve()`, since it belongs to an event loop
+
+
+# Functions.
+# ==========
+
+async def serve(host, port):
+    """Accepts clients' connections until the server is stopped."""
+
+    global report_lock
+
+    report_lock = asyncio.Lock()
+
+    server = await asyncio.start_server(handle_client, host, port)
+
+    print()
+    print('Listening on {}:{} ...'.format(host, port))
+
+    async with server:
+        await server.serve_forever()
+
+
+
+
+async def handle_client(reader, writer):
+    """Answers requests of one client until it disconnects."""
+
+    try:
+        while True:
+            line = await reader.readline()
+
+            if not line:
+                break
+
+            response = await handle_request(line.decode(errors='replace'))
+
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+    except ConnectionError:
+        pass
+
+    finally:
+        writer.close()
+
+
+
+
+async def handle_request(line):
+    """Creates the report a request asks for. Returns a response."""
+
+    arguments = line.split()
+
+    if not 1 <= len(arguments) <= 2 or arguments[0].upper() not in KINDS:
+        return {'ok': False,
+                'message': 'expected a kind of report ({}) and an optional date ({}).'.format(
+                    ', '.join(KINDS), report_creator.DATE_FORMAT)
+                }
+
+    kind = arguments[0].upper()
+
+    if len(arguments) == 2:
+        try:
+            date = datetime.datetime.strptime(arguments[1], report_creator.DATE_FORMAT_STRPTIME).date()
+        except ValueError as err:
+            return {'ok': False, 'message': str(err)}
+    else:
+        date = datetime.date.today()
+
+    # A long report must not keep other clients waiting for their answers, e.g.
+    # to malformed requests, so it is created in a worker thread.
+    async with report_lock:
+        return await asyncio.get_running_loop().run_in_executor(None, create_report, kind, date)
+
+
+
+
+def create_report(kind, date):
+    """Creates a report. Returns a response. Is run in a worker thread."""
+
+    started = time.perf_counter()
+
+    try:
+        # Lists of files read are of no use to clients.
+        with contextlib.redirect_stdout(io.StringIO()):
+            path_to_spreadsheet = report_creator.create_report(kind, date)
+
+    except OSError as err:
+        return {'ok': False, 'message': 'could not create the report: {}'.format(err.strerror)}
+
+    except Exception as err:
+        # E.g. a damaged day file or template. Answer the client and go on
+        # serving others.
+        print('! {} report for {} failed: {!r}'.format(kind, date.strftime(report_creator.DATE_FORMAT_STRPTIME), err))
+
+        return {'ok': False, 'message': 'could not create the report: {!r}'.format(err)}
+
+    elapsed = time.perf_counter() - started
+
+    print('{} report for {}: {} ({:.2f} s)'.format(kind, date.strftime(report_creator.DATE_FORMAT_STRPTIME),
+                                                   path_to_spreadsheet, elapsed))
+
+    return {'ok': True,
+            'path': os.path.abspath(path_to_spreadsheet),
+            'days': report_creator.days_counter,
+            'time': round(elapsed, 3)
+            }
+
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='A resident report service.')
+    parser.add_argument('--host', default=HOST, help='address to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=PORT, help='port to listen on (default: %(default)s)')
+    parser.add_argument('--engine', choices=['python', 'numpy'], default=report_creator.AGGREGATION_ENGINE,
+                        help='aggregation engine (default: %(default)s)')
+    parser.add_argument('--storage', choices=['files', 'sqlite'], default=report_creator.STORAGE_BACKEND,
+                        help='where data is read from (default: %(default)s)')
+    parser.add_argument('--format', choices=['xlsx', 'csv', 'tsv'], default=report_creator.REPORT_FORMAT,
+                        help='format of reports (default: %(default)s)')
+    parser.add_argument('--xlsx-renderer', choices=['write-only', 'template'], default=report_creator.XLSX_RENDERER,
+                        help='how xlsx reports are made (default: %(default)s)')
+    options = parser.parse_args()
+
+    report_creator.AGGREGATION_ENGINE = options.engine
+    report_creator.STORAGE_BACKEND = options.storage
+    report_creator.REPORT_FORMAT = options.format
+    report_creator.XLSX_RENDERER = options.xlsx_renderer
+
+    if report_creator.AGGREGATION_ENGINE == 'numpy' and not report_creator.columnar.is_available():
+        print('! NumPy is not installed, so the Python engine will be used.')
+        report_creator.AGGREGATION_ENGINE = 'python'
+
+    # Read templates before the first request.
+    if report_creator.XLSX_RENDERER == 'template':
+        for filename in ('Simple.xlsx', 'Complex.xlsx'):
+            report_creator.load_template(filename)
+
+    # Stop on `kill` the same way as on Ctrl-C.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        asyncio.run(serve(options.host, options.port))
+    except KeyboardInterrupt:    # handle Ctrl-C exception
+        print()
@@ -0,0 +1,331 @@
+#! python3
+#
+# NAME          : rollups.py
+#
+# DESCRIPTION   : Maintains rollups of work attendance files: a summary file in
+#                 every month and year dir with each person's sums of time
+#                 values and the number of days, so that `report_creator.py`
+#                 reads one file per whole month or year of a period instead
+#                 of every day file.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import os
+import json
+import threading    # is used to name temporary files of threads
+
+import day_files    # reads day files of `check_my_time.py`
+
+
+# Constants.
+# ==========
+
+# A rollup is a JSON file in a month or year dir:
+#   {"files": {"29.jsonl": [mtime_ns, size], ...},
+#    "totals": {"Hulk": [early_time, late_time, work_time], ...}}
+# "files" lists day files the rollup was made of (relative to the dir, e.g.
+# "10 — October/29.jsonl" in a year dir) with their modification times and
+# sizes. A rollup is used only while the day files are exactly the same, so a
+# stale rollup is detected and made anew. Time values are integer numbers of
+# minutes. The number of days is the number of files.
+# A rollup updated by `update_day_file()` also has
+#   "days": {"29.jsonl": {"Hulk": [early_time, late_time, work_time], ...}}
+# with the sums of the day file that was updated last, so that they can be
+# replaced when it is written again.
+ROLLUP_FILENAME = '.rollup.json'
+
+
+# Functions.
+# ==========
+
+def month_totals(path_to_month_dir, filenames):
+    """
+    Returns a tuple `(totals, days)` of day files `filenames` of a month dir:
+    each person's `[early_time, late_time, work_time]` sums keyed by names and
+    the number of the files. They are taken from the month's rollup if it is
+    up to date, otherwise the rollup is made anew.
+    """
+
+    signatures = file_signatures(path_to_month_dir, filenames)
+    rollup = load_rollup(path_to_month_dir)
+
+    if rollup is None or rollup['files'] != signatures:
+        totals = {}
+
+        for filename in sorted(filenames):
+            for name, entry in day_files.read_day_file(os.path.join(path_to_month_dir, filename)).items():
+                if name != 'day_start':
+                    add_minutes(totals, name, (entry.early_time, entry.late_time, entry.work_time))
+
+        rollup = {'files': signatures, 'totals': totals}
+        save_rollup(path_to_month_dir, rollup)
+
+    return rollup['totals'], len(signatures)
+
+
+
+
+def year_totals(path_to_year_dir, filenames_by_month):
+    """
+    Returns a tuple `(totals, days)` of a year dir like `month_totals()` does.
+    `filenames_by_month` holds lists of day files keyed by month dirs.
+    """
+
+    signatures = {}
+
+    for month_dir, filenames in filenames_by_month.items():
+        for filename, signature in file_signatures(os.path.join(path_to_year_dir, month_dir), filenames).items():
+            signatures[month_dir + '/' + filename] = signature
+
+    rollup = load_rollup(path_to_year_dir)
+
+    if rollup is None or rollup['files'] != signatures:
+        # Make the year's rollup of months' rollups.
+        totals = {}
+
+        for month_dir in sorted(filenames_by_month):
+            month_totals_, days = month_totals(os.path.join(path_to_year_dir, month_dir),
+                                               filenames_by_month[month_dir])
+
+            for name, minutes in month_totals_.items():
+                add_minutes(totals, name, minutes)
+
+        rollup = {'files': signatures, 'totals': totals}
+        save_rollup(path_to_year_dir, rollup)
+
+    return rollup['totals'], len(signatures)
+
+
+
+
+def file_signatures(path_to_dir, filenames):
+    """Returns `{filename: [mtime_ns, size]}` of files in a dir."""
+
+    signatures = {}
+
+    for filename in filenames:
+        stat = os.stat(os.path.join(path_to_dir, filename))
+        signatures[filename] = [stat.st_mtime_ns, stat.st_size]
+
+    return signatures
+
+
+
+
+def add_minutes(totals, name, minutes):
+    """Adds a person's early, late, and work time (`None` counts as 0) to `totals`."""
+
+    minutes = [minute or 0 for minute in minutes]
+
+    if name in totals:
+        totals[name] = [a + b for a, b in zip(totals[name], minutes)]
+    else:
+        totals[name] = minutes
+
+
+
+
+def load_rollup(path_to_dir):
+    """Loads the rollup of a dir. Returns `None` if there is none."""
+
+    try:
+        with open(os.path.join(path_to_dir, ROLLUP_FILENAME)) as f:
+            return json.load(f)
+
+    except (OSError, ValueError):    # if the rollup is missing or damaged
+        return None
+
+
+
+
+def save_rollup(path_to_dir, rollup):
+    """Saves the rollup of a dir. The file is replaced atomically."""
+
+    path_to_rollup = os.path.join(path_to_dir, ROLLUP_FILENAME)
+    # Kiosks may save it at once, and so may a kiosk's threads that close a day.
+    path_to_temp_file = '{}.{}.{}.tmp'.format(path_to_rollup, os.getpid(), threading.get_ident())
+
+    try:
+        with open(path_to_temp_file, 'w') as f:
+            json.dump(rollup, f)
+
+        os.replace(path_to_temp_file, path_to_rollup)
+
+    except OSError as err:
+        # Rollups are only an optimization, so a read-only dir is not an error.
+        print()
+        print('! Could not save rollup to {}: {}'.format(path_to_dir, err.strerror))
+
+
+
+
+def update_year(path_to_year_dir):
+    """
+    Brings rollups of a year dir and its month dirs up to date. Returns the
+    year's `(totals, days)`.
+    """
+
+    filenames_by_month = {}
+
+    for month_dir in os.listdir(path_to_year_dir):
+        path_to_month_dir = os.path.join(path_to_year_dir, month_dir)
+
+        if month_dir.split(' ')[0].isdigit() and os.path.isdir(path_to_month_dir):
+            filenames_by_month[month_dir] = list(day_files.list_day_files(path_to_month_dir).values())
+
+    # A stale year's rollup is made of its months' rollups, which are brought
+    # up to date on the way. An up-to-date one means all of them are.
+    return year_totals(path_to_year_dir, filenames_by_month)
+
+
+
+
+def update_day_file(path_to_day_file):
+    """
+    Brings rollups of a day file's month and year dirs up to date after the
+    day file was written, e.g. by `check_my_time.py`. If no other day file has
+    changed since, only the day's old sums are replaced with the new ones, so
+    the rest of the month is not read again. Otherwise the rollups are made
+    anew by `update_year()`.
+    """
+
+    path_to_month_dir, filename = os.path.split(path_to_day_file)
+    path_to_year_dir, month_dir = os.path.split(path_to_month_dir)
+
+    # The signature is taken before the file is read, as in `month_totals()`:
+    # if the file is replaced meanwhile, the rollup is only found stale later.
+    month_signatures = file_signatures(path_to_month_dir,
+                                       day_files.list_day_files(path_to_month_dir).values())
+
+    if filename not in month_signatures:    # if it was removed meanwhile
+        update_year(path_to_year_dir)
+        return
+
+    day_totals = {}
+
+    for name, entry in day_files.read_day_file(path_to_day_file).items():
+        if name != 'day_start':
+            add_minutes(day_totals, name, (entry.early_time, entry.late_time, entry.work_time))
+
+    year_signatures = {}
+
+    for month_dir_ in os.listdir(path_to_year_dir):
+        path_to_month_dir_ = os.path.join(path_to_year_dir, month_dir_)
+
+        if month_dir_ == month_dir:
+            signatures = month_signatures
+        elif month_dir_.split(' ')[0].isdigit() and os.path.isdir(path_to_month_dir_):
+            signatures = file_signatures(path_to_month_dir_,
+                                         day_files.list_day_files(path_to_month_dir_).values())
+        else:
+            continue
+
+        for filename_, signature in signatures.items():
+            year_signatures[month_dir_ + '/' + filename_] = signature
+
+    if not (replace_day(path_to_month_dir, filename, month_signatures, day_totals)
+            and replace_day(path_to_year_dir, month_dir + '/' + filename, year_signatures, day_totals)):
+        update_year(path_to_year_dir)
+
+        # Now the rollups hold exactly these sums of the day, so keep them for
+        # the next time the day file is written.
+        replace_day(path_to_month_dir, filename, month_signatures, day_totals)
+        replace_day(path_to_year_dir, month_dir + '/' + filename, year_signatures, day_totals)
+
+
+
+
+def replace_day(path_to_dir, key, signatures, day_totals):
+    """
+    Replaces the sums of one day file (`key` in the rollup's "files") in the
+    rollup of a dir with `day_totals`. `signatures` are the current ones of
+    all day files of the dir. Returns `False` if the rollup cannot be updated
+    this way, i.e. it is missing, another day file has changed since it was
+    made, or the day's old sums are not kept in it.
+    """
+
+    rollup = load_rollup(path_to_dir)
+
+    if rollup is None:
+        return False
+
+    old_signatures = dict(rollup['files'])
+    old_signature = old_signatures.pop(key, None)
+    other_signatures = {filename: signature for filename, signature in signatures.items() if filename != key}
+
+    if old_signatures != other_signatures:
+        return False
+
+    days = rollup.get('days', {})
+    totals = rollup['totals']
+
+    if old_signature == signatures[key]:
+        # The rollup is up to date; only keep the day's sums if they are not.
+        if days.get(key) == day_totals:
+            return True
+
+    elif old_signature is not None:
+        if key not in days:
+            return False
+
+        old_day_totals = days[key]
+
+        # A person may be in other day files too, so one that is gone from
+        # the day cannot be removed from the totals without reading them.
+        if not set(old_day_totals) <= set(day_totals):
+            return False
+
+        for name, minutes in old_day_totals.items():
+            add_minutes(totals, name, [-minute for minute in minutes])
+
+    if old_signature != signatures[key]:
+        for name, minutes in day_totals.items():
+            add_minutes(totals, name, minutes)
+
+    # Sums of earlier days are dropped: days are rarely written once over.
+    save_rollup(path_to_dir, {'files': signatures, 'totals': totals, 'days': {key: day_totals}})
+
+    return True
+
+
+
+
+def update_tree(working_dir=day_files.WORKING_DIR):
+    """Brings rollups of all month and year dirs of a tree up to date."""
+
+    updated = 0
+
+    for year_dir in sorted(os.listdir(working_dir)):
+        path_to_year_dir = os.path.join(working_dir, year_dir)
+
+        if not year_dir.isdigit() or not os.path.isdir(path_to_year_dir):
+            continue
+
+        totals, days = update_year(path_to_year_dir)
+        updated += 1
+        print('{}: {} day(s), {} people'.format(path_to_year_dir, days, len(totals)))
+
+    print()
+    print('{} year(s) updated.'.format(updated))
+
+
+
+
+if __name__ == '__main__':
+    if len(sys.argv) in (2, 3) and sys.argv[1] == 'update':
+        working_dir = sys.argv[2] if len(sys.argv) == 3 else day_files.WORKING_DIR
+
+        if not os.path.isdir(working_dir):
+            # Fatal error. Nothing can be updated, so exit.
+            print('Error: no such directory: {}'.format(working_dir))
+            sys.exit(0)
+
+        update_tree(working_dir)
+
+    else:
+        print('Usage: python rollups.py update [<dir>]')
@@ -0,0 +1,145 @@
+#! python3
+#
+# NAME          : roster.py
+#
+# DESCRIPTION   : Loads a roster of employees for `check_my_time.py` and matches
+#                 typed names to it by exact, prefix, and fuzzy lookup.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import bisect    # is used for prefix lookup in sorted names
+import difflib    # is used to rank fuzzy matches
+import collections
+
+
+# Constants.
+# ==========
+
+# A roster is a text file with one name per line. Blank lines and lines
+# starting with '#' are skipped.
+ROSTER_PATH = 'Roster.txt'
+
+MAX_SUGGESTIONS = 5    # max number of names suggested for a typo
+FUZZY_CANDIDATES = 50    # number of names sharing most trigrams that are ranked by `difflib`
+FUZZY_CUTOFF = 0.75    # min similarity of a fuzzy match (0..1)
+
+
+# Functions.
+# ==========
+
+def load_roster(path=ROSTER_PATH):
+    """Reads a roster file and returns its index (see `build_index()`)."""
+
+    with open(path) as f:
+        names = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    return build_index(names)
+
+
+
+
+def build_index(names):
+    """
+    Builds an index of names for `lookup()`. Names are compared case-insensitively
+    and with whitespace collapsed. Returns a dict with:
+    – 'names': names by keys;
+    – 'keys': sorted keys for prefix lookup;
+    – 'trigrams': lists of keys by trigrams for fuzzy lookup.
+    """
+
+    index = {'names': {}, 'keys': [], 'trigrams': collections.defaultdict(list)}
+
+    for name in names:
+        name = ' '.join(name.split())
+        key = name_key(name)
+
+        if key in index['names']:
+            continue
+
+        index['names'][key] = name
+
+        for trigram in trigrams(key):
+            index['trigrams'][trigram].append(key)
+
+    index['keys'] = sorted(index['names'])
+
+    return index
+
+
+
+
+def lookup(index, name):
+    """
+    Matches a typed name to the roster. Returns a tuple `(name, suggestions)`:
+    – the roster's name and no suggestions if `name` is on the roster (in any
+      case) or is a prefix of only one name on the roster;
+    – `None` and a list of names that start with `name` or look like it otherwise.
+    """
+
+    key = name_key(name)
+
+    if key in index['names']:
+        return index['names'][key], []
+
+    # Names that start with `key` are next to each other in sorted keys.
+    keys = index['keys']
+    position = bisect.bisect_left(keys, key)
+    prefix_matches = []
+
+    while position < len(keys) and keys[position].startswith(key) and len(prefix_matches) <= MAX_SUGGESTIONS:
+        prefix_matches.append(keys[position])
+        position += 1
+
+    if len(prefix_matches) == 1:
+        return index['names'][prefix_matches[0]], []
+
+    if prefix_matches:
+        return None, [index['names'][match] for match in prefix_matches[:MAX_SUGGESTIONS]]
+
+    return None, [index['names'][match] for match in fuzzy_matches(index, key)]
+
+
+
+
+def fuzzy_matches(index, key):
+    """
+    Finds keys that look like `key`. Only names sharing most trigrams with it
+    are compared by `difflib`, so a lookup does not scan the whole roster.
+    """
+
+    shared = collections.Counter()
+
+    for trigram in trigrams(key):
+        shared.update(index['trigrams'].get(trigram, ()))
+
+    matches = []
+
+    for candidate, count in shared.most_common(FUZZY_CANDIDATES):
+        ratio = difflib.SequenceMatcher(None, key, candidate).ratio()
+
+        if ratio >= FUZZY_CUTOFF:
+            matches.append((-ratio, candidate))
+
+    return [candidate for ratio, candidate in sorted(matches)[:MAX_SUGGESTIONS]]
+
+
+
+
+def name_key(name):
+    """Returns a name in the form it is compared in."""
+
+    return ' '.join(name.split()).casefold()
+
+
+
+
+def trigrams(key):
+    """Returns a set of trigrams of a key. Spaces around it make short names match, too."""
+
+    key = '  ' + key + ' '
+
+    return {key[i:i + 3] for i in range(len(key) - 2)}
@@ -0,0 +1,314 @@
+#! python3
+#
+# NAME          : sqlite_storage.py
+#
+# DESCRIPTION   : An optional SQLite storage backend of `check_my_time.py` and
+#                 `report_creator.py`. Also imports a tree of day files into a
+#                 database and exports it back.
+#
+# AUTHOR        : Tim Kornev (@Timmate on GitHub)
+#
+# CREATED DATE  : 17th of October, 2026
+#
+
+
+import sys
+import os
+import sqlite3
+import datetime
+import contextlib    # is used to hold transactions in `with` statements
+
+import day_files    # reads and writes day files
+
+
+# Constants.
+# ==========
+
+DATABASE_PATH = 'Work Attendance.db'
+
+# A row of `attendance` holds the same values as a line of a day file (see
+# `day_files.py`). Dates and timestamps are ISO strings, so they sort and compare
+# as text. The primary key indexes rows by dates for reports, the other index
+# finds a person's history.
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY,
+    day_start TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    date TEXT NOT NULL,
+    name TEXT NOT NULL,
+    clock_in TEXT NOT NULL,
+    clock_in_early INTEGER NOT NULL,
+    clock_out TEXT,
+    early_time INTEGER,
+    late_time INTEGER,
+    work_time INTEGER,
+    PRIMARY KEY (date, name)
+);
+
+CREATE INDEX IF NOT EXISTS attendance_by_name ON attendance (name, date);
+'''
+
+# Columns of `attendance` that hold values of a day file's line.
+LINE_COLUMNS = ('name', 'clock_in', 'clock_in_early', 'clock_out', 'early_time', 'late_time', 'work_time')
+
+
+# Functions.
+# ==========
+
+def connect(path=DATABASE_PATH):
+    """Opens a database and creates its tables if they do not exist yet."""
+
+    connection = sqlite3.connect(path)
+
+    # WAL lets reports read the database while clock events are written to it.
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.executescript(SCHEMA)
+
+    return connection
+
+
+
+
+def load_day(connection, day):
+    """
+    Loads a day's data in the same form `day_files.read_day_file()` returns it.
+    Returns `None` if the day is not in the database.
+    """
+
+    row = connection.execute('SELECT day_start FROM days WHERE date = ?', (date_key(day),)).fetchone()
+
+    if row is None:
+        return None
+
+    name, record = day_files.line_to_record({'day_start': row[0]})
+    data = {name: record}
+
+    rows = connection.execute('SELECT {} FROM attendance WHERE date = ?'.format(', '.join(LINE_COLUMNS)),
+                              (date_key(day),))
+
+    for row in rows:
+        name, record = row_to_record(row)
+        data[name] = record
+
+    return data
+
+
+
+
+def load_record(connection, day, name):
+    """
+    Loads a person's record (or day's start time if `name` is 'day_start').
+    Returns `None` if there is no such record.
+    """
+
+    if name == 'day_start':
+        row = connection.execute('SELECT day_start FROM days WHERE date = ?', (date_key(day),)).fetchone()
+
+        return None if row is None else day_files.line_to_record({'day_start': row[0]})[1]
+
+    row = connection.execute('SELECT {} FROM attendance WHERE date = ? AND name = ?'.format(', '.join(LINE_COLUMNS)),
+                             (date_key(day), name)).fetchone()
+
+    return None if row is None else row_to_record(row)[1]
+
+
+
+
+def row_to_record(row):
+    """Converts a row of `LINE_COLUMNS` values to a tuple `(name, record)`."""
+
+    # Missing values are NULLs, but day files do not have them at all.
+    line = {column: value for column, value in zip(LINE_COLUMNS, row) if value is not None}
+    line['clock_in_early'] = bool(line['clock_in_early'])
+
+    return day_files.line_to_record(line)
+
+
+
+
+@contextlib.contextmanager
+def locked(connection):
+    """
+    Holds a write transaction in a `with` statement. Other processes can still
+    read, but can not write until it is committed.
+    """
+
+    with connection:
+        # `IMMEDIATE` takes the write lock right away, so data read in the
+        # transaction can not be changed by others before it is written.
+        connection.execute('BEGIN IMMEDIATE')
+
+        yield
+
+
+
+
+def insert_day(connection, day, data):
+    """Replaces a day's data. The caller commits."""
+
+    connection.execute('DELETE FROM attendance WHERE date = ?', (date_key(day),))
+
+    insert_record(connection, day, 'day_start', data['day_start'])
+
+    for name in data:
+        if name != 'day_start':
+            insert_record(connection, day, name, data[name])
+
+
+
+
+def insert_record(connection, day, name, record):
+    """Inserts or replaces a person's entry or day's start time. The caller commits."""
+
+    line = day_files.record_to_line(name, record)
+
+    if name == 'day_start':
+        connection.execute('INSERT OR REPLACE INTO days (date, day_start) VALUES (?, ?)',
+                           (date_key(day), line['day_start']))
+        return None
+
+    connection.execute('INSERT OR REPLACE INTO attendance (date, {}) VALUES (?, {})'
+                       .format(', '.join(LINE_COLUMNS), ', '.join('?' * len(LINE_COLUMNS))),
+                       [date_key(day)] + [line.get(column) for column in LINE_COLUMNS])
+
+
+
+
+def sum_period(connection, first_day, last_day):
+    """
+    Sums time values of each person from `first_day` to `last_day` (inclusive)
+    with one indexed query. Returns a tuple `(data_sum, days_counter)`, where
+    `data_sum` holds lists of values in `report_creator.SUM_KEYS` order keyed by
+    names and `days_counter` is the number of days in the database.
+    """
+
+    period = (date_key(first_day), date_key(last_day))
+
+    rows = connection.execute('SELECT name, TOTAL(early_time), TOTAL(late_time), TOTAL(work_time) '
+                              'FROM attendance WHERE date BETWEEN ? AND ? GROUP BY name', period)
+
+    data_sum = {}
+
+    for name, *minutes in rows:
+        values = []
+
+        for minute in minutes:
+            values.extend(divmod(int(minute), 60))
+
+        data_sum[name] = values
+
+    days_counter, = connection.execute('SELECT COUNT(*) FROM days WHERE date BETWEEN ? AND ?', period).fetchone()
+
+    return data_sum, days_counter
+
+
+
+
+def read_day_totals(connection, first_day, last_day):
+    """
+    Reads sums of time values of each day from `first_day` to `last_day`.
+    Returns a dict of `{name: values}` dicts keyed by dates' ordinal numbers,
+    which is what `columnar.build_columns()` takes. Days without people are
+    there, too, since they count as workdays.
+    """
+
+    period = (date_key(first_day), date_key(last_day))
+    day_totals = {}
+
+    for date, in connection.execute('SELECT date FROM days WHERE date BETWEEN ? AND ?', period):
+        day_totals[datetime.date.fromisoformat(date).toordinal()] = {}
+
+    rows = connection.execute('SELECT date, name, early_time, late_time, work_time '
+                              'FROM attendance WHERE date BETWEEN ? AND ? ORDER BY date', period)
+
+    for date, name, *minutes in rows:
+        values = []
+
+        for minute in minutes:
+            values.extend(divmod(minute or 0, 60))
+
+        day_totals[datetime.date.fromisoformat(date).toordinal()][name] = values
+
+    return day_totals
+
+
+
+
+def date_key(date):
+    """
+    Returns a value of `date` columns for a date or datetime object. Reports'
+    periods may start and end with datetime objects, so do not use `isoformat()`.
+    """
+
+    return datetime.date(date.year, date.month, date.day).isoformat()
+
+
+
+
+def import_tree(working_dir=day_files.WORKING_DIR, path=DATABASE_PATH):
+    """
+    Imports all day files of a tree of work attendance files into a database.
+    Days that are already in the database are replaced.
+    """
+
+    connection = connect(path)
+    imported = 0
+
+    # One transaction for the whole tree is much faster than one per day.
+    with connection:
+        for date, path_to_file in day_files.walk_day_files(working_dir):
+            data = day_files.read_day_file(path_to_file)
+
+            if 'day_start' not in data:
+                print('! Skipped {}: no `day_start_dt` value found.'.format(path_to_file))
+                continue
+
+            insert_day(connection, date, data)
+            imported += 1
+
+    connection.close()
+
+    print()
+    print('{} day(s) imported into {}.'.format(imported, path))
+
+
+
+
+def export_tree(working_dir=day_files.WORKING_DIR, path=DATABASE_PATH):
+    """
+    Exports all days of a database to a tree of work attendance files. Existing
+    day files of the days are replaced.
+    """
+
+    connection = connect(path)
+    days = [datetime.date.fromisoformat(date) for date, in connection.execute('SELECT date FROM days ORDER BY date')]
+
+    for day in days:
+        path_to_month_dir = os.path.join(working_dir, day_files.month_dir_of(day))
+        os.makedirs(path_to_month_dir, exist_ok=True)
+
+        path_to_file = os.path.join(path_to_month_dir, day.strftime('%-d') + day_files.DAY_FILE_EXTENSION)
+        day_files.write_day_file(path_to_file, load_day(connection, day))
+
+    connection.close()
+
+    print()
+    print('{} day(s) exported to {}.'.format(len(days), working_dir))
+
+
+
+
+if __name__ == '__main__':
+    if len(sys.argv) in (2, 3) and sys.argv[1] in ('import', 'export'):
+        working_dir = sys.argv[2] if len(sys.argv) == 3 else day_files.WORKING_DIR
+
+        if sys.argv[1] == 'import':
+            import_tree(working_dir)
+        else:
+            export_tree(working_dir)
+
+    else:
+        print('Usage: python sqlite_storage.py import|export [<dir>]')